@@ -5,12 +5,14 @@ from django.contrib.auth.models import _user_has_perm  # type: ignore
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
+    Group,
     Permission,
     PermissionsMixin,
 )
 from django.db import models
 from django.db.models import JSONField  # type: ignore
 from django.db.models import Q, QuerySet, Value
+from django.db.models.signals import m2m_changed, post_delete
 from django.forms.models import model_to_dict
 from django.utils import timezone
 from django.utils.crypto import get_random_string
@@ -167,6 +169,21 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._effective_permissions = None
+        # email is read from __dict__ to not load it when the field is deferred
+        self._initial_email = self.__dict__.get("email")
+
+    def save(self, *args, **kwargs):
+        from ..core.jwt import invalidate_jwt_user_cache
+
+        super().save(*args, **kwargs)
+        invalidate_jwt_user_cache({self.email, self._initial_email} - {None})
+        self._initial_email = self.email
+
+    def delete(self, *args, **kwargs):
+        from ..core.jwt import invalidate_jwt_user_cache
+
+        invalidate_jwt_user_cache({self.email, self._initial_email} - {None})
+        return super().delete(*args, **kwargs)
 
     @property
     def effective_permissions(self) -> "QuerySet[Permission]":
@@ -259,3 +276,43 @@ class StaffNotificationRecipient(models.Model):
 
     def get_email(self):
         return self.user.email if self.user else self.staff_email
+
+
+M2M_CHANGED_POST_ACTIONS = {"post_add", "post_remove", "post_clear"}
+
+
+def invalidate_jwt_cache_of_changed_users(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Drop cached JWT users whose permissions or groups were changed."""
+    from ..core.jwt import invalidate_jwt_user_cache, invalidate_jwt_users_cache
+
+    if action not in M2M_CHANGED_POST_ACTIONS:
+        return
+    if not reverse:
+        invalidate_jwt_user_cache([instance.email])
+    elif pk_set:
+        emails = User.objects.filter(pk__in=pk_set).values_list("email", flat=True)
+        invalidate_jwt_user_cache(list(emails))
+    else:
+        # users removed by clearing the relation are not known any more
+        invalidate_jwt_users_cache()
+
+
+def invalidate_jwt_cache_of_group_users(sender, action=None, **kwargs):
+    """Drop all cached JWT users when a group or its permissions were changed."""
+    from ..core.jwt import invalidate_jwt_users_cache
+
+    # deleting a group removes its users and permissions without m2m signals
+    if action is None or action in M2M_CHANGED_POST_ACTIONS:
+        invalidate_jwt_users_cache()
+
+
+m2m_changed.connect(
+    invalidate_jwt_cache_of_changed_users, sender=User.user_permissions.through
+)
+m2m_changed.connect(invalidate_jwt_cache_of_changed_users, sender=User.groups.through)
+m2m_changed.connect(
+    invalidate_jwt_cache_of_group_users, sender=Group.permissions.through
+)
+post_delete.connect(invalidate_jwt_cache_of_group_users, sender=Group)
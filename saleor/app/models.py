@@ -37,6 +37,18 @@ class App(ModelWithMetadata):
         ordering = ("name", "pk")
         permissions = ((AppPermission.MANAGE_APPS.codename, "Manage apps",),)
 
+    def save(self, *args, **kwargs):
+        from ..webhook.utils import invalidate_subscribed_event_types
+
+        super().save(*args, **kwargs)
+        invalidate_subscribed_event_types()
+
+    def delete(self, *args, **kwargs):
+        from ..webhook.utils import invalidate_subscribed_event_types
+
+        invalidate_subscribed_event_types()
+        return super().delete(*args, **kwargs)
+
     def get_permissions(self) -> Set[str]:
         """Return the permissions of the app."""
         if not self.is_active:
@@ -1,4 +1,8 @@
-from typing import TYPE_CHECKING, Iterable, Optional
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+from django.utils.functional import cached_property
 
 from ..core.prices import quantize_price
 from ..core.taxes import zero_taxed_money
@@ -7,8 +11,132 @@ from ..plugins.manager import get_plugins_manager
 
 if TYPE_CHECKING:
     from prices import TaxedMoney
+    from ..plugins.manager import PluginsManager
     from .models import Checkout, CheckoutLine
 
+LineKey = Tuple[int, int, int]
+
+_prices_cache = threading.local()
+
+
+class CheckoutPrices:
+    """Prices of a checkout with the given lines, each calculated only once.
+
+    The total is calculated from the cached subtotal and shipping price and the
+    subtotal from the cached totals of lines.
+    """
+
+    def __init__(
+        self,
+        checkout: "Checkout",
+        lines: Iterable["CheckoutLine"],
+        discounts: Iterable[DiscountInfo],
+        manager: Optional["PluginsManager"] = None,
+        line_totals: Optional[Dict[LineKey, "TaxedMoney"]] = None,
+    ):
+        self.checkout = checkout
+        self.lines = list(lines)
+        self.discounts = discounts
+        self.manager = manager or get_plugins_manager()
+        self._line_totals = line_totals if line_totals is not None else {}
+
+    def line_total(self, line: "CheckoutLine") -> "TaxedMoney":
+        key = _get_line_key(line)
+        if key not in self._line_totals:
+            line_total = self.manager.calculate_checkout_line_total(
+                line, self.discounts
+            )
+            self._line_totals[key] = quantize_price(line_total, self.checkout.currency)
+        return self._line_totals[key]
+
+    @cached_property
+    def subtotal(self) -> "TaxedMoney":
+        subtotal = self.manager.calculate_checkout_subtotal(
+            self.checkout,
+            self.lines,
+            self.discounts,
+            line_totals=[self.line_total(line) for line in self.lines],
+        )
+        return quantize_price(subtotal, self.checkout.currency)
+
+    @cached_property
+    def shipping_price(self) -> "TaxedMoney":
+        shipping_price = self.manager.calculate_checkout_shipping(
+            self.checkout, self.lines, self.discounts
+        )
+        return quantize_price(shipping_price, self.checkout.currency)
+
+    @cached_property
+    def total(self) -> "TaxedMoney":
+        total = self.manager.calculate_checkout_total(
+            self.checkout,
+            self.lines,
+            self.discounts,
+            subtotal=self.subtotal,
+            shipping_price=self.shipping_price,
+        )
+        return quantize_price(total, self.checkout.currency)
+
+
+def _get_line_key(line: "CheckoutLine") -> LineKey:
+    return line.pk, line.variant_id, line.quantity
+
+
+def _get_checkout_key(checkout: "Checkout", discounts: Iterable[DiscountInfo]):
+    """Return values of the checkout and discounts which prices depend on."""
+    return (
+        checkout.pk,
+        checkout.currency,
+        checkout.country.code,
+        checkout.discount_amount,
+        checkout.voucher_code,
+        checkout.shipping_method_id,
+        checkout.shipping_address_id,
+        checkout.billing_address_id,
+        tuple(
+            (discount.sale.__class__.__name__, discount.sale.pk)
+            for discount in discounts
+        ),
+    )
+
+
+@contextmanager
+def checkout_prices_cache():
+    """Reuse checkout prices calculated in the block.
+
+    Prices are cached by the state of the checkout and its lines, so changing
+    them leads to calculating new prices. Nested blocks share the cache of the
+    outermost one.
+    """
+    if getattr(_prices_cache, "prices", None) is not None:
+        yield
+        return
+    _prices_cache.prices = {}
+    try:
+        yield
+    finally:
+        _prices_cache.prices = None
+
+
+def get_checkout_prices(
+    checkout: "Checkout",
+    lines: Iterable["CheckoutLine"],
+    discounts: Optional[Iterable[DiscountInfo]] = None,
+) -> CheckoutPrices:
+    """Return prices of the checkout, cached in the `checkout_prices_cache` block."""
+    discounts = discounts or []
+    lines = list(lines)
+    cache = getattr(_prices_cache, "prices", None)
+    if cache is None:
+        return CheckoutPrices(checkout, lines, discounts)
+    checkout_key = _get_checkout_key(checkout, discounts)
+    key = (checkout_key, tuple(_get_line_key(line) for line in lines))
+    if key not in cache:
+        cache[key] = CheckoutPrices(
+            checkout, lines, discounts, line_totals=cache.setdefault(checkout_key, {})
+        )
+    return cache[key]
+
 
 def checkout_shipping_price(
     *,
@@ -20,10 +148,7 @@ def checkout_shipping_price(
 
     It takes in account all plugins.
     """
-    calculated_checkout_shipping = get_plugins_manager().calculate_checkout_shipping(
-        checkout, lines, discounts or []
-    )
-    return quantize_price(calculated_checkout_shipping, checkout.currency)
+    return get_checkout_prices(checkout, lines, discounts).shipping_price
 
 
 def checkout_subtotal(
@@ -36,10 +161,7 @@ def checkout_subtotal(
 
     It takes in account all plugins.
     """
-    calculated_checkout_subtotal = get_plugins_manager().calculate_checkout_subtotal(
-        checkout, lines, discounts or []
-    )
-    return quantize_price(calculated_checkout_subtotal, checkout.currency)
+    return get_checkout_prices(checkout, lines, discounts).subtotal
 
 
 def calculate_checkout_total_with_gift_cards(
@@ -66,10 +188,7 @@ def checkout_total(
 
     It takes in account all plugins.
     """
-    calculated_checkout_total = get_plugins_manager().calculate_checkout_total(
-        checkout, lines, discounts or []
-    )
-    return quantize_price(calculated_checkout_total, checkout.currency)
+    return get_checkout_prices(checkout, lines, discounts).total
 
 
 def checkout_line_total(
@@ -79,7 +198,4 @@ def checkout_line_total(
 
     It takes in account all plugins.
     """
-    calculated_line_total = get_plugins_manager().calculate_checkout_line_total(
-        line, discounts or []
-    )
-    return quantize_price(calculated_line_total, line.checkout.currency)
+    return get_checkout_prices(line.checkout, [], discounts).line_total(line)
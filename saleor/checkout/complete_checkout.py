@@ -33,7 +33,7 @@ from ..payment.models import Payment, Transaction
 from ..payment.utils import store_customer_id
 from ..plugins.manager import get_plugins_manager
 from ..warehouse.availability import check_stock_quantity
-from ..warehouse.management import allocate_stock
+from ..warehouse.management import allocate_stocks
 from . import AddressType, models
 from .checkout_cleaner import clean_checkout_payment, clean_checkout_shipping
 from .models import Checkout, CheckoutLine
@@ -147,8 +147,9 @@ def _create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLin
     if translated_variant_name == variant_name:
         translated_variant_name = ""
 
-    manager = get_plugins_manager()
-    total_line_price = manager.calculate_checkout_line_total(checkout_line, discounts)
+    total_line_price = calculations.checkout_line_total(
+        line=checkout_line, discounts=discounts
+    )
     unit_price = quantize_price(
         total_line_price / checkout_line.quantity, total_line_price.currency
     )
@@ -183,16 +184,16 @@ def _prepare_order_data(
     order_data = {}
 
     manager = get_plugins_manager()
-    taxed_total = calculations.checkout_total(
-        checkout=checkout, lines=lines, discounts=discounts
+    # cached prices are shared, so gift cards are subtracted from a copy
+    taxed_total = (
+        calculations.checkout_total(checkout=checkout, lines=lines, discounts=discounts)
+        - checkout.get_total_gift_cards_balance()
     )
-    cards_total = checkout.get_total_gift_cards_balance()
-    taxed_total.gross -= cards_total
-    taxed_total.net -= cards_total
-
     taxed_total = max(taxed_total, zero_taxed_money(checkout.currency))
 
-    shipping_total = manager.calculate_checkout_shipping(checkout, lines, discounts)
+    shipping_total = calculations.checkout_shipping_price(
+        checkout=checkout, lines=lines, discounts=discounts
+    )
     order_data.update(_process_shipping_data_for_order(checkout, shipping_total))
     order_data.update(_process_user_data_for_order(checkout))
     order_data.update(
@@ -217,7 +218,9 @@ def _prepare_order_data(
     # assign gift cards to the order
 
     order_data["total_price_left"] = (
-        manager.calculate_checkout_subtotal(checkout, lines, discounts)
+        calculations.checkout_subtotal(
+            checkout=checkout, lines=lines, discounts=discounts
+        )
         + shipping_total
         - checkout.discount
     ).gross
@@ -254,10 +257,12 @@ def _create_order(*, checkout: Checkout, order_data: dict, user: User) -> Order:
     order_lines = OrderLine.objects.bulk_create(order_lines)
 
     # allocate stocks from the lines
-    for line in order_lines:  # type: OrderLine
-        variant = line.variant
-        if variant and variant.track_inventory:
-            allocate_stock(line, checkout.get_country(), line.quantity)
+    lines_to_allocate = [
+        line
+        for line in order_lines
+        if line.variant and line.variant.track_inventory  # type: ignore
+    ]
+    allocate_stocks(lines_to_allocate, checkout.get_country())
 
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
@@ -372,6 +377,7 @@ def _process_payment(
     return txn
 
 
+@calculations.checkout_prices_cache()
 def complete_checkout(
     checkout: models.Checkout,
     payment_data,
@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+from ...plugins.manager import PluginsManager
+from .. import calculations
+from ..complete_checkout import _prepare_order_data
+
+
+def _spy(method_name):
+    return patch.object(
+        PluginsManager,
+        method_name,
+        autospec=True,
+        side_effect=getattr(PluginsManager, method_name),
+    )
+
+
+def test_checkout_prices_calculated_once_in_cache_block(
+    checkout_with_item, shipping_method
+):
+    checkout = checkout_with_item
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    lines = list(checkout)
+
+    with _spy("calculate_checkout_line_total") as line_total_mock, _spy(
+        "calculate_checkout_shipping"
+    ) as shipping_mock, _spy("calculate_checkout_total") as total_mock:
+        with calculations.checkout_prices_cache():
+            totals = [
+                calculations.checkout_total(checkout=checkout, lines=list(checkout))
+                for _ in range(3)
+            ]
+            subtotal = calculations.checkout_subtotal(checkout=checkout, lines=lines)
+            line_total = calculations.checkout_line_total(line=lines[0])
+
+    assert totals[0] == totals[1] == totals[2]
+    assert subtotal == line_total
+    assert line_total_mock.call_count == 1
+    assert shipping_mock.call_count == 1
+    assert total_mock.call_count == 1
+
+
+def test_checkout_prices_not_cached_outside_cache_block(checkout_with_item):
+    checkout = checkout_with_item
+
+    with _spy("calculate_checkout_total") as total_mock:
+        calculations.checkout_total(checkout=checkout, lines=list(checkout))
+        calculations.checkout_total(checkout=checkout, lines=list(checkout))
+
+    assert total_mock.call_count == 2
+
+
+def test_checkout_prices_recalculated_when_checkout_changed(
+    checkout_with_item, shipping_method
+):
+    checkout = checkout_with_item
+    line = checkout.lines.first()
+
+    with calculations.checkout_prices_cache():
+        total = calculations.checkout_total(checkout=checkout, lines=[line])
+
+        line.quantity += 1
+        total_with_new_quantity = calculations.checkout_total(
+            checkout=checkout, lines=[line]
+        )
+
+        checkout.shipping_method = shipping_method
+        total_with_shipping = calculations.checkout_total(
+            checkout=checkout, lines=[line]
+        )
+
+    assert total_with_new_quantity.gross > total.gross
+    assert total_with_shipping.gross == (
+        total_with_new_quantity.gross + shipping_method.price
+    )
+
+
+def test_prepare_order_data_does_not_change_cached_checkout_total(
+    checkout_with_gift_card, shipping_method, address
+):
+    checkout = checkout_with_gift_card
+    checkout.shipping_address = address
+    checkout.billing_address = address
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    lines = list(checkout)
+
+    with calculations.checkout_prices_cache():
+        total = calculations.checkout_total(checkout=checkout, lines=lines)
+        expected_amount = total.gross.amount
+        order_data = _prepare_order_data(checkout=checkout, lines=lines, discounts=None)
+        total = calculations.checkout_total(checkout=checkout, lines=lines)
+
+    assert total.gross.amount == expected_amount
+    assert order_data["total"].gross.amount < expected_amount
@@ -2,10 +2,11 @@ import pytest
 from measurement.measures import Weight
 from prices import Money, TaxedMoney
 
+from ...core.exceptions import InsufficientStock
 from ...product.models import Category
 from .. import calculations, utils
 from ..models import Checkout
-from ..utils import add_variant_to_checkout
+from ..utils import add_variant_to_checkout, add_variants_to_checkout
 
 
 @pytest.fixture()
@@ -72,6 +73,58 @@ def test_adding_invalid_quantity(checkout, product):
         add_variant_to_checkout(checkout, variant, -1)
 
 
+def test_adding_many_variants(checkout, product_list, django_assert_num_queries):
+    variants = [product.variants.get() for product in product_list]
+    add_variant_to_checkout(checkout, variants[0], 1)
+
+    with django_assert_num_queries(6):
+        add_variants_to_checkout(checkout, variants, [2, 1, 3])
+
+    assert checkout.quantity == 7
+    assert [(line.variant, line.quantity) for line in checkout] == [
+        (variants[0], 3),
+        (variants[1], 1),
+        (variants[2], 3),
+    ]
+
+
+def test_adding_many_variants_with_same_variant(checkout, product):
+    variant = product.variants.get()
+    add_variants_to_checkout(checkout, [variant, variant], [1, 2])
+    assert checkout.lines.get().quantity == 3
+    assert checkout.quantity == 3
+
+
+def test_replacing_many_variants(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    add_variants_to_checkout(checkout, variants, [1, 2, 3])
+
+    add_variants_to_checkout(checkout, variants, [0, 5, 3], replace=True)
+
+    assert [(line.variant, line.quantity) for line in checkout] == [
+        (variants[1], 5),
+        (variants[2], 3),
+    ]
+    assert checkout.quantity == 8
+
+
+def test_adding_many_variants_insufficient_stock(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    quantity = variants[1].stocks.get().quantity
+
+    with pytest.raises(InsufficientStock) as exc:
+        add_variants_to_checkout(checkout, variants, [1, quantity + 1, 1])
+
+    assert exc.value.item == variants[1]
+    assert not checkout.lines.exists()
+
+
+def test_adding_many_variants_invalid_quantity(checkout, product):
+    variant = product.variants.get()
+    with pytest.raises(ValueError):
+        add_variants_to_checkout(checkout, [variant], [-1])
+
+
 def test_getting_line(checkout, product):
     variant = product.variants.get()
     assert checkout.get_line(variant) is None
@@ -1,5 +1,5 @@
 """Checkout-related utility functions."""
-from typing import Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
 from django.core.exceptions import ValidationError
 from django.db.models import Max, Min, Sum
@@ -30,10 +30,13 @@ from ..giftcard.utils import (
 )
 from ..plugins.manager import get_plugins_manager
 from ..shipping.models import ShippingMethod
-from ..warehouse.availability import check_stock_quantity
+from ..warehouse.availability import check_stock_quantity, check_stock_quantity_bulk
 from . import AddressType
 from .models import Checkout, CheckoutLine
 
+if TYPE_CHECKING:
+    from ..product.models import ProductVariant
+
 
 def get_user_checkout(
     user: User, checkout_queryset=Checkout.objects.all(), auto_create=False
@@ -119,6 +122,87 @@ def add_variant_to_checkout(
     update_checkout_quantity(checkout)
 
 
+def add_variants_to_checkout(
+    checkout: Checkout,
+    variants: Iterable["ProductVariant"],
+    quantities: Iterable[int],
+    replace: bool = False,
+    check_quantity: bool = True,
+):
+    """Add product variants to checkout in bulk.
+
+    Works like calling `add_variant_to_checkout` for each variant, but stocks of
+    all variants are checked at once, lines are created, updated and deleted
+    with a single query each and the checkout quantity is updated only once.
+    Variants' products should be prefetched.
+    """
+    variants_and_quantities = list(zip(variants, quantities))
+    for variant, _ in variants_and_quantities:
+        if not variant.product.is_published:
+            raise ProductNotPublished()
+
+    lines_by_variant_id: Dict[int, CheckoutLine] = {}
+    for line in checkout.lines.all():
+        lines_by_variant_id.setdefault(line.variant_id, line)
+
+    new_quantities: Dict[int, int] = {}
+    variants_by_id: Dict[int, "ProductVariant"] = {}
+    for variant, quantity in variants_and_quantities:
+        line = lines_by_variant_id.get(variant.pk)
+        if variant.pk in new_quantities:
+            line_quantity = new_quantities[variant.pk]
+        else:
+            line_quantity = 0 if line is None else line.quantity
+        new_quantity = quantity if replace else (quantity + line_quantity)
+        if new_quantity < 0:
+            raise ValueError(
+                "%r is not a valid quantity (results in %r)" % (quantity, new_quantity)
+            )
+        new_quantities[variant.pk] = new_quantity
+        variants_by_id[variant.pk] = variant
+
+    if check_quantity:
+        variants_to_check = [
+            variants_by_id[variant_id]
+            for variant_id, quantity in new_quantities.items()
+            if quantity > 0
+        ]
+        check_stock_quantity_bulk(
+            variants_to_check,
+            checkout.get_country(),
+            [new_quantities[variant.pk] for variant in variants_to_check],
+        )
+
+    lines_to_create = []
+    lines_to_update = []
+    line_ids_to_delete = []
+    for variant_id, new_quantity in new_quantities.items():
+        line = lines_by_variant_id.get(variant_id)
+        if new_quantity == 0:
+            if line is not None:
+                line_ids_to_delete.append(line.pk)
+        elif line is None:
+            lines_to_create.append(
+                CheckoutLine(
+                    checkout=checkout,
+                    variant=variants_by_id[variant_id],
+                    quantity=new_quantity,
+                )
+            )
+        elif line.quantity != new_quantity:
+            line.quantity = new_quantity
+            lines_to_update.append(line)
+
+    if line_ids_to_delete:
+        CheckoutLine.objects.filter(pk__in=line_ids_to_delete).delete()
+    if lines_to_create:
+        CheckoutLine.objects.bulk_create(lines_to_create)
+    if lines_to_update:
+        CheckoutLine.objects.bulk_update(lines_to_update, ["quantity"])
+
+    update_checkout_quantity(checkout)
+
+
 def _check_new_checkout_address(checkout, address, address_type):
     """Check if and address in checkout has changed and if to remove old one."""
     if address_type == AddressType.BILLING:
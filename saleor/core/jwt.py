@@ -1,14 +1,18 @@
+import hashlib
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Set
 
 import graphene
 import jwt
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.utils.crypto import get_random_string
 
 from ..account.models import User
 from ..app.models import App
-from .permissions import get_permission_names, get_permissions_from_names
+from .permissions import get_permission_names, get_permissions_enum_dict
 
 JWT_ALGORITHM = "HS256"
 JWT_AUTH_HEADER = "HTTP_AUTHORIZATION"
@@ -20,6 +24,9 @@ JWT_REFRESH_TOKEN_COOKIE_NAME = "refreshToken"
 
 PERMISSIONS_FIELD = "permissions"
 
+JWT_USER_CACHE_KEY = "jwt_user_{}"
+JWT_USERS_CACHE_VERSION_KEY = "jwt_users_version"
+
 
 def jwt_base_payload(exp_delta: timedelta) -> Dict[str, Any]:
     utc_now = datetime.utcnow()
@@ -96,10 +103,54 @@ def get_token_from_request(request: WSGIRequest) -> Optional[str]:
     return auth[1]
 
 
+def get_jwt_user_cache_key(email: str) -> str:
+    return JWT_USER_CACHE_KEY.format(hashlib.md5(email.encode("utf-8")).hexdigest())
+
+
+def get_user_permissions(user: User) -> Set[str]:
+    """Return names of effective permissions of the user in the auth backend format."""
+    permissions = user.effective_permissions.values_list(
+        "content_type__app_label", "codename"
+    ).order_by()
+    return {"%s.%s" % (app_label, codename) for app_label, codename in permissions}
+
+
+def _get_user_with_permissions(email: str, user_jwt_token: str):
+    """Return an active user with the given email and names of their permissions.
+
+    The user row, its token key and permissions are cached for a short time.
+    A cached user whose token key doesn't match the token is read from
+    the database again, so a token created after the key was rotated is accepted.
+    """
+    user_cache_key = get_jwt_user_cache_key(email)
+    cached = cache.get_many([user_cache_key, JWT_USERS_CACHE_VERSION_KEY])
+    version = cached.get(JWT_USERS_CACHE_VERSION_KEY, "")
+    cached_user = cached.get(user_cache_key)
+    if cached_user and cached_user["version"] == version:
+        user = cached_user["user"]
+        if user.jwt_token_key == user_jwt_token:
+            return user, cached_user["permissions"]
+
+    user = User.objects.filter(email=email, is_active=True).first()
+    if not user:
+        return None, set()
+    permissions = get_user_permissions(user)
+    cache.set(
+        user_cache_key,
+        {"user": user, "permissions": permissions, "version": version},
+        settings.JWT_USER_CACHE_TIMEOUT,
+    )
+    return user, permissions
+
+
 def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
-    user = User.objects.filter(email=payload["email"], is_active=True).first()
     user_jwt_token = payload.get("token")
-    if not user_jwt_token or not user:
+    if not user_jwt_token:
+        raise jwt.InvalidTokenError(
+            "Invalid token. Create new one by using tokenCreate mutation."
+        )
+    user, permissions = _get_user_with_permissions(payload["email"], user_jwt_token)
+    if not user:
         raise jwt.InvalidTokenError(
             "Invalid token. Create new one by using tokenCreate mutation."
         )
@@ -107,6 +158,8 @@ def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
         raise jwt.InvalidTokenError(
             "Invalid token. Create new one by using tokenCreate mutation."
         )
+    # permissions are cached in the same way as in the authentication backend
+    user._effective_permissions_cache = permissions
     return user
 
 
@@ -120,14 +173,41 @@ def get_user_from_access_token(token: str) -> Optional[User]:
     permissions = payload.get(PERMISSIONS_FIELD, None)
     user = get_user_from_payload(payload)
     if user and permissions is not None:
-        token_permissions = get_permissions_from_names(permissions)
-        token_codenames = [perm.codename for perm in token_permissions]
+        permissions_enums = get_permissions_enum_dict()
+        token_permissions = [permissions_enums[name] for name in permissions]
+        user_permissions = user._effective_permissions_cache
         user.effective_permissions = user.effective_permissions.filter(
-            codename__in=token_codenames
+            codename__in=[perm.codename for perm in token_permissions]
         )
+        user._effective_permissions_cache = user_permissions & {
+            perm.value for perm in token_permissions
+        }
     return user
 
 
+def invalidate_jwt_user_cache(emails: Iterable[str]):
+    """Remove cached users used to authenticate tokens of the given emails.
+
+    Has to be called when a user is changed. Cached users are removed right away
+    and once again after the current transaction is committed.
+    """
+    keys = [get_jwt_user_cache_key(email) for email in emails]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_jwt_users_cache():
+    """Invalidate all cached users used to authenticate tokens.
+
+    Has to be called when permissions of many users may change, e.g. when
+    a permission group is changed.
+    """
+    cache.set(JWT_USERS_CACHE_VERSION_KEY, get_random_string(), None)
+    transaction.on_commit(
+        lambda: cache.set(JWT_USERS_CACHE_VERSION_KEY, get_random_string(), None)
+    )
+
+
 def create_access_token_for_app(app: "App", user: "User"):
     """Create access token for app.
 
@@ -20,6 +20,7 @@ from ....product.models import Attribute, Category, Collection, Product, Product
 from ....shipping.models import ShippingMethod, ShippingZone
 from ....warehouse.models import Warehouse
 from ....webhook.models import Webhook
+from ....webhook.utils import invalidate_subscribed_event_types
 
 
 class Command(BaseCommand):
@@ -91,6 +92,7 @@ class Command(BaseCommand):
         self.stdout.write("Removed pages")
 
         Webhook.objects.all().delete()
+        invalidate_subscribed_event_types()
         self.stdout.write("Removed webhooks")
 
         # Delete all users except for staff members.
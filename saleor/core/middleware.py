@@ -9,8 +9,10 @@ from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 from django_countries.fields import Country
 
-from ..discount.utils import fetch_discounts
-from ..plugins.manager import get_plugins_manager
+from ..checkout.calculations import checkout_prices_cache
+from ..discount.utils import fetch_cached_discounts
+from ..plugins.manager import get_cached_plugins_manager
+from ..plugins.webhook.buffer import webhook_events_buffer
 from . import analytics
 from .jwt import JWT_REFRESH_TOKEN_COOKIE_NAME, jwt_decode
 from .utils import get_client_ip, get_country_by_ip, get_currency_for_country
@@ -53,7 +55,7 @@ def discounts(get_response):
 
     def _discounts_middleware(request):
         request.discounts = SimpleLazyObject(
-            lambda: fetch_discounts(request.request_time)
+            lambda: fetch_cached_discounts(request.request_time)
         )
         return get_response(request)
 
@@ -108,10 +110,14 @@ def site(get_response):
 
 
 def plugins(get_response):
-    """Assign plugins manager."""
+    """Assign plugins manager.
+
+    The manager is shared by all requests handled by the process and reloaded only
+    when plugin configuration changes.
+    """
 
     def _get_manager():
-        return get_plugins_manager(plugins=settings.PLUGINS)
+        return get_cached_plugins_manager(plugins=settings.PLUGINS)
 
     def _plugins_middleware(request):
         request.plugins = SimpleLazyObject(lambda: _get_manager())
@@ -120,6 +126,26 @@ def plugins(get_response):
     return _plugins_middleware
 
 
+def checkout_prices(get_response):
+    """Calculate prices of a checkout once per request."""
+
+    def _checkout_prices_middleware(request):
+        with checkout_prices_cache():
+            return get_response(request)
+
+    return _checkout_prices_middleware
+
+
+def webhook_events(get_response):
+    """Send repeated webhook events of one object once, at the end of the request."""
+
+    def _webhook_events_middleware(request):
+        with webhook_events_buffer():
+            return get_response(request)
+
+    return _webhook_events_middleware
+
+
 def jwt_refresh_token_middleware(get_response):
     def middleware(request):
         """Append generated refresh_token to response object."""
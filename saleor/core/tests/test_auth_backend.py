@@ -1,6 +1,6 @@
 import jwt
 import pytest
-from django.contrib.auth.models import Permission
+from django.contrib.auth.models import Group, Permission
 from freezegun import freeze_time
 from jwt import ExpiredSignatureError, InvalidSignatureError, InvalidTokenError
 
@@ -14,7 +14,7 @@ from ..jwt import (
     jwt_encode,
     jwt_user_payload,
 )
-from ..permissions import get_permissions_from_names
+from ..permissions import OrderPermissions, get_permissions_from_names
 
 
 def test_user_authenticated(rf, staff_user):
@@ -175,3 +175,156 @@ def test_user_has_old_token_type(rf, staff_user, settings):
     backend = JSONWebTokenBackend()
     with pytest.raises(InvalidTokenError):
         backend.authenticate(request)
+
+
+def test_user_authenticated_from_cache(
+    rf, staff_user, permission_manage_orders, django_assert_num_queries
+):
+    staff_user.user_permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    with django_assert_num_queries(0):
+        user = backend.authenticate(
+            rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+        )
+        assert user.has_perm(OrderPermissions.MANAGE_ORDERS)
+    assert user == staff_user
+
+
+def test_cached_user_token_key_rotated(rf, staff_user):
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    staff_user.jwt_token_key = "New key"
+    staff_user.save(update_fields=["jwt_token_key"])
+
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    new_access_token = create_access_token(staff_user)
+    user = backend.authenticate(
+        rf.request(HTTP_AUTHORIZATION=f"JWT {new_access_token}")
+    )
+    assert user == staff_user
+
+
+def test_cached_user_token_with_new_key_reads_user_again(rf, staff_user):
+    access_token = create_access_token(staff_user)
+    backend = JSONWebTokenBackend()
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+    # the key is changed without invalidating the cached user
+    staff_user.__class__.objects.filter(pk=staff_user.pk).update(
+        jwt_token_key="New key"
+    )
+    staff_user.jwt_token_key = "New key"
+    new_access_token = create_access_token(staff_user)
+
+    user = backend.authenticate(
+        rf.request(HTTP_AUTHORIZATION=f"JWT {new_access_token}")
+    )
+    assert user == staff_user
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
+def _authenticate(rf, access_token):
+    backend = JSONWebTokenBackend()
+    return backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
+def test_cached_user_permissions_invalidated_by_group_change(
+    rf, staff_user, permission_manage_orders
+):
+    access_token = create_access_token(staff_user)
+    assert not _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+    group = Group.objects.create(name="Orders")
+    group.user_set.add(staff_user)
+    _authenticate(rf, access_token)
+    group.permissions.add(permission_manage_orders)
+    assert _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+    group.permissions.remove(permission_manage_orders)
+    assert not _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+
+def test_cached_user_permissions_invalidated_by_group_delete(
+    rf, staff_user, permission_manage_orders
+):
+    group = Group.objects.create(name="Orders")
+    group.permissions.add(permission_manage_orders)
+    staff_user.groups.add(group)
+    access_token = create_access_token(staff_user)
+    assert _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+    group.delete()
+
+    assert not _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+
+@pytest.mark.parametrize(
+    "revoke",
+    [
+        lambda user, permission: user.user_permissions.remove(permission),
+        lambda user, permission: user.user_permissions.clear(),
+        lambda user, permission: permission.user_set.remove(user),
+        lambda user, permission: permission.user_set.clear(),
+    ],
+)
+def test_cached_user_permissions_invalidated_by_revoking_permission(
+    revoke, rf, staff_user, permission_manage_orders
+):
+    staff_user.user_permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    assert _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+    revoke(staff_user, permission_manage_orders)
+
+    assert not _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+
+@pytest.mark.parametrize(
+    "remove_from_group",
+    [
+        lambda user, group: user.groups.remove(group),
+        lambda user, group: user.groups.clear(),
+        lambda user, group: group.user_set.remove(user),
+        lambda user, group: group.user_set.clear(),
+    ],
+)
+def test_cached_user_permissions_invalidated_by_removing_from_group(
+    remove_from_group, rf, staff_user, permission_manage_orders
+):
+    group = Group.objects.create(name="Orders")
+    group.permissions.add(permission_manage_orders)
+    staff_user.groups.add(group)
+    access_token = create_access_token(staff_user)
+    assert _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+    remove_from_group(staff_user, group)
+
+    assert not _authenticate(rf, access_token).has_perm(OrderPermissions.MANAGE_ORDERS)
+
+
+def test_cached_user_with_limited_permissions(rf, staff_user, app):
+    staff_user.user_permissions.set(
+        Permission.objects.filter(codename__in=["manage_orders", "manage_checkouts"])
+    )
+    app.permissions.set(Permission.objects.filter(codename__in=["manage_checkouts"]))
+    backend = JSONWebTokenBackend()
+    access_token = create_access_token(staff_user)
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    access_token_for_app = create_access_token_for_app(app, staff_user)
+
+    user = backend.authenticate(
+        rf.request(HTTP_AUTHORIZATION=f"JWT {access_token_for_app}")
+    )
+
+    assert user.has_perm("checkout.manage_checkouts")
+    assert not user.has_perm(OrderPermissions.MANAGE_ORDERS)
+    assert set(user.effective_permissions) == set(
+        Permission.objects.filter(codename__in=["manage_checkouts"])
+    )
@@ -39,7 +39,7 @@ from ...discount.utils import fetch_discounts
 from ...giftcard.models import GiftCard
 from ...menu.models import Menu
 from ...order.models import Fulfillment, Order, OrderLine
-from ...order.utils import update_order_status
+from ...order.utils import update_daily_variant_sales, update_order_status
 from ...page.models import Page
 from ...payment import gateway
 from ...payment.utils import create_payment
@@ -66,6 +66,7 @@ from ...product.thumbnails import (
     create_product_thumbnails,
 )
 from ...shipping.models import ShippingMethod, ShippingMethodType, ShippingZone
+from ...shipping.utils import get_shipping_zone_ids_for_country
 from ...warehouse.management import increase_stock
 from ...warehouse.models import Stock, Warehouse
 
@@ -482,9 +483,9 @@ def create_order_lines(order, discounts, how_many=10):
         )
     lines = OrderLine.objects.bulk_create(lines)
     manager = get_plugins_manager()
-    country = order.shipping_method.shipping_zone.countries[0]
+    country = order.shipping_method.shipping_zone.countries[0].code
     warehouses = Warehouse.objects.filter(
-        shipping_zones__countries__contains=country
+        shipping_zones__in=get_shipping_zone_ids_for_country(country)
     ).order_by("?")
     warehouse_iter = itertools.cycle(warehouses)
     for line in lines:
@@ -565,6 +566,7 @@ def create_fake_order(discounts, max_order_lines=5):
 
     create_fake_payment(order=order)
     create_fulfillments(order)
+    update_daily_variant_sales(order)
     return order
 
 
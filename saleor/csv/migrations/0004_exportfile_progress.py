@@ -0,0 +1,23 @@
+# Generated by Django 3.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("csv", "0003_auto_20200810_1415"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportfile",
+            name="processed_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="exportfile",
+            name="total_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,16 +1,37 @@
-from typing import Dict, Union
+from typing import Dict, List, Union
+
+from celery import chord
+from django.conf import settings
+from django.core.files.storage import default_storage
 
 from ..celeryconf import app
 from ..core import JobStatus
 from . import events
 from .emails import send_export_failed_info
 from .models import ExportFile
-from .utils.export import export_products
+from .utils.export import (
+    delete_export_file_parts,
+    export_products,
+    export_products_shard,
+    get_product_queryset,
+    get_product_shards,
+    merge_export_file_parts,
+    start_export_progress,
+)
+
+
+def get_export_file_id(args, kwargs) -> int:
+    # chord callbacks get the results of the header tasks as the first argument,
+    # so they receive the export file id as a keyword argument
+    return kwargs["export_file_id"] if "export_file_id" in kwargs else args[0]
 
 
 def on_task_failure(self, exc, task_id, args, kwargs, einfo):
-    export_file_id = args[0]
+    export_file_id = get_export_file_id(args, kwargs)
     export_file = ExportFile.objects.get(pk=export_file_id)
+    if export_file.status == JobStatus.FAILED:
+        # other shard of the same export has already failed
+        return
 
     export_file.content_file = None
     export_file.status = JobStatus.FAILED
@@ -28,8 +49,14 @@ def on_task_failure(self, exc, task_id, args, kwargs, einfo):
         send_export_failed_info(export_file, export_file.user.email, "export_failed")
 
 
+def on_shard_task_failure(self, exc, task_id, args, kwargs, einfo):
+    # parts saved by other shards would never be merged
+    delete_export_file_parts(get_export_file_id(args, kwargs))
+    on_task_failure(self, exc, task_id, args, kwargs, einfo)
+
+
 def on_task_success(self, retval, task_id, args, kwargs):
-    export_file_id = args[0]
+    export_file_id = get_export_file_id(args, kwargs)
 
     export_file = ExportFile.objects.get(pk=export_file_id)
     export_file.status = JobStatus.SUCCESS
@@ -50,3 +77,70 @@ def export_products_task(
 ):
     export_file = ExportFile.objects.get(pk=export_file_id)
     export_products(export_file, scope, export_info, file_type, delimiter)
+
+
+@app.task(on_failure=on_task_failure)
+def export_products_in_shards_task(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ";",
+    shards_count: int = None,
+):
+    """Export products with parallel tasks, each exporting a range of products.
+
+    Shards save parts of the file which are concatenated into the export file
+    by a chord callback, once all of them are finished.
+    """
+    shards_count = shards_count or settings.EXPORT_PRODUCTS_SHARDS
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    queryset = get_product_queryset(scope)
+
+    start_export_progress(export_file, queryset.count())
+    shards = [
+        export_products_shard_task.s(
+            export_file_id, scope, export_info, file_type, delimiter, first_pk, last_pk
+        )
+        for first_pk, last_pk in get_product_shards(queryset, shards_count)
+    ]
+    callback = merge_export_file_parts_task.s(
+        export_file_id=export_file_id,
+        export_info=export_info,
+        file_type=file_type,
+        delimiter=delimiter,
+    )
+    chord(shards)(callback)
+
+
+@app.task(on_failure=on_shard_task_failure)
+def export_products_shard_task(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str,
+    first_pk: int,
+    last_pk: int,
+) -> str:
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    part_name = export_products_shard(
+        export_file, scope, export_info, file_type, delimiter, first_pk, last_pk
+    )
+    export_file.refresh_from_db(fields=["status"])
+    if export_file.status == JobStatus.FAILED:
+        # other shard has failed while this one was running
+        default_storage.delete(part_name)
+    return part_name
+
+
+@app.task(on_success=on_task_success, on_failure=on_shard_task_failure)
+def merge_export_file_parts_task(
+    part_names: List[str],
+    export_file_id: int,
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ";",
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    merge_export_file_parts(export_file, part_names, export_info, file_type, delimiter)
@@ -1,9 +1,7 @@
 import shutil
-from tempfile import NamedTemporaryFile
 from unittest.mock import ANY, MagicMock, patch
 
 import openpyxl
-import petl as etl
 import pytest
 from django.core.files import File
 from freezegun import freeze_time
@@ -19,6 +17,7 @@ from ...utils.export import (
     export_products_in_batches,
     get_filename,
     get_product_queryset,
+    get_product_shards,
     save_csv_file_in_export_file,
 )
 
@@ -47,7 +46,9 @@ def test_export_products(
     }
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock()
+    mock_writer.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(user_export_file, {"all": ""}, export_info, file_type)
@@ -65,9 +66,8 @@ def test_export_products(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ";",
-        mock_file,
-        file_type,
+        mock_writer,
+        user_export_file,
     )
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
@@ -96,7 +96,9 @@ def test_export_products_ids(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock()
+    mock_writer.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(user_export_file, {"ids": pks}, export_info, file_type)
@@ -109,7 +111,7 @@ def test_export_products_ids(
     assert set(args[0].values_list("pk", flat=True)) == set(
         Product.objects.filter(pk__in=pks).values_list("pk", flat=True)
     )
-    assert args[1:] == (export_info, {"id"}, ["id"], ";", mock_file, file_type,)
+    assert args[1:] == (export_info, {"id"}, ["id"], mock_writer, user_export_file)
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
     )
@@ -139,7 +141,9 @@ def test_export_products_filter(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock()
+    mock_writer.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(
@@ -154,7 +158,7 @@ def test_export_products_filter(
     assert set(args[0].values_list("pk", flat=True)) == set(
         Product.objects.filter(is_published=True).values_list("pk", flat=True)
     )
-    assert args[1:] == (export_info, {"id"}, ["id"], ";", mock_file, file_type,)
+    assert args[1:] == (export_info, {"id"}, ["id"], mock_writer, user_export_file)
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
     )
@@ -182,7 +186,9 @@ def test_export_products_by_app(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    mock_writer = MagicMock()
+    mock_writer.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = mock_writer
 
     # when
     export_products(app_export_file, {"all": ""}, export_info, file_type)
@@ -201,9 +207,8 @@ def test_export_products_by_app(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ";",
-        mock_file,
-        file_type,
+        mock_writer,
+        app_export_file,
     )
 
     send_email_mock.assert_not_called()
@@ -255,9 +260,10 @@ def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    csv_file = create_file_with_headers(file_headers, ";", FileTypes.CSV)
+    file_writer = create_file_with_headers(file_headers, ";", FileTypes.CSV)
 
     # then
+    csv_file = file_writer.close()
     assert csv_file
 
     file_content = csv_file.read().decode().split("\r\n")
@@ -274,9 +280,10 @@ def test_create_file_with_headers_xlsx(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    xlsx_file = create_file_with_headers(file_headers, ";", FileTypes.XLSX)
+    file_writer = create_file_with_headers(file_headers, ";", FileTypes.XLSX)
 
     # then
+    xlsx_file = file_writer.close()
     assert xlsx_file
 
     wb_obj = openpyxl.load_workbook(xlsx_file)
@@ -314,16 +321,13 @@ def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
     headers = ["id", "name", "collections"]
     delimiter = ";"
 
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing=" ")
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
+    file_writer = create_file_with_headers(headers, delimiter, FileTypes.CSV)
 
     # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
+    append_to_file(export_data, headers, file_writer)
 
     # then
-    user_export_file.refresh_from_db()
+    temp_file = file_writer.close()
 
     file_content = temp_file.read().decode().split("\r\n")
     assert ";".join(headers) in file_content
@@ -343,18 +347,13 @@ def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
     expected_headers = ["id", "name", "collections"]
     delimiter = ";"
 
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=" "
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_writer = create_file_with_headers(expected_headers, delimiter, FileTypes.XLSX)
 
     # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, delimiter)
+    append_to_file(export_data, expected_headers, file_writer)
 
     # then
-    user_export_file.refresh_from_db()
+    temp_file = file_writer.close()
 
     wb_obj = openpyxl.load_workbook(temp_file)
 
@@ -395,10 +394,7 @@ def test_export_products_in_batches_for_csv(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=";")
+    file_writer = create_file_with_headers(expected_headers, ";", FileTypes.CSV)
 
     # when
     export_products_in_batches(
@@ -406,12 +402,14 @@ def test_export_products_in_batches_for_csv(
         export_info,
         set(export_fields),
         export_fields,
-        ";",
-        temp_file,
-        FileTypes.CSV,
+        file_writer,
+        user_export_file,
     )
 
     # then
+    temp_file = file_writer.close()
+    user_export_file.refresh_from_db()
+    assert user_export_file.processed_count == len(product_list)
 
     expected_data = []
     for product in qs.order_by("pk"):
@@ -448,10 +446,7 @@ def test_export_products_in_batches_for_xlsx(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    file_writer = create_file_with_headers(expected_headers, ";", FileTypes.XLSX)
 
     # when
     export_products_in_batches(
@@ -459,12 +454,12 @@ def test_export_products_in_batches_for_xlsx(
         export_info,
         set(export_fields),
         export_fields,
-        ";",
-        temp_file,
-        FileTypes.XLSX,
+        file_writer,
+        user_export_file,
     )
 
     # then
+    temp_file = file_writer.close()
     expected_data = []
     for product in qs.order_by("pk"):
         product_data = []
@@ -493,3 +488,28 @@ def test_export_products_in_batches_for_xlsx(
         assert row in data
 
     shutil.rmtree(tmpdir)
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1)
+def test_get_product_shards(product_list):
+    # given
+    pks = sorted(product.pk for product in product_list)
+    queryset = Product.objects.order_by("pk")
+
+    # when
+    shards = get_product_shards(queryset, 2)
+
+    # then
+    assert shards == [(pks[0], pks[1]), (pks[2], pks[2])]
+
+
+def test_get_product_shards_more_shards_than_batches(product_list):
+    # given
+    pks = sorted(product.pk for product in product_list)
+    queryset = Product.objects.order_by("pk")
+
+    # when
+    shards = get_product_shards(queryset, 4)
+
+    # then
+    assert shards == [(pks[0], pks[-1])]
@@ -1,13 +1,25 @@
 import datetime
 from unittest.mock import Mock, patch
 
+import openpyxl
+import pytest
 import pytz
+from django.core.files.storage import default_storage
 from freezegun import freeze_time
 
 from ...core import JobStatus
+from ...graphql.csv.enums import ProductFieldEnum
+from ...product.models import Product
 from .. import ExportEvents, FileTypes
 from ..models import ExportEvent
-from ..tasks import export_products_task, on_task_failure, on_task_success
+from ..tasks import (
+    export_products_in_shards_task,
+    export_products_shard_task,
+    export_products_task,
+    on_task_failure,
+    on_task_success,
+)
+from ..utils.export import export_products_shard
 
 
 @patch("saleor.csv.tasks.export_products")
@@ -129,3 +141,145 @@ def test_on_task_success(user_export_file):
         user=user_export_file.user,
         type=ExportEvents.EXPORT_SUCCESS,
     )
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1)
+@patch("saleor.csv.utils.export.send_email_with_link_to_download_file")
+def test_export_products_in_shards_task_csv(
+    send_email_mock, product_list, user_export_file, media_root
+):
+    # given
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value],
+        "warehouses": [],
+        "attributes": [],
+    }
+
+    # when
+    export_products_in_shards_task(
+        user_export_file.pk, {"all": ""}, export_info, FileTypes.CSV, ";", 2
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.SUCCESS
+    assert user_export_file.total_count == len(product_list)
+    assert user_export_file.processed_count == len(product_list)
+    file_content = user_export_file.content_file.read().decode().split("\r\n")
+    expected_rows = [
+        f"{product.pk};{product.name}" for product in Product.objects.order_by("pk")
+    ]
+    assert file_content == ["id;name"] + expected_rows + [""]
+    assert not default_storage.listdir("export_files/parts")[1]
+    send_email_mock.assert_called_once_with(
+        user_export_file, user_export_file.user.email, "export_products_success"
+    )
+    assert ExportEvent.objects.filter(
+        export_file=user_export_file, type=ExportEvents.EXPORT_SUCCESS
+    ).exists()
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1)
+def test_export_products_in_shards_task_xlsx(
+    product_list, user_export_file, media_root
+):
+    # given
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value],
+        "warehouses": [],
+        "attributes": [],
+    }
+
+    # when
+    export_products_in_shards_task(
+        user_export_file.pk, {"all": ""}, export_info, FileTypes.XLSX, ";", 2
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.SUCCESS
+    workbook = openpyxl.load_workbook(user_export_file.content_file)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    expected_rows = [
+        (product.pk, product.name) for product in Product.objects.order_by("pk")
+    ]
+    assert rows == [("id", "name")] + expected_rows
+
+
+@patch("saleor.csv.tasks.export_products_shard")
+@patch("saleor.csv.tasks.send_export_failed_info")
+def test_export_products_in_shards_task_shard_failed(
+    send_export_failed_info_mock,
+    export_products_shard_mock,
+    product_list,
+    user_export_file,
+    media_root,
+):
+    # given
+    export_products_shard_mock.side_effect = Exception("Test")
+    export_info = {"fields": [], "warehouses": [], "attributes": []}
+
+    # when
+    with pytest.raises(Exception):
+        export_products_in_shards_task(
+            user_export_file.pk, {"all": ""}, export_info, FileTypes.CSV, ";", 2
+        )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.FAILED
+    assert not user_export_file.content_file
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1)
+@patch("saleor.csv.tasks.export_products_shard")
+@patch("saleor.csv.tasks.send_export_failed_info")
+def test_export_products_in_shards_task_shard_failed_parts_deleted(
+    send_export_failed_info_mock,
+    export_products_shard_mock,
+    product_list,
+    user_export_file,
+    media_root,
+):
+    # given
+    def export_first_shard(*args):
+        if export_products_shard_mock.call_count > 1:
+            raise Exception("Test")
+        return export_products_shard(*args)
+
+    export_products_shard_mock.side_effect = export_first_shard
+    export_info = {"fields": [], "warehouses": [], "attributes": []}
+
+    # when
+    with pytest.raises(Exception):
+        export_products_in_shards_task(
+            user_export_file.pk, {"all": ""}, export_info, FileTypes.CSV, ";", 2
+        )
+
+    # then
+    assert export_products_shard_mock.call_count == 2
+    assert not default_storage.listdir("export_files/parts")[1]
+
+
+def test_export_products_shard_task_export_failed(
+    product_list, user_export_file, media_root
+):
+    # given
+    user_export_file.status = JobStatus.FAILED
+    user_export_file.save(update_fields=["status"])
+    export_info = {"fields": [], "warehouses": [], "attributes": []}
+    product_pks = [product.pk for product in product_list]
+
+    # when
+    export_products_shard_task(
+        user_export_file.pk,
+        {"all": ""},
+        export_info,
+        FileTypes.CSV,
+        ";",
+        min(product_pks),
+        max(product_pks),
+    )
+
+    # then
+    assert not default_storage.listdir("export_files/parts")[1]
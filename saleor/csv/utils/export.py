@@ -1,21 +1,81 @@
+import csv
+import io
+import math
+import shutil
 from tempfile import NamedTemporaryFile
-from typing import IO, TYPE_CHECKING, Any, Dict, List, Set, Union
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, List, Set, Tuple, Union
 
-import petl as etl
+import openpyxl
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import F
 from django.utils import timezone
 
 from ...product.models import Product
 from .. import FileTypes
 from ..emails import send_email_with_link_to_download_file
-from .products_data import get_export_fields_and_headers_info, get_products_data
+from ..models import ExportFile
+from .products_data import get_export_fields_and_headers_info, iter_products_data
 
 if TYPE_CHECKING:
     # flake8: noqa
     from django.db.models import QuerySet
-    from ..models import ExportFile
 
 
 BATCH_SIZE = 10000
+EXPORT_FILE_PARTS_DIR = "export_files/parts"
+
+
+class CSVFileWriter:
+    """Write rows to a temporary CSV file through a buffered text stream."""
+
+    def __init__(self, delimiter: str):
+        self.file = NamedTemporaryFile("w+b", suffix=".csv")
+        self._stream = io.TextIOWrapper(self.file.file, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._stream, delimiter=delimiter)
+
+    def write_rows(self, rows: Iterable[List[Any]]):
+        self._writer.writerows(rows)
+
+    def append_file(self, part_file: IO[bytes]):
+        self._stream.flush()
+        shutil.copyfileobj(part_file, self.file.file)
+
+    def close(self) -> IO[bytes]:
+        self._stream.flush()
+        self._stream.detach()
+        self.file.seek(0)
+        return self.file
+
+
+class XLSXFileWriter:
+    """Write rows to a temporary XLSX file with a write-only workbook.
+
+    Rows appended to a write-only worksheet are serialized right away instead of
+    being kept in the workbook, the file is created when the writer is closed.
+    """
+
+    def __init__(self):
+        self.file = NamedTemporaryFile("w+b", suffix=".xlsx")
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet()
+
+    def write_rows(self, rows: Iterable[List[Any]]):
+        for row in rows:
+            self._worksheet.append(row)
+
+    def append_file(self, part_file: IO[bytes]):
+        workbook = openpyxl.load_workbook(part_file, read_only=True)
+        self.write_rows(workbook.active.iter_rows(values_only=True))
+        workbook.close()
+
+    def close(self) -> IO[bytes]:
+        self._workbook.save(self.file)
+        self.file.seek(0)
+        return self.file
+
+
+FileWriter = Union[CSVFileWriter, XLSXFileWriter]
 
 
 def export_products(
@@ -32,21 +92,119 @@ def export_products(
         export_info
     )
 
-    temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
+    file_writer = create_file_with_headers(file_headers, delimiter, file_type)
+
+    start_export_progress(export_file, queryset.count())
+    export_products_in_batches(
+        queryset,
+        export_info,
+        set(export_fields),
+        data_headers,
+        file_writer,
+        export_file,
+    )
+
+    temporary_file = file_writer.close()
+    save_csv_file_in_export_file(export_file, temporary_file, file_name)
+    temporary_file.close()
+
+    if export_file.user:
+        send_email_with_link_to_download_file(
+            export_file, export_file.user.email, "export_products_success"
+        )
+
+
+def get_product_shards(
+    queryset: "QuerySet", shards_count: int
+) -> List[Tuple[int, int]]:
+    """Split products into ranges of primary keys exported by separate shards.
+
+    Every range consists of whole batches returned by `queryset_in_batches`
+    and is returned as a pair of the first and the last product pk.
+    """
+    batches = [(pks[0], pks[-1]) for pks in queryset_in_batches(queryset)]
+    if not batches:
+        return []
+    batches_per_shard = math.ceil(len(batches) / max(shards_count, 1))
+    return [
+        (batches[i][0], batches[min(i + batches_per_shard, len(batches)) - 1][1])
+        for i in range(0, len(batches), batches_per_shard)
+    ]
+
+
+def export_products_shard(
+    export_file: "ExportFile",
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str,
+    first_pk: int,
+    last_pk: int,
+) -> str:
+    """Export products with pks in the given range to a file part without headers.
 
+    The part is saved in the default storage, so it can be merged by any worker.
+    Returns the name of the saved part.
+    """
+    queryset = get_product_queryset(scope).filter(pk__gte=first_pk, pk__lte=last_pk)
+    export_fields, _, data_headers = get_export_fields_and_headers_info(export_info)
+
+    file_writer = create_file_writer(delimiter, file_type)
     export_products_in_batches(
         queryset,
         export_info,
         set(export_fields),
         data_headers,
-        delimiter,
-        temporary_file,
-        file_type,
+        file_writer,
+        export_file,
     )
 
+    temporary_file = file_writer.close()
+    part_name = default_storage.save(
+        "{}/{}_{}.{}".format(
+            EXPORT_FILE_PARTS_DIR, export_file.pk, first_pk, file_type
+        ),
+        File(temporary_file),
+    )
+    temporary_file.close()
+    return part_name
+
+
+def delete_export_file_parts(export_file_id: int):
+    """Delete all file parts saved by shards of the export."""
+    try:
+        _, file_names = default_storage.listdir(EXPORT_FILE_PARTS_DIR)
+    except FileNotFoundError:
+        return
+    prefix = "{}_".format(export_file_id)
+    for file_name in file_names:
+        if file_name.startswith(prefix):
+            default_storage.delete("{}/{}".format(EXPORT_FILE_PARTS_DIR, file_name))
+
+
+def merge_export_file_parts(
+    export_file: "ExportFile",
+    part_names: List[str],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ";",
+):
+    """Concatenate file parts exported by shards into the final export file."""
+    file_name = get_filename("product", file_type)
+    _, file_headers, _ = get_export_fields_and_headers_info(export_info)
+
+    file_writer = create_file_with_headers(file_headers, delimiter, file_type)
+    for part_name in part_names:
+        with default_storage.open(part_name, "rb") as part_file:
+            file_writer.append_file(part_file)
+
+    temporary_file = file_writer.close()
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
+    for part_name in part_names:
+        default_storage.delete(part_name)
+
     if export_file.user:
         send_email_with_link_to_download_file(
             export_file, export_file.user.email, "export_products_success"
@@ -99,56 +257,63 @@ def export_products_in_batches(
     export_info: Dict[str, list],
     export_fields: Set[str],
     headers: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    file_writer: FileWriter,
+    export_file: "ExportFile",
 ):
+    """Write products data to the file batch by batch.
+
+    Rows of each batch are passed to the file writer as they are read from
+    the database and the number of processed products is increased in the export
+    file after every batch.
+    """
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
 
     for batch_pks in queryset_in_batches(queryset):
-        product_batch = Product.objects.filter(pk__in=batch_pks).prefetch_related(
-            "attributes",
-            "variants",
-            "collections",
-            "images",
-            "product_type",
-            "category",
-        )
+        product_batch = Product.objects.filter(pk__in=batch_pks)
 
-        export_data = get_products_data(
+        export_data = iter_products_data(
             product_batch, export_fields, attributes, warehouses
         )
 
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
+        append_to_file(export_data, headers, file_writer)
 
+        # shards of the same export run concurrently, so the counter is increased
+        # in the database instead of saving the value from the instance
+        ExportFile.objects.filter(pk=export_file.pk).update(
+            processed_count=F("processed_count") + len(batch_pks),
+            updated_at=timezone.now(),
+        )
+
+
+def start_export_progress(export_file: "ExportFile", total_count: int):
+    export_file.total_count = total_count
+    export_file.processed_count = 0
+    export_file.save(update_fields=["total_count", "processed_count", "updated_at"])
 
-def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
-    table = etl.wrap([file_headers])
 
+def create_file_writer(delimiter: str, file_type: str) -> FileWriter:
     if file_type == FileTypes.CSV:
-        temp_file = NamedTemporaryFile("ab+", suffix=".csv")
-        etl.tocsv(table, temp_file.name, delimiter=delimiter)
-    else:
-        temp_file = NamedTemporaryFile("ab+", suffix=".xlsx")
-        etl.io.xlsx.toxlsx(table, temp_file.name)
+        return CSVFileWriter(delimiter)
+    return XLSXFileWriter()
 
-    return temp_file
+
+def create_file_with_headers(
+    file_headers: List[str], delimiter: str, file_type: str
+) -> FileWriter:
+    file_writer = create_file_writer(delimiter, file_type)
+    file_writer.write_rows([file_headers])
+    return file_writer
 
 
 def append_to_file(
-    export_data: List[Dict[str, Union[str, bool]]],
+    export_data: Iterable[Dict[str, Union[str, bool]]],
     headers: List[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
+    file_writer: FileWriter,
 ):
-    table = etl.fromdicts(export_data, header=headers, missing=" ")
-
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
+    file_writer.write_rows(
+        [data.get(header, " ") for header in headers] for data in export_data
+    )
 
 
 def save_csv_file_in_export_file(
@@ -1,6 +1,8 @@
 import csv
 import gzip
-from typing import Iterable
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from django.conf import settings
 from django.contrib.sites.models import Site
@@ -14,8 +16,19 @@ from ..core.taxes import charge_taxes_on_shipping
 from ..discount import DiscountInfo
 from ..discount.utils import fetch_discounts
 from ..plugins.manager import get_plugins_manager
-from ..product.models import Attribute, AttributeValue, Category, ProductVariant
-from ..warehouse.availability import is_variant_in_stock
+from ..product.models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    Attribute,
+    AttributeValue,
+    Category,
+    ProductVariant,
+)
+from ..warehouse.availability import (
+    get_available_quantities_for_customer,
+    is_variant_in_stock,
+)
+from .models import GoogleFeedItem
 
 CATEGORY_SEPARATOR = " > "
 
@@ -53,6 +66,7 @@ def get_feed_items():
     items = items.prefetch_related(
         "images",
         "product__category",
+        "product__collections",
         "product__images",
         "product__product_type__product_attributes",
         "product__product_type__variant_attributes",
@@ -60,6 +74,33 @@ def get_feed_items():
     return items
 
 
+def get_feed_items_to_fingerprint():
+    """Return variants with the data needed to calculate their fingerprints."""
+    items = ProductVariant.objects.all()
+    items = items.select_related("product__category", "product__product_type")
+    items = items.prefetch_related("images", "product__collections", "product__images")
+    return items
+
+
+def get_feed_items_in_chunks(chunk_size: int) -> Iterator[List[ProductVariant]]:
+    """Yield lists of at most `chunk_size` variants ordered by pk.
+
+    Chunks are selected by a pk range, so prefetches are evaluated only for
+    variants of a single chunk at a time.
+    """
+    last_pk = 0
+    while True:
+        pks = list(
+            ProductVariant.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            break
+        yield list(get_feed_items_to_fingerprint().filter(pk__in=pks).order_by("pk"))
+        last_pk = pks[-1]
+
+
 def item_id(item: ProductVariant):
     return item.sku
 
@@ -90,6 +131,15 @@ def item_condition(item: ProductVariant):
     return "new"
 
 
+def _get_attribute_value_pk(instance, attribute_pk) -> Optional[str]:
+    value_pk = (
+        instance.attributes.filter(assignment__attribute_id=attribute_pk)
+        .values_list("values__pk", flat=True)
+        .first()
+    )
+    return smart_text(value_pk) if value_pk is not None else None
+
+
 def item_brand(item: ProductVariant, attributes_dict, attribute_values_dict):
     """Return an item brand.
 
@@ -102,14 +152,14 @@ def item_brand(item: ProductVariant, attributes_dict, attribute_values_dict):
     publisher_attribute_pk = attributes_dict.get("publisher")
 
     if brand_attribute_pk:
-        brand = item.attributes.get(str(brand_attribute_pk))
+        brand = _get_attribute_value_pk(item, brand_attribute_pk)
         if brand is None:
-            brand = item.product.attributes.get(str(brand_attribute_pk))
+            brand = _get_attribute_value_pk(item.product, brand_attribute_pk)
 
     if brand is None and publisher_attribute_pk is not None:
-        brand = item.attributes.get(str(publisher_attribute_pk))
+        brand = _get_attribute_value_pk(item, publisher_attribute_pk)
         if brand is None:
-            brand = item.product.attributes.get(str(publisher_attribute_pk))
+            brand = _get_attribute_value_pk(item.product, publisher_attribute_pk)
 
     if brand:
         brand_name = attribute_values_dict.get(brand)
@@ -157,6 +207,21 @@ def item_availability(item: ProductVariant):
     return "out of stock"
 
 
+def items_availability(items: Iterable[ProductVariant]) -> Dict[int, str]:
+    """Return availability of many items with a single stock lookup."""
+    items = list(items)
+    country_code = settings.DEFAULT_COUNTRY
+    quantities = get_available_quantities_for_customer(
+        (item.pk, country_code) for item in items if item.track_inventory
+    )
+    return {
+        item.pk: "in stock"
+        if not item.track_inventory or quantities[(item.pk, country_code)] > 0
+        else "out of stock"
+        for item in items
+    }
+
+
 def item_google_product_category(item: ProductVariant, category_paths):
     """Return a canonical product category.
 
@@ -195,6 +260,7 @@ def item_attributes(
     attributes_dict,
     attribute_values_dict,
     is_charge_taxes_on_shipping: bool,
+    availability: Optional[str] = None,
 ):
     product_data = {
         "id": item_id(item),
@@ -203,7 +269,7 @@ def item_attributes(
         "condition": item_condition(item),
         "mpn": item_mpn(item),
         "item_group_id": item_group_id(item),
-        "availability": item_availability(item),
+        "availability": availability or item_availability(item),
         "google_product_category": item_google_product_category(item, category_paths),
     }
 
@@ -228,8 +294,169 @@ def item_attributes(
     return product_data
 
 
-def write_feed(file_obj):
-    """Write feed contents info provided file object."""
+def items_brand_values(
+    items: Iterable[ProductVariant], attributes_dict
+) -> Dict[int, str]:
+    """Return names of brand and publisher values of many items at once.
+
+    Names of the variant's values are followed by names of the product's values.
+    """
+    attribute_pks = [
+        attributes_dict[slug]
+        for slug in ("brand", "publisher")
+        if slug in attributes_dict
+    ]
+    items = list(items)
+    if not attribute_pks:
+        return {item.pk: "" for item in items}
+    variant_values = AssignedVariantAttribute.objects.filter(
+        variant_id__in=[item.pk for item in items],
+        assignment__attribute_id__in=attribute_pks,
+    ).values_list("variant_id", "values__name")
+    product_values = AssignedProductAttribute.objects.filter(
+        product_id__in={item.product_id for item in items},
+        assignment__attribute_id__in=attribute_pks,
+    ).values_list("product_id", "values__name")
+    names_by_variant: Dict[int, List[str]] = defaultdict(list)
+    for variant_id, name in variant_values:
+        names_by_variant[variant_id].append(name or "")
+    names_by_product: Dict[int, List[str]] = defaultdict(list)
+    for product_id, name in product_values:
+        names_by_product[product_id].append(name or "")
+    return {
+        item.pk: "|".join(
+            sorted(names_by_variant[item.pk])
+            + sorted(names_by_product[item.product_id])
+        )
+        for item in items
+    }
+
+
+def item_fingerprint(
+    item: ProductVariant,
+    discounts: Iterable[DiscountInfo],
+    availability: str,
+    feed_fingerprint: str,
+    category_paths,
+    current_site,
+    brand_values: str,
+    tax: Optional[str],
+) -> str:
+    """Return a fingerprint of the data an item's feed row is rendered from.
+
+    The row of an item has to be rendered again only if its fingerprint changes.
+    """
+    product = item.product
+    updated_at = product.updated_at.isoformat() if product.updated_at else ""
+    category_path = (
+        item_google_product_category(item, category_paths) if product.category else ""
+    )
+    fingerprint_data = [
+        feed_fingerprint,
+        item.sku,
+        item.name,
+        item_price(item),
+        item_sale_price(item, discounts),
+        availability,
+        updated_at,
+        category_path,
+        str(product.product_type_id),
+        item_image_link(item, current_site) or "",
+        brand_values,
+        tax or "",
+    ]
+    return hashlib.sha1("\n".join(fingerprint_data).encode("utf-8")).hexdigest()
+
+
+def get_feed_rows(
+    items: List[ProductVariant],
+    categories,
+    category_paths,
+    current_site,
+    discounts: Iterable[DiscountInfo],
+    attributes_dict,
+    attribute_values_dict,
+    is_charge_taxes_on_shipping: bool,
+    rebuild: bool = False,
+) -> Iterator[Dict[str, str]]:
+    """Yield feed rows of the given items in the same order.
+
+    Rows are rendered only for items whose fingerprint differs from the one
+    stored with the previously rendered row, other rows are read from the database.
+    When `rebuild` is set, rows of all the items are rendered.
+    """
+    feed_fingerprint = "{}:{}:{}".format(
+        current_site.domain, is_charge_taxes_on_shipping, settings.DEFAULT_COUNTRY
+    )
+    availability = items_availability(items)
+    brand_values = items_brand_values(items, attributes_dict)
+    taxes: Dict[int, Optional[str]] = {}
+    for item in items:
+        product_type_id = item.product.product_type_id
+        if product_type_id not in taxes:
+            taxes[product_type_id] = item_tax(
+                item, discounts, is_charge_taxes_on_shipping
+            )
+    fingerprints = {
+        item.pk: item_fingerprint(
+            item,
+            discounts,
+            availability[item.pk],
+            feed_fingerprint,
+            category_paths,
+            current_site,
+            brand_values[item.pk],
+            taxes[item.product.product_type_id],
+        )
+        for item in items
+    }
+    feed_items = GoogleFeedItem.objects.in_bulk(list(fingerprints))
+    changed_ids = [
+        pk
+        for pk, fingerprint in fingerprints.items()
+        if rebuild or pk not in feed_items or feed_items[pk].fingerprint != fingerprint
+    ]
+
+    feed_items_to_create = []
+    feed_items_to_update = []
+    for item in get_feed_items().filter(pk__in=changed_ids):
+        data = item_attributes(
+            item,
+            categories,
+            category_paths,
+            current_site,
+            discounts,
+            attributes_dict,
+            attribute_values_dict,
+            is_charge_taxes_on_shipping,
+            availability=availability[item.pk],
+        )
+        feed_item = feed_items.get(item.pk)
+        if feed_item is None:
+            feed_item = GoogleFeedItem(variant_id=item.pk)
+            feed_items_to_create.append(feed_item)
+        else:
+            feed_items_to_update.append(feed_item)
+        feed_item.fingerprint = fingerprints[item.pk]
+        feed_item.data = data
+        feed_items[item.pk] = feed_item
+    GoogleFeedItem.objects.bulk_create(feed_items_to_create)
+    GoogleFeedItem.objects.bulk_update(feed_items_to_update, ["fingerprint", "data"])
+
+    for item in items:
+        yield feed_items[item.pk].data
+
+
+def write_feed(file_obj, rebuild=False, chunk_size: Optional[int] = None) -> int:
+    """Write feed contents info provided file object.
+
+    Items are processed in chunks of `chunk_size` variants, defaulting to
+    the GOOGLE_FEED_CHUNK_SIZE setting. Only rows of items changed since
+    the previous feed are rendered again, unless `rebuild` is set.
+    Returns the number of written rows.
+    """
+    if chunk_size is None:
+        chunk_size = settings.GOOGLE_FEED_CHUNK_SIZE
     is_charge_taxes_on_shipping = charge_taxes_on_shipping()
     writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
     writer.writeheader()
@@ -241,9 +468,10 @@ def write_feed(file_obj):
     }
     category_paths = {}
     current_site = Site.objects.get_current()
-    for item in get_feed_items():
-        item_data = item_attributes(
-            item,
+    rows_count = 0
+    for items in get_feed_items_in_chunks(chunk_size):
+        rows = get_feed_rows(
+            items,
             categories,
             category_paths,
             current_site,
@@ -251,16 +479,21 @@ def write_feed(file_obj):
             attributes_dict,
             attribute_values_dict,
             is_charge_taxes_on_shipping,
+            rebuild=rebuild,
         )
-        writer.writerow(item_data)
+        writer.writerows(rows)
+        rows_count += len(items)
+    return rows_count
 
 
-def update_feed(file_path=FILE_PATH):
+def update_feed(file_path=FILE_PATH, rebuild=False, chunk_size=None) -> int:
     """Save updated feed into path provided as argument.
 
     Default path is defined in module as FILE_PATH.
+    Returns the number of written rows.
     """
     with default_storage.open(file_path, "wb") as output_file:
         output = gzip.open(output_file, "wt")
-        write_feed(output)
+        rows_count = write_feed(output, rebuild=rebuild, chunk_size=chunk_size)
         output.close()
+    return rows_count
@@ -1,3 +1,6 @@
+import resource
+import time
+
 from django.core.management import BaseCommand
 
 from ...google_merchant import update_feed
@@ -6,5 +9,31 @@ from ...google_merchant import update_feed
 class Command(BaseCommand):
     help = "Update Google merchant feed"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Render rows of all the variants, not only the changed ones.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help=(
+                "Number of variants processed at once, "
+                "defaults to the GOOGLE_FEED_CHUNK_SIZE setting."
+            ),
+        )
+
     def handle(self, *args, **options):
-        update_feed()
+        start = time.monotonic()
+        rows_count = update_feed(
+            rebuild=options["rebuild"], chunk_size=options["chunk_size"]
+        )
+        duration = time.monotonic() - start
+        rows_per_second = rows_count / duration if duration else rows_count
+        # ru_maxrss is reported in kilobytes on Linux
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(
+            "Written %d rows in %.2fs (%.1f rows/s), peak memory %.1f MB"
+            % (rows_count, duration, rows_per_second, peak_memory)
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 3.1 on 2026-10-18 04:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("product", "0129_add_product_types_and_attributes_perm"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GoogleFeedItem",
+            fields=[
+                (
+                    "variant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="google_feed_item",
+                        serialize=False,
+                        to="product.productvariant",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=40)),
+                ("data", models.JSONField(blank=True, default=dict)),
+            ],
+        ),
+    ]
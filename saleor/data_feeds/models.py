@@ -0,0 +1,17 @@
+from django.db import models
+from django.db.models import JSONField  # type: ignore
+
+from ..product.models import ProductVariant
+
+
+class GoogleFeedItem(models.Model):
+    """Row of a product variant rendered in the last Google Merchant feed."""
+
+    variant = models.OneToOneField(
+        ProductVariant,
+        primary_key=True,
+        related_name="google_feed_item",
+        on_delete=models.CASCADE,
+    )
+    fingerprint = models.CharField(max_length=40)
+    data = JSONField(blank=True, default=dict)
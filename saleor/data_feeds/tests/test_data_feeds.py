@@ -1,20 +1,25 @@
 import csv
 from io import StringIO
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+import pytest
+from django.core.management import call_command
 from django.utils.encoding import smart_text
 from django_prices_vatlayer.models import VAT
 
 from ...core.taxes import charge_taxes_on_shipping
-from ...product.models import AttributeValue, Category
+from ...product.models import AttributeValue, Category, ProductImage, ProductVariant
+from .. import google_merchant
 from ..google_merchant import (
     get_feed_items,
+    get_feed_items_in_chunks,
     item_attributes,
     item_availability,
     item_google_product_category,
     item_tax,
     write_feed,
 )
+from ..models import GoogleFeedItem
 
 
 def test_saleor_feed_items(product, discount_info, site_settings):
@@ -93,3 +98,117 @@ def test_write_feed(product, monkeypatch):
     ]
     for field in google_required_fields:
         assert field in header
+
+
+def test_write_feed_stores_rendered_rows(product):
+    variant = product.variants.get()
+
+    write_feed(StringIO())
+
+    feed_item = GoogleFeedItem.objects.get()
+    assert feed_item.variant == variant
+    assert feed_item.data["id"] == variant.sku
+    assert len(feed_item.fingerprint) == 40
+
+
+@patch.object(google_merchant, "item_attributes", wraps=google_merchant.item_attributes)
+def test_write_feed_renders_only_changed_items(mocked_item_attributes, product):
+    write_feed(StringIO())
+    assert mocked_item_attributes.call_count == 1
+    mocked_item_attributes.reset_mock()
+
+    buffer = StringIO()
+    write_feed(buffer)
+
+    mocked_item_attributes.assert_not_called()
+    lines = list(csv.reader(StringIO(buffer.getvalue()), dialect=csv.excel_tab))
+    assert len(lines) == 2
+
+    variant = product.variants.get()
+    variant.price_amount += 1
+    variant.save(update_fields=["price_amount"])
+    buffer = StringIO()
+    write_feed(buffer)
+
+    assert mocked_item_attributes.call_count == 1
+    lines = list(csv.DictReader(StringIO(buffer.getvalue()), dialect=csv.excel_tab))
+    assert lines[0]["price"] == GoogleFeedItem.objects.get().data["price"]
+    assert lines[0]["price"].startswith(str(variant.price_amount))
+
+
+def _rename_category(product, image):
+    category = product.category
+    category.name = "Renamed category"
+    category.save(update_fields=["name"])
+
+
+def _add_image(product, image):
+    ProductImage.objects.create(product=product, image=image)
+
+
+def _rename_brand_value(product, image):
+    product.attributes.get().values.update(name="Renamed brand")
+
+
+@pytest.mark.parametrize(
+    "change_product", [_rename_category, _add_image, _rename_brand_value]
+)
+@patch.object(google_merchant, "item_attributes", wraps=google_merchant.item_attributes)
+def test_write_feed_renders_items_with_changed_related_data(
+    mocked_item_attributes, change_product, product, image, media_root
+):
+    brand_attribute = product.attributes.get().attribute
+    brand_attribute.slug = "brand"
+    brand_attribute.save(update_fields=["slug"])
+    write_feed(StringIO())
+    mocked_item_attributes.reset_mock()
+
+    change_product(product, image)
+    write_feed(StringIO())
+
+    assert mocked_item_attributes.call_count == 1
+
+
+@patch.object(google_merchant, "item_attributes", wraps=google_merchant.item_attributes)
+def test_write_feed_rebuild(mocked_item_attributes, product):
+    write_feed(StringIO())
+    mocked_item_attributes.reset_mock()
+
+    write_feed(StringIO(), rebuild=True)
+
+    assert mocked_item_attributes.call_count == 1
+    assert GoogleFeedItem.objects.count() == 1
+
+
+def test_get_feed_items_in_chunks(product_list):
+    variant_pks = sorted(ProductVariant.objects.values_list("pk", flat=True))
+
+    chunks = list(get_feed_items_in_chunks(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert [item.pk for chunk in chunks for item in chunk] == variant_pks
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_write_feed_in_chunks(chunk_size, product_list):
+    buffer = StringIO()
+
+    rows_count = write_feed(buffer, chunk_size=chunk_size)
+
+    assert rows_count == 3
+    lines = list(csv.DictReader(StringIO(buffer.getvalue()), dialect=csv.excel_tab))
+    skus = ProductVariant.objects.order_by("pk").values_list("sku", flat=True)
+    assert [line["id"] for line in lines] == list(skus)
+
+
+@patch("saleor.data_feeds.management.commands.update_feeds.update_feed")
+def test_update_feeds_command_reports_stats(mocked_update_feed):
+    mocked_update_feed.return_value = 10
+    out = StringIO()
+
+    call_command("update_feeds", "--chunk-size", "5", stdout=out)
+
+    mocked_update_feed.assert_called_once_with(rebuild=False, chunk_size=5)
+    assert "Written 10 rows" in out.getvalue()
+    assert "rows/s" in out.getvalue()
+    assert "peak memory" in out.getvalue()
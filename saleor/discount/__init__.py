@@ -1,5 +1,6 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Union
 
 from django.conf import settings
 
@@ -36,3 +37,34 @@ class DiscountInfo:
     product_ids: Union[List[int], Set[int]]
     category_ids: Union[List[int], Set[int]]
     collection_ids: Union[List[int], Set[int]]
+
+
+class DiscountsIndex(list):
+    """List of discounts indexed by the catalogue items they apply to.
+
+    Finding the sales applicable to a product takes a few dictionary lookups
+    instead of checking every discount. The index is built once, so the list
+    should not be modified afterwards.
+    """
+
+    def __init__(self, discounts: Iterable[DiscountInfo] = ()):
+        super().__init__(discounts)
+        self.by_product_id: Dict[int, List[int]] = defaultdict(list)
+        self.by_category_id: Dict[int, List[int]] = defaultdict(list)
+        self.by_collection_id: Dict[int, List[int]] = defaultdict(list)
+        for position, discount in enumerate(self):
+            for product_id in discount.product_ids:
+                self.by_product_id[product_id].append(position)
+            for category_id in discount.category_ids:
+                self.by_category_id[category_id].append(position)
+            for collection_id in discount.collection_ids:
+                self.by_collection_id[collection_id].append(position)
+
+    def get_applicable_discounts(
+        self, product_id: int, category_id: int, collection_ids: Iterable[int]
+    ) -> List[DiscountInfo]:
+        positions = set(self.by_product_id.get(product_id, ()))
+        positions.update(self.by_category_id.get(category_id, ()))
+        for collection_id in collection_ids:
+            positions.update(self.by_collection_id.get(collection_id, ()))
+        return [self[position] for position in sorted(positions)]
@@ -4,12 +4,14 @@ from functools import partial
 from django.conf import settings
 from django.db import models
 from django.db.models import F, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils import timezone
 from django_countries.fields import CountryField
 from django_prices.models import MoneyField
 from django_prices.templatetags.prices import amount
 from prices import Money, fixed_discount, percentage_discount
 
+from ..account.models import M2M_CHANGED_POST_ACTIONS
 from ..core.permissions import DiscountPermissions
 from ..core.utils.translations import TranslationProxy
 from . import DiscountValueType, VoucherType
@@ -253,3 +255,22 @@ class SaleTranslation(models.Model):
     class Meta:
         ordering = ("language_code", "name", "pk")
         unique_together = (("language_code", "sale"),)
+
+
+def invalidate_discounts_cache_of_changed_sales(sender, action=None, **kwargs):
+    """Rebuild cached discounts when a sale or its catalogues were changed."""
+    from .utils import invalidate_discounts_cache
+
+    # saving and deleting sends signals without an action
+    if action is None or action in M2M_CHANGED_POST_ACTIONS:
+        invalidate_discounts_cache()
+
+
+post_save.connect(invalidate_discounts_cache_of_changed_sales, sender=Sale)
+post_delete.connect(invalidate_discounts_cache_of_changed_sales, sender=Sale)
+for through in [
+    Sale.products.through,
+    Sale.categories.through,
+    Sale.collections.through,
+]:
+    m2m_changed.connect(invalidate_discounts_cache_of_changed_sales, sender=through)
@@ -0,0 +1,34 @@
+import random
+import time
+
+from ... import DiscountsIndex
+from ..utils import calculate_prices, generate_discounts, generate_products
+
+PRODUCTS_COUNT = 10000
+SALES_COUNT = 500
+CATEGORIES_COUNT = 200
+COLLECTIONS_COUNT = 100
+
+
+def test_discounts_index_benchmark(record_property):
+    """Report pricing times of 10k products x 500 sales with and without index."""
+    rand = random.Random(0)
+    discounts = generate_discounts(
+        rand, SALES_COUNT, PRODUCTS_COUNT, CATEGORIES_COUNT, COLLECTIONS_COUNT
+    )
+    products = generate_products(
+        rand, PRODUCTS_COUNT, CATEGORIES_COUNT, COLLECTIONS_COUNT
+    )
+    index = DiscountsIndex(discounts)
+    sample = products[:: PRODUCTS_COUNT // 1000]
+
+    start = time.perf_counter()
+    calculate_prices(sample, discounts)
+    linear_time = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    calculate_prices(products, index)
+    indexed_time = (time.perf_counter() - start) / len(products)
+
+    record_property("linear_time_per_product", linear_time)
+    record_property("indexed_time_per_product", indexed_time)
@@ -6,15 +6,18 @@ from django.utils import timezone
 from prices import Money
 
 from ...checkout.utils import get_voucher_discount_for_checkout
-from ...product.models import Product, ProductVariant
+from ...product.models import Category, Product, ProductVariant
 from .. import DiscountInfo, DiscountValueType, VoucherType
 from ..models import NotApplicable, Sale, Voucher, VoucherCustomer
 from ..templatetags.voucher import discount_as_negative
 from ..utils import (
     add_voucher_usage_by_customer,
     decrease_voucher_usage,
+    fetch_cached_discounts,
+    fetch_discounts,
     get_product_discount_on_sale,
     increase_voucher_usage,
+    invalidate_discounts_cache,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -330,6 +333,96 @@ def test_sale_active(current_date, start_date, end_date, is_active):
     assert is_active == sale_is_active
 
 
+def test_fetch_cached_discounts_reuses_snapshot(sale, django_assert_num_queries):
+    now = timezone.now()
+    discounts = fetch_cached_discounts(now)
+    assert [discount.sale for discount in discounts] == [sale]
+
+    with django_assert_num_queries(0):
+        cached_discounts = fetch_cached_discounts(now + timedelta(minutes=1))
+
+    assert cached_discounts == discounts
+
+
+def test_fetch_cached_discounts_after_invalidation(sale):
+    now = timezone.now()
+    assert fetch_cached_discounts(now)
+
+    sale.delete()
+    invalidate_discounts_cache()
+
+    assert fetch_cached_discounts(now) == []
+
+
+def _get_discounts_data(discounts):
+    return [
+        (d.sale.value, d.product_ids, d.category_ids, d.collection_ids)
+        for d in discounts
+    ]
+
+
+def _change_sale_value(sale, **_kwargs):
+    sale.value = 10
+    sale.save(update_fields=["value"])
+
+
+def _delete_sale(sale, **_kwargs):
+    Sale.objects.filter(pk=sale.pk).delete()
+
+
+def _remove_sale_product(sale, product, **_kwargs):
+    product.sale_set.remove(sale)
+
+
+def _clear_sale_collections(sale, **_kwargs):
+    sale.collections.clear()
+
+
+def _add_subcategory(sale, category, **_kwargs):
+    Category.objects.create(name="Subcategory", slug="subcategory", parent=category)
+
+
+@pytest.mark.parametrize(
+    "change_sale",
+    [
+        _change_sale_value,
+        _delete_sale,
+        _remove_sale_product,
+        _clear_sale_collections,
+        _add_subcategory,
+    ],
+)
+def test_fetch_cached_discounts_after_sale_change(change_sale, sale, product, category):
+    now = timezone.now()
+    fetch_cached_discounts(now)
+
+    change_sale(sale, product=product, category=category)
+
+    discounts = fetch_cached_discounts(now)
+    assert _get_discounts_data(discounts) == _get_discounts_data(fetch_discounts(now))
+
+
+def test_fetch_cached_discounts_expires_when_sale_ends(sale):
+    now = timezone.now()
+    sale.end_date = now + timedelta(hours=1)
+    sale.save(update_fields=["end_date"])
+    assert fetch_cached_discounts(now)
+
+    assert fetch_cached_discounts(now + timedelta(hours=2)) == []
+
+
+def test_fetch_cached_discounts_expires_when_sale_starts(sale):
+    now = timezone.now()
+    upcoming_sale = Sale.objects.create(
+        name="Upcoming sale", value=10, start_date=now + timedelta(hours=1)
+    )
+    assert [discount.sale for discount in fetch_cached_discounts(now)] == [sale]
+
+    discounts = fetch_cached_discounts(now + timedelta(hours=2))
+
+    assert {discount.sale for discount in discounts} == {sale, upcoming_sale}
+
+
 def test_discount_as_negative():
     discount = Money(10, "USD")
     result = discount_as_negative(discount)
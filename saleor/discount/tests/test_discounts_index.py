@@ -0,0 +1,63 @@
+import random
+
+from .. import DiscountInfo, DiscountsIndex
+from ..models import Sale
+from .utils import calculate_prices, generate_discounts, generate_products
+
+PRODUCTS_COUNT = 500
+SALES_COUNT = 50
+CATEGORIES_COUNT = 20
+COLLECTIONS_COUNT = 10
+
+
+def test_discounts_index_returns_applicable_discounts(product, category, sale):
+    other_sale = Sale(id=sale.pk + 1, name="Other sale", value=5)
+    discount = DiscountInfo(
+        sale=sale, product_ids={product.pk}, category_ids=set(), collection_ids=set()
+    )
+    category_discount = DiscountInfo(
+        sale=sale, product_ids=set(), category_ids={category.pk}, collection_ids=set()
+    )
+    other_discount = DiscountInfo(
+        sale=other_sale, product_ids=set(), category_ids=set(), collection_ids={-1}
+    )
+
+    index = DiscountsIndex([discount, other_discount, category_discount])
+
+    assert index == [discount, other_discount, category_discount]
+    assert index.get_applicable_discounts(product.pk, category.pk, []) == [
+        discount,
+        category_discount,
+    ]
+    assert index.get_applicable_discounts(product.pk, None, [-1]) == [
+        discount,
+        other_discount,
+    ]
+
+
+def test_discounts_index_prices_match_checking_every_sale():
+    rand = random.Random(0)
+    discounts = generate_discounts(
+        rand, SALES_COUNT, PRODUCTS_COUNT, CATEGORIES_COUNT, COLLECTIONS_COUNT
+    )
+    products = generate_products(
+        rand, PRODUCTS_COUNT, CATEGORIES_COUNT, COLLECTIONS_COUNT
+    )
+    index = DiscountsIndex(discounts)
+
+    assert calculate_prices(products, index) == calculate_prices(products, discounts)
+    for product, collections in products:
+        collection_ids = [collection.id for collection in collections]
+        expected_discounts = [
+            discount
+            for discount in discounts
+            if product.id in discount.product_ids
+            or product.category_id in discount.category_ids
+            or set(collection_ids) & discount.collection_ids
+        ]
+        assert (
+            index.get_applicable_discounts(
+                product.id, product.category_id, collection_ids
+            )
+            == expected_discounts
+        )
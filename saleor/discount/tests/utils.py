@@ -0,0 +1,53 @@
+from prices import Money
+
+from ...product.models import Product
+from .. import DiscountInfo, DiscountValueType
+from ..models import Sale
+from ..utils import calculate_discounted_price
+
+
+def generate_discounts(
+    rand, sales_count, products_count, categories_count, collections_count
+):
+    """Return unsaved sales applied to random products, categories and collections."""
+    discounts = []
+    for pk in range(1, sales_count + 1):
+        sale = Sale(
+            id=pk,
+            name=f"Sale {pk}",
+            type=DiscountValueType.PERCENTAGE,
+            value=rand.randint(1, 50),
+        )
+        discounts.append(
+            DiscountInfo(
+                sale=sale,
+                product_ids=set(rand.sample(range(1, products_count + 1), 20)),
+                category_ids=set(rand.sample(range(1, categories_count + 1), 2)),
+                collection_ids=set(rand.sample(range(1, collections_count + 1), 1)),
+            )
+        )
+    return discounts
+
+
+def generate_products(rand, products_count, categories_count, collections_count):
+    """Return unsaved products paired with stand-ins of their collections."""
+    return [
+        (
+            Product(id=pk, category_id=rand.randint(1, categories_count)),
+            [
+                type("Collection", (), {"id": collection_id})
+                for collection_id in rand.sample(range(1, collections_count + 1), 2)
+            ],
+        )
+        for pk in range(1, products_count + 1)
+    ]
+
+
+def calculate_prices(products, discounts):
+    price = Money("100.00", "USD")
+    return [
+        calculate_discounted_price(
+            product=product, price=price, collections=collections, discounts=discounts
+        )
+        for product, collections in products
+    ]
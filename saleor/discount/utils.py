@@ -1,14 +1,19 @@
 import datetime
+import math
 from collections import defaultdict
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+from uuid import uuid4
 
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Min
 from django.utils import timezone
 from prices import Money
 
 from ..checkout import calculations
 from ..core.taxes import zero_money
-from . import DiscountInfo
+from . import DiscountInfo, DiscountsIndex
 from .models import NotApplicable, Sale, VoucherCustomer
 
 if TYPE_CHECKING:
@@ -18,6 +23,9 @@ if TYPE_CHECKING:
     from ..checkout.models import Checkout, CheckoutLine
     from ..order.models import Order
 
+DISCOUNTS_CACHE_KEY = "active_discounts_{}"
+DISCOUNTS_VERSION_CACHE_KEY = "active_discounts_version"
+
 
 def increase_voucher_usage(voucher: "Voucher") -> None:
     """Increase voucher uses by 1."""
@@ -70,6 +78,13 @@ def get_product_discounts(
 ) -> Money:
     """Return discount values for all discounts applicable to a product."""
     product_collections = set(pc.id for pc in collections)
+    if isinstance(discounts, DiscountsIndex):
+        applicable_discounts = discounts.get_applicable_discounts(
+            product.id, product.category_id, product_collections
+        )
+        for discount in applicable_discounts:
+            yield discount.sale.get_discount()
+        return
     for discount in discounts or []:
         try:
             yield get_product_discount_on_sale(product, product_collections, discount)
@@ -200,14 +215,14 @@ def _fetch_products(sale_pks: Iterable[str]) -> Dict[int, Set[int]]:
     return product_map
 
 
-def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
+def fetch_discounts(date: datetime.date) -> DiscountsIndex:
     sales = list(Sale.objects.active(date))
     pks = {s.pk for s in sales}
     collections = _fetch_collections(pks)
     products = _fetch_products(pks)
     categories = _fetch_categories(pks)
 
-    return [
+    return DiscountsIndex(
         DiscountInfo(
             sale=sale,
             category_ids=categories[sale.pk],
@@ -215,8 +230,64 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
             product_ids=products[sale.pk],
         )
         for sale in sales
-    ]
+    )
 
 
-def fetch_active_discounts() -> List[DiscountInfo]:
+def fetch_active_discounts() -> DiscountsIndex:
     return fetch_discounts(timezone.now())
+
+
+def _get_discounts_version() -> str:
+    version = cache.get(DISCOUNTS_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(DISCOUNTS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+        version = cache.get(DISCOUNTS_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_discounts_cache() -> None:
+    """Make all processes rebuild the cached discounts on the next fetch.
+
+    The version is changed right away and once again after the current
+    transaction is committed, so discounts read before the change was visible
+    to other connections are not reused.
+    """
+
+    def rotate_version():
+        cache.set(DISCOUNTS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    rotate_version()
+    transaction.on_commit(rotate_version)
+
+
+def _get_discounts_valid_until(
+    date: datetime.datetime, discounts: List[DiscountInfo]
+) -> datetime.datetime:
+    """Return the closest moment after which the set of active sales changes."""
+    valid_until = date + datetime.timedelta(seconds=settings.DISCOUNTS_CACHE_TIMEOUT)
+    next_start = Sale.objects.filter(start_date__gt=date).aggregate(
+        start_date=Min("start_date")
+    )["start_date"]
+    boundaries = [next_start] + [discount.sale.end_date for discount in discounts]
+    return min([valid_until] + [boundary for boundary in boundaries if boundary])
+
+
+def fetch_cached_discounts(date: datetime.datetime) -> DiscountsIndex:
+    """Return active discounts from a snapshot shared between processes.
+
+    The snapshot is rebuilt when a sale changes or when a sale starts or ends,
+    whichever comes first.
+    """
+    cache_key = DISCOUNTS_CACHE_KEY.format(_get_discounts_version())
+    snapshot = cache.get(cache_key)
+    if snapshot is not None:
+        valid_from, valid_until, discounts = snapshot
+        if valid_from <= date < valid_until:
+            return discounts
+
+    discounts = fetch_discounts(date)
+    valid_until = _get_discounts_valid_until(date, discounts)
+    timeout = math.ceil((valid_until - date).total_seconds())
+    if timeout > 0:
+        cache.set(cache_key, (date, valid_until, discounts), timeout=timeout)
+    return discounts
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from ...account import models
 from ...account.error_codes import AccountErrorCode
+from ...core.jwt import invalidate_jwt_user_cache
 from ...core.permissions import AccountPermissions
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
 from ..core.types.common import AccountError, StaffError
@@ -21,6 +22,12 @@ class UserBulkDelete(ModelBulkDeleteMutation):
     class Meta:
         abstract = True
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        # deleting a queryset doesn't call `User.delete`
+        invalidate_jwt_user_cache(list(queryset.values_list("email", flat=True)))
+        super().bulk_action(queryset)
+
 
 class CustomerBulkDelete(CustomerDeleteMixin, UserBulkDelete):
     class Meta:
@@ -110,3 +117,5 @@ class UserBulkSetActive(BaseBulkMutation):
     @classmethod
     def bulk_action(cls, queryset, is_active):
         queryset.update(is_active=is_active)
+        # updating a queryset doesn't call `User.save`
+        invalidate_jwt_user_cache(list(queryset.values_list("email", flat=True)))
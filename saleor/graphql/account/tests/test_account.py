@@ -13,13 +13,15 @@ from django.core.files import File
 from django.core.validators import URLValidator
 from django.test import override_settings
 from freezegun import freeze_time
+from jwt import InvalidTokenError
 from prices import Money
 
 from ....account import events as account_events
 from ....account.error_codes import AccountErrorCode
 from ....account.models import Address, User
 from ....checkout import AddressType
-from ....core.jwt import create_token
+from ....core.auth_backend import JSONWebTokenBackend
+from ....core.jwt import create_access_token, create_token
 from ....core.permissions import AccountPermissions, OrderPermissions
 from ....order.models import FulfillmentStatus, Order
 from ....product.tests.utils import create_image
@@ -3908,6 +3910,31 @@ def test_staff_bulk_set_not_active(
     assert not any(user.is_active for user in users)
 
 
+def test_staff_bulk_set_not_active_invalidates_cached_tokens(
+    staff_api_client, user_list, permission_manage_users, rf
+):
+    user = user_list[0]
+    access_token = create_access_token(user)
+    backend = JSONWebTokenBackend()
+    # cache the user used to authenticate the token
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    variables = {
+        "ids": [graphene.Node.to_global_id("User", user.id)],
+        "is_active": False,
+    }
+
+    response = staff_api_client.post_graphql(
+        USER_CHANGE_ACTIVE_STATUS_MUTATION,
+        variables,
+        permissions=[permission_manage_users],
+    )
+
+    content = get_graphql_content(response)
+    assert content["data"]["userBulkSetActive"]["count"] == 1
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
 def test_change_active_status_for_superuser(
     staff_api_client, superuser, permission_manage_users
 ):
@@ -1,10 +1,14 @@
 from unittest.mock import patch
 
 import graphene
+import pytest
 from django.contrib.auth.models import Group
+from jwt import InvalidTokenError
 
 from ....account.error_codes import AccountErrorCode
 from ....account.models import User
+from ....core.auth_backend import JSONWebTokenBackend
+from ....core.jwt import create_access_token
 from ....core.permissions import AccountPermissions, OrderPermissions
 from ...tests.utils import assert_no_permission, get_graphql_content
 
@@ -99,6 +103,26 @@ def test_delete_staff_members(
     assert User.objects.filter(id__in=[user.id for user in users]).count() == len(users)
 
 
+def test_delete_staff_members_invalidates_cached_tokens(
+    staff_api_client, user_list, permission_manage_staff, rf
+):
+    staff_1 = user_list[-1]
+    access_token = create_access_token(staff_1)
+    backend = JSONWebTokenBackend()
+    # cache the user used to authenticate the token
+    backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+    variables = {"ids": [graphene.Node.to_global_id("User", staff_1.id)]}
+
+    response = staff_api_client.post_graphql(
+        STAFF_BULK_DELETE_MUTATION, variables, permissions=[permission_manage_staff]
+    )
+
+    content = get_graphql_content(response)
+    assert content["data"]["staffBulkDelete"]["count"] == 1
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}"))
+
+
 def test_delete_staff_members_app_no_permission(
     app_api_client, user_list, permission_manage_staff, superuser
 ):
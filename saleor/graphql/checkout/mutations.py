@@ -11,7 +11,7 @@ from ...checkout.complete_checkout import complete_checkout
 from ...checkout.error_codes import CheckoutErrorCode
 from ...checkout.utils import (
     add_promo_code_to_checkout,
-    add_variant_to_checkout,
+    add_variants_to_checkout,
     change_billing_address_in_checkout,
     change_shipping_address_in_checkout,
     get_user_checkout,
@@ -26,7 +26,7 @@ from ...core.transactions import transaction_with_commit_on_errors
 from ...order import models as order_models
 from ...payment import models as payment_models
 from ...product import models as product_models
-from ...warehouse.availability import check_stock_quantity, get_available_quantity
+from ...warehouse.availability import check_stock_quantity_bulk, get_available_quantity
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..core.mutations import BaseMutation, ModelMutation
@@ -94,7 +94,7 @@ def update_checkout_shipping_method_if_invalid(
 
 def check_lines_quantity(variants, quantities, country):
     """Check if stock is sufficient for each line in the list of dicts."""
-    for variant, quantity in zip(variants, quantities):
+    for quantity in quantities:
         if quantity < 0:
             raise ValidationError(
                 {
@@ -114,19 +114,16 @@ def check_lines_quantity(variants, quantities, country):
                     )
                 }
             )
-        try:
-            check_stock_quantity(variant, country, quantity)
-        except InsufficientStock as e:
-            available_quantity = get_available_quantity(e.item, country)
-            message = (
-                "Could not add item "
-                + "%(item_name)s. Only %(remaining)d remaining in stock."
-                % {
-                    "remaining": available_quantity,
-                    "item_name": e.item.display_product(),
-                }
-            )
-            raise ValidationError({"quantity": ValidationError(message, code=e.code)})
+    try:
+        check_stock_quantity_bulk(variants, country, quantities)
+    except InsufficientStock as e:
+        available_quantity = get_available_quantity(e.item, country)
+        message = (
+            "Could not add item "
+            + "%(item_name)s. Only %(remaining)d remaining in stock."
+            % {"remaining": available_quantity, "item_name": e.item.display_product()}
+        )
+        raise ValidationError({"quantity": ValidationError(message, code=e.code)})
 
 
 def validate_variants_available_for_purchase(variants):
@@ -298,18 +295,16 @@ class CheckoutCreate(ModelMutation, I18nMixin):
 
         # Create the checkout lines
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                try:
-                    add_variant_to_checkout(instance, variant, quantity)
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        f"Insufficient product stock: {exc.item}", code=exc.code
-                    )
-                except ProductNotPublished as exc:
-                    raise ValidationError(
-                        "Can't create checkout with unpublished product.",
-                        code=exc.code,
-                    )
+            try:
+                add_variants_to_checkout(instance, variants, quantities)
+            except InsufficientStock as exc:
+                raise ValidationError(
+                    f"Insufficient product stock: {exc.item}", code=exc.code
+                )
+            except ProductNotPublished as exc:
+                raise ValidationError(
+                    "Can't create checkout with unpublished product.", code=exc.code,
+                )
             info.context.plugins.checkout_quantity_changed(instance)
         # Save provided addresses and associate them to the checkout
         cls.save_addresses(instance, cleaned_input)
@@ -367,26 +362,37 @@ class CheckoutLinesAdd(BaseMutation):
         )
 
         variant_ids = [line.get("variant_id") for line in lines]
-        variants = cls.get_nodes_or_error(variant_ids, "variant_id", ProductVariant)
+        variants = cls.get_nodes_or_error(
+            variant_ids,
+            "variant_id",
+            ProductVariant,
+            qs=product_models.ProductVariant.objects.prefetch_related(
+                "product__product_type"
+            ),
+        )
         quantities = [line.get("quantity") for line in lines]
 
         check_lines_quantity(variants, quantities, checkout.get_country())
         validate_variants_available_for_purchase(variants)
 
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                try:
-                    add_variant_to_checkout(
-                        checkout, variant, quantity, replace=replace
-                    )
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        f"Insufficient product stock: {exc.item}", code=exc.code
-                    )
-                except ProductNotPublished as exc:
-                    raise ValidationError(
-                        "Can't add unpublished product.", code=exc.code,
-                    )
+            try:
+                # replaced quantities were already checked against the stock
+                add_variants_to_checkout(
+                    checkout,
+                    variants,
+                    quantities,
+                    replace=replace,
+                    check_quantity=not replace,
+                )
+            except InsufficientStock as exc:
+                raise ValidationError(
+                    f"Insufficient product stock: {exc.item}", code=exc.code
+                )
+            except ProductNotPublished as exc:
+                raise ValidationError(
+                    "Can't add unpublished product.", code=exc.code,
+                )
             info.context.plugins.checkout_quantity_changed(checkout)
 
         lines = list(checkout)
@@ -108,9 +108,14 @@ MUTATION_CHECKOUT_CREATE = """
 """
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
 def test_checkout_create_triggers_webhooks(
-    mocked_webhook_trigger, user_api_client, stock, graphql_address_data, settings
+    mocked_webhook_trigger,
+    user_api_client,
+    stock,
+    graphql_address_data,
+    settings,
+    any_webhook,
 ):
     """Create checkout object using GraphQL API."""
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
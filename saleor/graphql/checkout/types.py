@@ -69,9 +69,7 @@ class CheckoutLine(CountableDjangoObjectType):
     @staticmethod
     def resolve_total_price(self, info):
         def calculate_total_price(discounts):
-            return info.context.plugins.calculate_checkout_line_total(
-                checkout_line=self, discounts=discounts
-            )
+            return calculations.checkout_line_total(line=self, discounts=discounts)
 
         return (
             DiscountsByDateTimeLoader(info.context)
@@ -1,8 +1,14 @@
+import hashlib
 import json
 from typing import Any, Dict, Iterable, List, Tuple, Union
 
 import graphene
-from django.db.models import Model as DjangoModel, Q, QuerySet
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Model as DjangoModel, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
 from graphene.relay.connection import Connection
 from graphene_django.types import DjangoObjectType
 from graphql.error import GraphQLError
@@ -13,6 +19,23 @@ from ..core.enums import OrderDirection
 
 ConnectionArguments = Dict[str, Any]
 
+TOTAL_COUNT_CACHE_KEY = "connection_total_count_{}"
+
+
+class TotalCountMode:
+    """Strategies of resolving `totalCount` of countable connections.
+
+    EXACT - count the matching records on every request.
+    CACHED - count the matching records and cache the result for a short time.
+    ESTIMATED - use the row estimate of the Postgres query planner; the records
+        are counted exactly when the estimate is below
+        `GRAPHQL_ESTIMATED_COUNT_THRESHOLD`.
+    """
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
 
 def to_global_cursor(values):
     if not isinstance(values, Iterable):
@@ -38,6 +61,37 @@ def get_field_value(instance: DjangoModel, field_name: str):
     return attr
 
 
+def _annotate_cursor_values(
+    qs: QuerySet, sorting_fields: List[str]
+) -> Tuple[QuerySet, List[str]]:
+    """Fetch values used to build cursors in the same query as the records.
+
+    Sorting fields that span relations are annotated on the queryset and foreign
+    keys are read from their id columns, so building cursors never triggers
+    additional queries. Returns the queryset and the attribute names that hold
+    the cursor values.
+    """
+    annotations = {}
+    cursor_fields = []
+    for index, field_name in enumerate(sorting_fields):
+        if LOOKUP_SEP in field_name:
+            alias = f"cursor_value_{index}"
+            annotations[alias] = F(field_name)
+            field_name = alias
+        else:
+            try:
+                field = qs.model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                pass
+            else:
+                if field.is_relation and field.concrete:
+                    field_name = field.attname
+        cursor_fields.append(field_name)
+    if annotations:
+        qs = qs.annotate(**annotations)
+    return qs, cursor_fields
+
+
 def _prepare_filter_expression(
     field_name: str,
     index: int,
@@ -150,7 +204,7 @@ def _get_page_info(matching_records, cursor, first, last):
     return page_info
 
 
-def _get_edges_for_connection(edge_type, qs, args, sorting_fields):
+def _get_edges_for_connection(edge_type, qs, args, cursor_fields):
     before = args.get("before")
     after = args.get("after")
     first = args.get("first")
@@ -158,24 +212,20 @@ def _get_edges_for_connection(edge_type, qs, args, sorting_fields):
     cursor = after or before
     requested_count = first or last
 
-    if last:
-        start_slice, end_slice = 1, None
-    else:
-        start_slice, end_slice = 0, requested_count
-
+    # The queryset is already limited to `requested_count + 1` records, ordered
+    # in reverse when paginating backwards.
     matching_records = list(qs)
-    if last:
-        matching_records = list(reversed(matching_records))
-        if len(matching_records) <= requested_count:
-            start_slice = 0
     page_info = _get_page_info(matching_records, cursor, first, last)
-    matching_records = matching_records[start_slice:end_slice]
+    if requested_count:
+        matching_records = matching_records[:requested_count]
+    if last:
+        matching_records.reverse()
 
     edges = [
         edge_type(
             node=record,
             cursor=to_global_cursor(
-                [get_field_value(record, field) for field in sorting_fields]
+                [get_field_value(record, field) for field in cursor_fields]
             ),
         )
         for record in matching_records
@@ -215,8 +265,9 @@ def connection_from_queryset_slice(
         _prepare_filter(cursor, sorting_fields, sorting_direction) if cursor else Q()
     )
     qs = qs.filter(filter_kwargs)
+    qs, cursor_fields = _annotate_cursor_values(qs, sorting_fields)
     qs = qs[:end_margin]
-    edges, page_info = _get_edges_for_connection(edge_type, qs, args, sorting_fields)
+    edges, page_info = _get_edges_for_connection(edge_type, qs, args, cursor_fields)
 
     return connection_type(edges=edges, page_info=pageinfo_type(**page_info),)
 
@@ -253,16 +304,76 @@ class NonNullConnection(Connection):
         )
 
 
+def _get_count_query(qs: QuerySet) -> Tuple[str, tuple]:
+    # Ordering does not affect the number of rows and would only cost time
+    return qs.order_by().query.sql_with_params()
+
+
+def get_cached_count(qs: QuerySet) -> int:
+    """Return the number of records matching the queryset, cached for a while.
+
+    The cache key is built from the SQL of the unordered queryset, so requests
+    using the same filters share the cached value.
+    """
+    sql, params = _get_count_query(qs)
+    query_hash = hashlib.sha256(f"{qs.db}:{sql}:{params!r}".encode("utf-8"))
+    cache_key = TOTAL_COUNT_CACHE_KEY.format(query_hash.hexdigest())
+    count = cache.get(cache_key)
+    if count is None:
+        count = qs.count()
+        cache.set(cache_key, count, settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def get_estimated_count(qs: QuerySet) -> int:
+    """Return the number of rows the Postgres query planner expects for a queryset.
+
+    Small results are counted exactly as the planner estimates are least
+    reliable for them and counting them is cheap.
+    """
+    sql, params = _get_count_query(qs)
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimated_count = int(plan[0]["Plan"]["Plan Rows"])
+    if estimated_count < settings.GRAPHQL_ESTIMATED_COUNT_THRESHOLD:
+        return qs.count()
+    return estimated_count
+
+
 class CountableConnection(NonNullConnection):
     class Meta:
         abstract = True
 
-    total_count = graphene.Int(description="A total count of items in the collection.")
+    total_count = graphene.Int(
+        description=(
+            "A total count of items in the collection. Depending on the server "
+            "configuration, it may be an approximate count for large collections."
+        )
+    )
+
+    @classmethod
+    def __init_subclass_with_meta__(
+        cls, total_count_mode=TotalCountMode.EXACT, **options
+    ):
+        super().__init_subclass_with_meta__(**options)
+        cls.total_count_mode = total_count_mode
 
     @staticmethod
     def resolve_total_count(root, *_args, **_kwargs):
         if isinstance(root.iterable, list):
             return len(root.iterable)
+        total_count_mode = getattr(root, "total_count_mode", TotalCountMode.EXACT)
+        try:
+            if total_count_mode == TotalCountMode.CACHED:
+                return get_cached_count(root.iterable)
+            if total_count_mode == TotalCountMode.ESTIMATED:
+                return get_estimated_count(root.iterable)
+        except EmptyResultSet:
+            # The filters can never match any record, e.g. `pk__in=[]`
+            return 0
         return root.iterable.count()
 
 
@@ -271,9 +382,13 @@ class CountableDjangoObjectType(DjangoObjectType):
         abstract = True
 
     @classmethod
-    def __init_subclass_with_meta__(cls, *args, **kwargs):
+    def __init_subclass_with_meta__(
+        cls, *args, total_count_mode=TotalCountMode.EXACT, **kwargs
+    ):
         # Force it to use the countable connection
         countable_conn = CountableConnection.create_type(
-            "{}CountableConnection".format(cls.__name__), node=cls
+            "{}CountableConnection".format(cls.__name__),
+            node=cls,
+            total_count_mode=total_count_mode,
         )
         super().__init_subclass_with_meta__(*args, connection=countable_conn, **kwargs)
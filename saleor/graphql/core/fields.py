@@ -67,9 +67,28 @@ class BaseDjangoConnectionField(DjangoConnectionField):
         return connection
 
     def __init__(self, *args, **kwargs):
+        # Overrides the `total_count_mode` of the node type for this field only
+        self.total_count_mode = kwargs.pop("total_count_mode", None)
         super().__init__(*args, **kwargs)
         patch_pagination_args(self)
 
+    def get_resolver(self, parent_resolver):
+        resolver = super().get_resolver(parent_resolver)
+        if self.total_count_mode is None:
+            return resolver
+        return partial(resolve_with_total_count_mode, resolver, self.total_count_mode)
+
+
+def resolve_with_total_count_mode(resolver, total_count_mode, *args, **kwargs):
+    def set_total_count_mode(connection):
+        connection.total_count_mode = total_count_mode
+        return connection
+
+    connection = resolver(*args, **kwargs)
+    if Promise.is_thenable(connection):
+        return Promise.resolve(connection).then(set_total_count_mode)
+    return set_total_count_mode(connection)
+
 
 class PrefetchingConnectionField(BaseDjangoConnectionField):
     @classmethod
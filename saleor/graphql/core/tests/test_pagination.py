@@ -2,9 +2,17 @@ import math
 
 import graphene
 import pytest
+from graphene.relay import PageInfo
 
+from ....product.models import Product
 from ....tests.models import Book
-from ..connection import CountableDjangoObjectType
+from ...product.types import Product as ProductType
+from ..connection import (
+    CountableDjangoObjectType,
+    TotalCountMode,
+    connection_from_queryset_slice,
+    from_global_cursor,
+)
 from ..fields import FilterInputConnectionField
 
 
@@ -218,3 +226,140 @@ def test_pagination_backward_last_page_info(books):
     page_info = content["books"]["pageInfo"]
     assert page_info["hasNextPage"]
     assert page_info["hasPreviousPage"] is False
+
+
+def test_pagination_cursor_values_fetched_with_records(
+    product_list, django_assert_num_queries
+):
+    qs = Product.objects.order_by("product_type__name", "name", "slug")
+    args = {
+        "first": 2,
+        "sort_by": {"field": ["product_type__name", "name", "slug"], "direction": ""},
+    }
+
+    connection_type = ProductType._meta.connection
+
+    with django_assert_num_queries(1):
+        connection = connection_from_queryset_slice(
+            qs, args, connection_type, connection_type.Edge, PageInfo
+        )
+
+    first_product = connection.edges[0].node
+    assert from_global_cursor(connection.edges[0].cursor) == [
+        first_product.product_type.name,
+        first_product.name,
+        first_product.slug,
+    ]
+    assert connection.page_info.has_next_page
+
+
+def test_pagination_without_total_count_does_not_count_records(
+    books, django_assert_num_queries
+):
+    query = """
+        query BooksPaginationTest($first: Int){
+            books(first: $first) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+
+    with django_assert_num_queries(1):
+        result = schema.execute(query, variables={"first": 5})
+
+    assert not result.errors
+    assert len(result.data["books"]["edges"]) == 5
+
+
+class CachedCountBookType(CountableDjangoObjectType):
+    class Meta:
+        model = Book
+        total_count_mode = TotalCountMode.CACHED
+
+
+class EstimatedCountBookType(CountableDjangoObjectType):
+    class Meta:
+        model = Book
+        total_count_mode = TotalCountMode.ESTIMATED
+
+
+class CountModesQuery(graphene.ObjectType):
+    cached_count_books = FilterInputConnectionField(CachedCountBookType)
+    estimated_count_books = FilterInputConnectionField(EstimatedCountBookType)
+    field_estimated_count_books = FilterInputConnectionField(
+        BookType, total_count_mode=TotalCountMode.ESTIMATED
+    )
+
+
+count_modes_schema = graphene.Schema(query=CountModesQuery)
+
+QUERY_BOOKS_TOTAL_COUNT = """
+    query BooksTotalCount {
+        cachedCountBooks {
+            totalCount
+        }
+        estimatedCountBooks {
+            totalCount
+        }
+    }
+"""
+
+
+def test_total_count_cached(books, django_assert_num_queries):
+    query = "{ cachedCountBooks(first: 1) { totalCount edges { node { name } } } }"
+    result = count_modes_schema.execute(query)
+    assert result.data["cachedCountBooks"]["totalCount"] == len(books)
+
+    Book.objects.create(name="New book")
+    # Only the page of records is fetched
+    with django_assert_num_queries(1):
+        result = count_modes_schema.execute(query)
+
+    assert result.data["cachedCountBooks"]["totalCount"] == len(books)
+
+
+def test_total_count_estimated_counts_small_results_exactly(books, settings):
+    settings.GRAPHQL_ESTIMATED_COUNT_THRESHOLD = 1000
+    result = count_modes_schema.execute(QUERY_BOOKS_TOTAL_COUNT)
+    assert not result.errors
+    assert result.data["estimatedCountBooks"]["totalCount"] == len(books)
+
+
+def test_total_count_estimated(books, settings, django_assert_num_queries):
+    settings.GRAPHQL_ESTIMATED_COUNT_THRESHOLD = 0
+    query = "{ estimatedCountBooks(first: 1) { totalCount edges { node { name } } } }"
+
+    # The planner is asked for the number of rows instead of counting them
+    with django_assert_num_queries(2) as captured:
+        result = count_modes_schema.execute(query)
+
+    assert not result.errors
+    assert captured.captured_queries[1]["sql"].startswith("EXPLAIN")
+    assert isinstance(result.data["estimatedCountBooks"]["totalCount"], int)
+
+
+def test_total_count_modes_of_connection_types():
+    assert BookType._meta.connection.total_count_mode == TotalCountMode.EXACT
+    assert (
+        CachedCountBookType._meta.connection.total_count_mode == TotalCountMode.CACHED
+    )
+
+
+def test_total_count_mode_of_connection_field(
+    books, settings, django_assert_num_queries
+):
+    settings.GRAPHQL_ESTIMATED_COUNT_THRESHOLD = 0
+    query = (
+        "{ fieldEstimatedCountBooks(first: 1) { totalCount edges { node { name } } } }"
+    )
+
+    with django_assert_num_queries(2) as captured:
+        result = count_modes_schema.execute(query)
+
+    assert not result.errors
+    assert captured.captured_queries[1]["sql"].startswith("EXPLAIN")
+    assert BookType._meta.connection.total_count_mode == TotalCountMode.EXACT
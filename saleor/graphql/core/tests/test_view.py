@@ -6,6 +6,7 @@ from django.test import override_settings
 
 from ....demo.views import EXAMPLE_QUERY
 from ...product.types import Product
+from ...query_cache import QueryDocumentCache, get_query_hash, query_cache
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -16,7 +17,9 @@ from ...tests.fixtures import (
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
 
 
-def test_batch_queries(category, product, api_client):
+@pytest.mark.parametrize("concurrent_execution", [False, True])
+def test_batch_queries(category, product, api_client, settings, concurrent_execution):
+    settings.GRAPHQL_CONCURRENT_BATCH_EXECUTION = concurrent_execution
     query_product = """
         query GetProduct($id: ID!) {
             product(id: $id) {
@@ -56,6 +59,52 @@ def test_batch_queries(category, product, api_client):
     assert data["category"]["name"] == category.name
 
 
+def test_batch_queries_concurrent_execution_keeps_mutation_order(
+    staff_api_client, settings, site_settings, permission_manage_settings
+):
+    settings.GRAPHQL_CONCURRENT_BATCH_EXECUTION = True
+    staff_api_client.user.user_permissions.add(permission_manage_settings)
+    query_shop = "{ shop { name } }"
+    mutation_shop_update = """
+        mutation {
+            shopDomainUpdate(input: {name: "New name"}) {
+                shop {
+                    name
+                }
+            }
+        }
+    """
+    old_name = site_settings.site.name
+    data = [
+        {"query": query_shop},
+        {"query": mutation_shop_update},
+        {"query": query_shop},
+        {"query": "{ shop }"},
+    ]
+
+    response = staff_api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content[0]["data"]["shop"]["name"] == old_name
+    assert content[1]["data"]["shopDomainUpdate"]["shop"]["name"] == "New name"
+    assert content[2]["data"]["shop"]["name"] == "New name"
+    assert "errors" in content[3]
+
+
+def test_batch_queries_max_batch_size(api_client, settings):
+    settings.GRAPHQL_MAX_BATCH_SIZE = 2
+    data = [{"query": "{ shop { name } }"}] * 3
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Batch cannot contain more than 2 operations."
+    )
+
+
 @pytest.mark.parametrize("playground_on, status", [(True, 200), (False, 405)])
 def test_graphql_view_get_enabled_or_disabled(client, settings, playground_on, status):
     settings.PLAYGROUND_ENABLED = playground_on
@@ -199,7 +248,7 @@ def test_graphql_execution_exception(monkeypatch, api_client):
     def mocked_execute(*args, **kwargs):
         raise IOError("Spanish inquisition")
 
-    monkeypatch.setattr("graphql.backend.core.execute_and_validate", mocked_execute)
+    monkeypatch.setattr("saleor.graphql.query_cache.execute", mocked_execute)
     response = api_client.post_graphql("{ shop { name }}")
     assert response.status_code == 400
     content = get_graphql_content_from_response(response)
@@ -289,3 +338,90 @@ def test_example_query(api_client, product):
     response = api_client.post_graphql(EXAMPLE_QUERY)
     content = get_graphql_content(response)
     assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+QUERY_SHOP_NAME = "{ shop { name } }"
+
+
+def test_query_cache_reuses_parsed_document(api_client):
+    query_cache.clear()
+
+    for _ in range(3):
+        response = api_client.post_graphql(QUERY_SHOP_NAME)
+        get_graphql_content(response)
+
+    stats = query_cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+
+
+def test_query_cache_does_not_store_invalid_queries(api_client):
+    query_cache.clear()
+
+    response = api_client.post_graphql("{ shop }")
+
+    assert response.status_code == 400
+    assert query_cache.get_stats()["size"] == 0
+
+
+def test_query_cache_evicts_least_recently_used_documents():
+    cache = QueryDocumentCache(max_size=2)
+    cache.set("a", mock.sentinel.a)
+    cache.set("b", mock.sentinel.b)
+    assert cache.get("a") is mock.sentinel.a
+
+    cache.set("c", mock.sentinel.c)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is mock.sentinel.a
+    assert cache.get("c") is mock.sentinel.c
+    assert cache.get_stats() == {"hits": 3, "misses": 1, "size": 2, "max_size": 2}
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_persisted_query_not_found(api_client):
+    data = {"extensions": _persisted_query_extensions("not-registered-hash")}
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+@pytest.mark.parametrize("persisted_query", ["x", ["x"], 1])
+def test_persisted_query_malformed(api_client, persisted_query):
+    data = {"extensions": {"persistedQuery": persisted_query}}
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_reused(api_client, site_settings):
+    extensions = _persisted_query_extensions(get_query_hash(QUERY_SHOP_NAME))
+
+    response = api_client.post({"query": QUERY_SHOP_NAME, "extensions": extensions})
+    get_graphql_content(response)
+
+    response = api_client.post({"extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    extensions = _persisted_query_extensions(get_query_hash("{ shop { domain } }"))
+
+    response = api_client.post({"query": QUERY_SHOP_NAME, "extensions": extensions})
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256 hash does not match query string."
+    )
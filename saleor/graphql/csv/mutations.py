@@ -1,12 +1,13 @@
 from typing import Dict, List, Mapping, Union
 
 import graphene
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from ...core.permissions import ProductPermissions
 from ...csv import models as csv_models
 from ...csv.events import export_started_event
-from ...csv.tasks import export_products_task
+from ...csv.tasks import export_products_in_shards_task, export_products_task
 from ..core.enums import ExportErrorCode
 from ..core.mutations import BaseMutation
 from ..core.types.common import ExportError
@@ -83,7 +84,12 @@ class ExportProducts(BaseMutation):
 
         export_file = csv_models.ExportFile.objects.create(**kwargs)
         export_started_event(export_file=export_file, **kwargs)
-        export_products_task.delay(export_file.pk, scope, export_info, file_type)
+        if settings.EXPORT_PRODUCTS_SHARDS > 1:
+            export_products_in_shards_task.delay(
+                export_file.pk, scope, export_info, file_type
+            )
+        else:
+            export_products_task.delay(export_file.pk, scope, export_info, file_type)
 
         export_file.refresh_from_db()
         return cls(export_file=export_file)
@@ -95,6 +95,40 @@ def test_export_products_mutation(
     ).exists()
 
 
+@patch("saleor.graphql.csv.mutations.export_products_in_shards_task.delay")
+@patch("saleor.graphql.csv.mutations.export_products_task.delay")
+def test_export_products_mutation_in_shards(
+    export_products_mock,
+    export_products_in_shards_mock,
+    staff_api_client,
+    product_list,
+    permission_manage_products,
+    settings,
+):
+    settings.EXPORT_PRODUCTS_SHARDS = 4
+    variables = {
+        "input": {
+            "scope": ExportScope.ALL.name,
+            "exportInfo": {},
+            "fileType": FileTypeEnum.XLSX.name,
+        }
+    }
+
+    response = staff_api_client.post_graphql(
+        EXPORT_PRODUCTS_MUTATION,
+        variables=variables,
+        permissions=[permission_manage_products],
+    )
+    content = get_graphql_content(response)
+    data = content["data"]["exportProducts"]
+
+    assert not data["exportErrors"]
+    export_products_mock.assert_not_called()
+    export_products_in_shards_mock.assert_called_once_with(
+        ANY, {"all": ""}, {}, FileTypeEnum.XLSX.value
+    )
+
+
 @patch("saleor.graphql.csv.mutations.export_products_task.delay")
 def test_export_products_mutation_by_app(
     export_products_mock,
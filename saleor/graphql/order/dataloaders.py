@@ -0,0 +1,62 @@
+from collections import defaultdict
+
+from ...order.models import Fulfillment, FulfillmentLine, OrderEvent, OrderLine
+from ..core.dataloaders import DataLoader
+
+
+class OrderLineByIdLoader(DataLoader):
+    context_key = "orderline_by_id"
+
+    def batch_load(self, keys):
+        order_lines = OrderLine.objects.in_bulk(keys)
+        return [order_lines.get(line_id) for line_id in keys]
+
+
+class OrderLinesByOrderIdLoader(DataLoader):
+    context_key = "orderlines_by_order"
+
+    def batch_load(self, keys):
+        lines = OrderLine.objects.filter(order_id__in=keys).order_by("pk")
+        line_map = defaultdict(list)
+        line_loader = OrderLineByIdLoader(self.context)
+        for line in lines.iterator():
+            line_map[line.order_id].append(line)
+            line_loader.prime(line.id, line)
+        return [line_map.get(order_id, []) for order_id in keys]
+
+
+class FulfillmentsByOrderIdLoader(DataLoader):
+    context_key = "fulfillments_by_order"
+
+    def batch_load(self, keys):
+        fulfillments = Fulfillment.objects.filter(order_id__in=keys).order_by("pk")
+        fulfillment_map = defaultdict(list)
+        for fulfillment in fulfillments.iterator():
+            fulfillment_map[fulfillment.order_id].append(fulfillment)
+        return [fulfillment_map.get(order_id, []) for order_id in keys]
+
+
+class FulfillmentLinesByFulfillmentIdLoader(DataLoader):
+    context_key = "fulfillmentlines_by_fulfillment"
+
+    def batch_load(self, keys):
+        lines = (
+            FulfillmentLine.objects.filter(fulfillment_id__in=keys)
+            .select_related("stock__warehouse")
+            .order_by("pk")
+        )
+        line_map = defaultdict(list)
+        for line in lines.iterator():
+            line_map[line.fulfillment_id].append(line)
+        return [line_map.get(fulfillment_id, []) for fulfillment_id in keys]
+
+
+class OrderEventsByOrderIdLoader(DataLoader):
+    context_key = "orderevents_by_order"
+
+    def batch_load(self, keys):
+        events = OrderEvent.objects.filter(order_id__in=keys).order_by("pk")
+        event_map = defaultdict(list)
+        for event in events.iterator():
+            event_map[event.order_id].append(event)
+        return [event_map.get(order_id, []) for order_id in keys]
@@ -15,10 +15,11 @@ from ....order.utils import (
     change_order_line_quantity,
     delete_order_line,
     get_order_country,
+    invalidate_daily_order_totals,
     recalculate_order,
     update_order_prices,
 )
-from ....warehouse.management import allocate_stock
+from ....warehouse.management import allocate_stocks
 from ...account.i18n import I18nMixin
 from ...account.types import AddressInput
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
@@ -272,19 +273,23 @@ class DraftOrderComplete(BaseMutation):
 
         order.save()
 
-        for line in order:
-            if line.variant.track_inventory:
-                try:
-                    allocate_stock(line, country, line.quantity)
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        {
-                            "lines": ValidationError(
-                                f"Insufficient product stock: {exc.item}",
-                                code=OrderErrorCode.INSUFFICIENT_STOCK,
-                            )
-                        }
+        lines_to_allocate = [
+            line
+            for line in order.lines.select_related("variant")
+            if line.variant.track_inventory
+        ]
+        try:
+            allocate_stocks(lines_to_allocate, country)
+        except InsufficientStock as exc:
+            raise ValidationError(
+                {
+                    "lines": ValidationError(
+                        f"Insufficient product stock: {exc.item}",
+                        code=OrderErrorCode.INSUFFICIENT_STOCK,
                     )
+                }
+            )
+        invalidate_daily_order_totals(order)
         order_created(order, user=info.context.user, from_draft=True)
 
         return DraftOrderComplete(order=order)
@@ -3,8 +3,8 @@ import graphene
 from ...order import OrderStatus, models
 from ...order.events import OrderEvents
 from ...order.models import OrderEvent
-from ...order.utils import sum_order_totals
-from ..utils.filters import filter_by_period
+from ...order.utils import sum_order_totals_since
+from ..utils.filters import filter_by_period, reporting_period_to_date
 from .enums import OrderStatusFilter
 from .types import Order
 
@@ -39,9 +39,7 @@ def resolve_draft_orders(info, created, **_kwargs):
 
 
 def resolve_orders_total(_info, period):
-    qs = models.Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
-    qs = filter_by_period(qs, period, "created")
-    return sum_order_totals(qs)
+    return sum_order_totals_since(reporting_period_to_date(period))
 
 
 def resolve_order(info, order_id):
@@ -1,4 +1,5 @@
 import graphene
+from django.conf import settings
 
 from ...core.permissions import OrderPermissions
 from ..core.enums import ReportingPeriod
@@ -79,6 +80,7 @@ class OrderQueries(graphene.ObjectType):
     )
     orders = FilterInputConnectionField(
         Order,
+        total_count_mode=settings.GRAPHQL_ORDERS_TOTAL_COUNT_MODE,
         sort_by=OrderSortingInput(description="Sort orders."),
         filter=OrderFilterInput(description="Filtering options for orders."),
         created=graphene.Argument(
@@ -63,3 +63,40 @@ def test_user_order_details(user_api_client, order_with_lines, count_queries):
         "token": order_with_lines.token,
     }
     get_graphql_content(user_api_client.post_graphql(query, variables))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_staff_order_list(
+    staff_api_client, permission_manage_orders, fulfilled_order, count_queries
+):
+    query = (
+        FRAGMENT_ORDER_DETAILS
+        + """
+            query OrderList {
+              orders(first: 100) {
+                edges {
+                  node {
+                    ...OrderDetail
+                    billingAddress {
+                      ...Address
+                    }
+                    fulfillments {
+                      lines {
+                        quantity
+                        orderLine {
+                          id
+                        }
+                      }
+                    }
+                    events {
+                      type
+                    }
+                  }
+                }
+              }
+            }
+        """
+    )
+    staff_api_client.user.user_permissions.add(permission_manage_orders)
+    get_graphql_content(staff_api_client.post_graphql(query))
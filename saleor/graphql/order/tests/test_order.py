@@ -6,6 +6,8 @@ import graphene
 import pytest
 from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 from prices import Money, TaxedMoney
 
@@ -14,7 +16,7 @@ from ....core.permissions import OrderPermissions
 from ....core.taxes import TaxError, zero_taxed_money
 from ....order import OrderStatus, events as order_events
 from ....order.error_codes import OrderErrorCode
-from ....order.models import Order, OrderEvent
+from ....order.models import Order, OrderEvent, OrderLine
 from ....payment import ChargeStatus, CustomPaymentChoices, PaymentError
 from ....payment.models import Payment
 from ....plugins.manager import PluginsManager
@@ -2448,6 +2450,163 @@ def test_draft_order_clear_shipping_method(
     assert draft_order.shipping_method_name is None
 
 
+ORDERS_PAGE_QUERY = """
+query OrdersQuery {
+    orders(first: 100) {
+        edges {
+            node {
+                number
+                userEmail
+                user {
+                    email
+                }
+                billingAddress {
+                    city
+                }
+                shippingAddress {
+                    city
+                }
+                lines {
+                    productName
+                    thumbnail {
+                        url
+                    }
+                    variant {
+                        id
+                    }
+                }
+                fulfillments {
+                    warehouse {
+                        name
+                    }
+                    lines {
+                        quantity
+                        orderLine {
+                            id
+                        }
+                    }
+                }
+                events {
+                    type
+                    user {
+                        email
+                    }
+                    lines {
+                        orderLine {
+                            id
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def _copy_orders(order, count):
+    lines = list(order.lines.all())
+    fulfillments = [
+        (fulfillment, list(fulfillment.lines.all()))
+        for fulfillment in order.fulfillments.all()
+    ]
+    events = list(order.events.all())
+    for _ in range(count):
+        new_order = Order.objects.get(pk=order.pk)
+        new_order.pk = None
+        new_order.token = ""
+        new_order.billing_address = order.billing_address.get_copy()
+        new_order.shipping_address = order.shipping_address.get_copy()
+        new_order.save()
+        new_lines = {}
+        for line in lines:
+            new_lines[line.pk] = OrderLine.objects.get(pk=line.pk)
+            new_lines[line.pk].pk = None
+            new_lines[line.pk].order = new_order
+        OrderLine.objects.bulk_create(new_lines.values())
+        for fulfillment, fulfillment_lines in fulfillments:
+            new_fulfillment = new_order.fulfillments.create(
+                tracking_number=fulfillment.tracking_number
+            )
+            for fulfillment_line in fulfillment_lines:
+                new_fulfillment.lines.create(
+                    order_line=new_lines[fulfillment_line.order_line_id],
+                    quantity=fulfillment_line.quantity,
+                    stock=fulfillment_line.stock,
+                )
+        OrderEvent.objects.bulk_create(
+            OrderEvent(
+                order=new_order,
+                type=event.type,
+                user=event.user,
+                parameters={
+                    "lines": [
+                        {
+                            "line_pk": new_lines[line.pk].pk,
+                            "quantity": line.quantity,
+                            "item": str(line),
+                        }
+                        for line in lines
+                    ]
+                },
+            )
+            for event in events
+        )
+
+
+def _set_line_variants_with_images(image):
+    """Give every order line its own variant with an image."""
+    variant_ids = set()
+    for line in OrderLine.objects.select_related("variant").order_by("pk"):
+        variant = line.variant
+        if variant.pk in variant_ids:
+            variant.pk = None
+            variant.sku = f"{variant.sku}-{line.pk}"
+            variant.save()
+            line.variant = variant
+            line.save(update_fields=["variant"])
+        variant_ids.add(variant.pk)
+        if not variant.variant_images.exists():
+            product_image = variant.product.images.create(image=image)
+            variant.variant_images.create(image=product_image)
+
+
+def test_orders_page_query_count_does_not_depend_on_number_of_orders(
+    staff_api_client,
+    permission_manage_orders,
+    permission_manage_users,
+    fulfilled_order,
+    customer_user,
+    staff_user,
+    image,
+    media_root,
+):
+    fulfilled_order.user = customer_user
+    fulfilled_order.save(update_fields=["user"])
+    order_events.fulfillment_fulfilled_items_event(
+        order=fulfilled_order, user=staff_user, fulfillment_lines=[]
+    )
+    staff_api_client.user.user_permissions.add(
+        permission_manage_orders, permission_manage_users
+    )
+
+    _copy_orders(fulfilled_order, 1)
+    _set_line_variants_with_images(image)
+    with CaptureQueriesContext(connection) as two_orders_queries:
+        content = get_graphql_content(staff_api_client.post_graphql(ORDERS_PAGE_QUERY))
+    assert len(content["data"]["orders"]["edges"]) == 2
+
+    _copy_orders(fulfilled_order, 98)
+    _set_line_variants_with_images(image)
+    with CaptureQueriesContext(connection) as hundred_orders_queries:
+        content = get_graphql_content(staff_api_client.post_graphql(ORDERS_PAGE_QUERY))
+    edges = content["data"]["orders"]["edges"]
+    assert len(edges) == 100
+    assert edges[0]["node"]["events"][0]["lines"][0]["orderLine"]
+    assert all(edge["node"]["lines"][0]["thumbnail"] for edge in edges)
+    assert len(hundred_orders_queries) == len(two_orders_queries)
+
+
 def test_orders_total(staff_api_client, permission_manage_orders, order_with_lines):
     query = """
     query Orders($period: ReportingPeriod) {
@@ -1,6 +1,9 @@
+from copy import copy
+
 import graphene
 from django.core.exceptions import ValidationError
 from graphene import relay
+from promise import Promise
 
 from ...core.anonymize import obfuscate_address, obfuscate_email
 from ...core.exceptions import PermissionDenied
@@ -13,6 +16,7 @@ from ...order.utils import get_order_country, get_valid_shipping_methods_for_ord
 from ...plugins.manager import get_plugins_manager
 from ...product.templatetags.product_images import get_product_image_thumbnail
 from ...warehouse import models as warehouse_models
+from ..account.dataloaders import AddressByIdLoader, UserByUserIdLoader
 from ..account.types import User
 from ..account.utils import requestor_has_access
 from ..core.connection import CountableDjangoObjectType
@@ -24,9 +28,21 @@ from ..invoice.types import Invoice
 from ..meta.deprecated.resolvers import resolve_meta, resolve_private_meta
 from ..meta.types import ObjectWithMetadata
 from ..payment.types import OrderAction, Payment, PaymentChargeStatusEnum
+from ..product.dataloaders import (
+    ImagesByProductIdLoader,
+    ImagesByProductVariantIdLoader,
+    ProductVariantByIdLoader,
+)
 from ..product.types import ProductVariant
 from ..shipping.types import ShippingMethod
 from ..warehouse.types import Warehouse
+from .dataloaders import (
+    FulfillmentLinesByFulfillmentIdLoader,
+    FulfillmentsByOrderIdLoader,
+    OrderEventsByOrderIdLoader,
+    OrderLineByIdLoader,
+    OrderLinesByOrderIdLoader,
+)
 from .enums import OrderEventsEmailsEnum, OrderEventsEnum
 from .utils import validate_draft_order
 
@@ -76,14 +92,19 @@ class OrderEvent(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_user(root: models.OrderEvent, info):
-        user = info.context.user
-        if (
-            user == root.user
-            or user.has_perm(AccountPermissions.MANAGE_USERS)
-            or user.has_perm(AccountPermissions.MANAGE_STAFF)
-        ):
-            return root.user
-        raise PermissionDenied()
+        def _resolve_user(event_user):
+            user = info.context.user
+            if (
+                user == event_user
+                or user.has_perm(AccountPermissions.MANAGE_USERS)
+                or user.has_perm(AccountPermissions.MANAGE_STAFF)
+            ):
+                return event_user
+            raise PermissionDenied()
+
+        if not root.user_id:
+            return _resolve_user(None)
+        return UserByUserIdLoader(info.context).load(root.user_id).then(_resolve_user)
 
     @staticmethod
     def resolve_email(root: models.OrderEvent, _info):
@@ -132,7 +153,7 @@ class OrderEvent(CountableDjangoObjectType):
         return root.parameters.get("invoice_number")
 
     @staticmethod
-    def resolve_lines(root: models.OrderEvent, _info):
+    def resolve_lines(root: models.OrderEvent, info):
         raw_lines = root.parameters.get("lines", None)
 
         if not raw_lines:
@@ -142,23 +163,24 @@ class OrderEvent(CountableDjangoObjectType):
         for entry in raw_lines:
             line_pks.append(entry.get("line_pk", None))
 
-        lines = models.OrderLine.objects.filter(pk__in=line_pks).all()
-        results = []
-        for raw_line, line_pk in zip(raw_lines, line_pks):
-            line_object = None
-            for line in lines:
-                if line.pk == line_pk:
-                    line_object = line
-                    break
-            results.append(
-                OrderEventOrderLineObject(
-                    quantity=raw_line["quantity"],
-                    order_line=line_object,
-                    item_name=raw_line["item"],
+        def _resolve_lines(lines):
+            results = []
+            lines_map = {line.pk: line for line in lines if line}
+            for raw_line, line_pk in zip(raw_lines, line_pks):
+                results.append(
+                    OrderEventOrderLineObject(
+                        quantity=raw_line["quantity"],
+                        order_line=lines_map.get(line_pk),
+                        item_name=raw_line["item"],
+                    )
                 )
-            )
+            return results
 
-        return results
+        return (
+            OrderLineByIdLoader(info.context)
+            .load_many([line_pk for line_pk in line_pks if line_pk])
+            .then(_resolve_lines)
+        )
 
     @staticmethod
     def resolve_fulfilled_items(root: models.OrderEvent, _info):
@@ -181,8 +203,8 @@ class FulfillmentLine(CountableDjangoObjectType):
         only_fields = ["id", "quantity"]
 
     @staticmethod
-    def resolve_order_line(root: models.FulfillmentLine, _info):
-        return root.order_line
+    def resolve_order_line(root: models.FulfillmentLine, info):
+        return OrderLineByIdLoader(info.context).load(root.order_line_id)
 
 
 class Fulfillment(CountableDjangoObjectType):
@@ -209,17 +231,24 @@ class Fulfillment(CountableDjangoObjectType):
         ]
 
     @staticmethod
-    def resolve_lines(root: models.Fulfillment, _info):
-        return root.lines.all()
+    def resolve_lines(root: models.Fulfillment, info):
+        return FulfillmentLinesByFulfillmentIdLoader(info.context).load(root.id)
 
     @staticmethod
     def resolve_status_display(root: models.Fulfillment, _info):
         return root.get_status_display()
 
     @staticmethod
-    def resolve_warehouse(root: models.Fulfillment, _info):
-        line = root.lines.first()
-        return line.stock.warehouse if line and line.stock else None
+    def resolve_warehouse(root: models.Fulfillment, info):
+        def _resolve_warehouse(lines):
+            line = lines[0] if lines else None
+            return line.stock.warehouse if line and line.stock else None
+
+        return (
+            FulfillmentLinesByFulfillmentIdLoader(info.context)
+            .load(root.id)
+            .then(_resolve_warehouse)
+        )
 
     @staticmethod
     @permission_required(OrderPermissions.MANAGE_ORDERS)
@@ -274,14 +303,40 @@ class OrderLine(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_thumbnail(root: models.OrderLine, info, *, size=255):
-        if not root.variant:
+        if not root.variant_id:
+            return None
+
+        def return_first_thumbnail(images):
+            image = images[0] if images else None
+            if image:
+                url = get_product_image_thumbnail(image, size, method="thumbnail")
+                alt = image.alt
+                return Image(alt=alt, url=info.context.build_absolute_uri(url))
+            return None
+
+        def return_variant_or_product_thumbnail(data):
+            variant, variant_images = data
+            if variant_images or not variant:
+                return return_first_thumbnail(variant_images)
+            return (
+                ImagesByProductIdLoader(info.context)
+                .load(variant.product_id)
+                .then(return_first_thumbnail)
+            )
+
+        variant = ProductVariantByIdLoader(info.context).load(root.variant_id)
+        variant_images = ImagesByProductVariantIdLoader(info.context).load(
+            root.variant_id
+        )
+        return Promise.all([variant, variant_images]).then(
+            return_variant_or_product_thumbnail
+        )
+
+    @staticmethod
+    def resolve_variant(root: models.OrderLine, info):
+        if not root.variant_id:
             return None
-        image = root.variant.get_first_image()
-        if image:
-            url = get_product_image_thumbnail(image, size, method="thumbnail")
-            alt = image.alt
-            return Image(alt=alt, url=info.context.build_absolute_uri(url))
-        return None
+        return ProductVariantByIdLoader(info.context).load(root.variant_id)
 
     @staticmethod
     def resolve_unit_price(root: models.OrderLine, _info):
@@ -389,19 +444,36 @@ class Order(CountableDjangoObjectType):
             "weight",
         ]
 
+    @staticmethod
+    def _resolve_address(root: models.Order, info, address_id):
+        if not address_id:
+            return None
+
+        def _resolve_address_for_requester(data):
+            address, user = data
+            requester = get_user_or_app_from_context(info.context)
+            if requestor_has_access(requester, user, OrderPermissions.MANAGE_ORDERS):
+                return address
+            # addresses are shared through the dataloader, so a copy is obfuscated
+            return obfuscate_address(copy(address))
+
+        address = AddressByIdLoader(info.context).load(address_id)
+        user = Order._load_user(root, info)
+        return Promise.all([address, user]).then(_resolve_address_for_requester)
+
+    @staticmethod
+    def _load_user(root: models.Order, info):
+        if not root.user_id:
+            return Promise.resolve(None)
+        return UserByUserIdLoader(info.context).load(root.user_id)
+
     @staticmethod
     def resolve_billing_address(root: models.Order, info):
-        requester = get_user_or_app_from_context(info.context)
-        if requestor_has_access(requester, root.user, OrderPermissions.MANAGE_ORDERS):
-            return root.billing_address
-        return obfuscate_address(root.billing_address)
+        return Order._resolve_address(root, info, root.billing_address_id)
 
     @staticmethod
     def resolve_shipping_address(root: models.Order, info):
-        requester = get_user_or_app_from_context(info.context)
-        if requestor_has_access(requester, root.user, OrderPermissions.MANAGE_ORDERS):
-            return root.shipping_address
-        return obfuscate_address(root.shipping_address)
+        return Order._resolve_address(root, info, root.shipping_address_id)
 
     @staticmethod
     def resolve_shipping_price(root: models.Order, _info):
@@ -445,21 +517,30 @@ class Order(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_fulfillments(root: models.Order, info):
-        user = info.context.user
-        if user.is_staff:
-            qs = root.fulfillments.all()
-        else:
-            qs = root.fulfillments.exclude(status=FulfillmentStatus.CANCELED)
-        return qs.order_by("pk")
+        def _resolve_fulfillments(fulfillments):
+            user = info.context.user
+            if user.is_staff:
+                return fulfillments
+            return [
+                fulfillment
+                for fulfillment in fulfillments
+                if fulfillment.status != FulfillmentStatus.CANCELED
+            ]
+
+        return (
+            FulfillmentsByOrderIdLoader(info.context)
+            .load(root.id)
+            .then(_resolve_fulfillments)
+        )
 
     @staticmethod
-    def resolve_lines(root: models.Order, _info):
-        return root.lines.all().order_by("pk")
+    def resolve_lines(root: models.Order, info):
+        return OrderLinesByOrderIdLoader(info.context).load(root.id)
 
     @staticmethod
     @permission_required(OrderPermissions.MANAGE_ORDERS)
-    def resolve_events(root: models.Order, _info):
-        return root.events.all().order_by("pk")
+    def resolve_events(root: models.Order, info):
+        return OrderEventsByOrderIdLoader(info.context).load(root.id)
 
     @staticmethod
     def resolve_is_paid(root: models.Order, _info):
@@ -497,18 +578,24 @@ class Order(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_user_email(root: models.Order, info):
-        requester = get_user_or_app_from_context(info.context)
-        customer_email = root.get_customer_email()
-        if requestor_has_access(requester, root.user, OrderPermissions.MANAGE_ORDERS):
-            return customer_email
-        return obfuscate_email(customer_email)
+        def _resolve_user_email(user):
+            requester = get_user_or_app_from_context(info.context)
+            customer_email = user.email if user else root.user_email
+            if requestor_has_access(requester, user, OrderPermissions.MANAGE_ORDERS):
+                return customer_email
+            return obfuscate_email(customer_email)
+
+        return Order._load_user(root, info).then(_resolve_user_email)
 
     @staticmethod
     def resolve_user(root: models.Order, info):
-        requester = get_user_or_app_from_context(info.context)
-        if requestor_has_access(requester, root.user, AccountPermissions.MANAGE_USERS):
-            return root.user
-        raise PermissionDenied()
+        def _resolve_user(user):
+            requester = get_user_or_app_from_context(info.context)
+            if requestor_has_access(requester, user, AccountPermissions.MANAGE_USERS):
+                return user
+            raise PermissionDenied()
+
+        return Order._load_user(root, info).then(_resolve_user)
 
     @staticmethod
     def resolve_available_shipping_methods(root: models.Order, _info):
@@ -12,6 +12,7 @@ from ....product.tasks import update_product_minimal_variant_price_task
 from ....product.utils import delete_categories
 from ....product.utils.attributes import generate_name_for_variant
 from ....warehouse import models as warehouse_models
+from ....warehouse.availability import invalidate_stock_availability
 from ....warehouse.error_codes import StockErrorCode
 from ...core.mutations import (
     BaseBulkMutation,
@@ -509,6 +510,7 @@ class ProductVariantStocksUpdate(ProductVariantStocksCreate):
             stock.quantity = stock_data["quantity"]
             stocks.append(stock)
         warehouse_models.Stock.objects.bulk_update(stocks, ["quantity"])
+        invalidate_stock_availability([variant.pk])
 
 
 class ProductVariantStocksDelete(BaseMutation):
@@ -540,6 +542,7 @@ class ProductVariantStocksDelete(BaseMutation):
         warehouse_models.Stock.objects.filter(
             product_variant=variant, warehouse__pk__in=warehouses_pks
         ).delete()
+        invalidate_stock_availability([variant.pk])
         return cls(product_variant=variant)
 
 
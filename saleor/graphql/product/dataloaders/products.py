@@ -73,7 +73,9 @@ class ImagesByProductVariantIdLoader(DataLoader):
     context_key = "images_by_product_variant"
 
     def batch_load(self, keys):
-        variant_images = VariantImage.objects.filter(variant_id__in=keys)
+        variant_images = VariantImage.objects.filter(
+            variant_id__in=keys
+        ).select_related("image")
         image_map = defaultdict(list)
         for variant_image in variant_images:
             image_map[variant_image.variant_id].append(variant_image.image)
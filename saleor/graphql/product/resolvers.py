@@ -1,9 +1,11 @@
-from django.db.models import Sum
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 
-from ...order import OrderStatus
+from ...order.models import DailyVariantSales, OrderLine
+from ...order.utils import get_first_whole_day, get_orders_to_sum_totals
 from ...product import models
 from ..utils import get_database_id, get_user_or_app_from_context
-from ..utils.filters import filter_by_period
+from ..utils.filters import reporting_period_to_date
 from .filters import filter_products_by_stock_availability
 
 
@@ -91,16 +93,29 @@ def resolve_product_variants(info, ids=None):
     return qs
 
 
-def resolve_report_product_sales(period):
-    qs = models.ProductVariant.objects.all()
-
-    # exclude draft and canceled orders
-    exclude_status = [OrderStatus.DRAFT, OrderStatus.CANCELED]
-    qs = qs.exclude(order_lines__order__status__in=exclude_status)
+def _sum_quantity_subquery(qs):
+    quantity = qs.order_by().values("variant").annotate(total=Sum("quantity"))
+    return Coalesce(Subquery(quantity.values("total")), 0)
 
-    # filter by period
-    qs = filter_by_period(qs, period, "order_lines__order__created")
 
-    qs = qs.annotate(quantity_ordered=Sum("order_lines__quantity"))
-    qs = qs.filter(quantity_ordered__isnull=False)
+def resolve_report_product_sales(period):
+    # sales of whole days are read from the daily sales, which contain only
+    # lines of confirmed, not canceled orders
+    start_date = reporting_period_to_date(period)
+    first_day, first_day_start = get_first_whole_day(start_date)
+    daily_sales = DailyVariantSales.objects.filter(date__gte=first_day)
+    sold_variants = Q(pk__in=daily_sales.values("variant_id"))
+    quantity_ordered = _sum_quantity_subquery(
+        daily_sales.filter(variant=OuterRef("pk"))
+    )
+    if start_date < first_day_start:
+        orders = get_orders_to_sum_totals().filter(
+            created__gte=start_date, created__lt=first_day_start
+        )
+        lines = OrderLine.objects.filter(order__in=orders)
+        sold_variants |= Q(pk__in=lines.values("variant_id"))
+        quantity_ordered += _sum_quantity_subquery(lines.filter(variant=OuterRef("pk")))
+    qs = models.ProductVariant.objects.filter(sold_variants)
+    qs = qs.annotate(quantity_ordered=quantity_ordered)
+    qs = qs.filter(quantity_ordered__gt=0)
     return qs.order_by("-quantity_ordered")
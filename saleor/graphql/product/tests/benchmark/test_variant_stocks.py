@@ -1,6 +1,8 @@
 import graphene
 import pytest
+from django_countries import countries
 
+from .....shipping.models import ShippingZone
 from .....warehouse.models import Stock, Warehouse
 from ....tests.utils import get_graphql_content
 
@@ -180,3 +182,70 @@ def test_product_variants_stocks_delete(
         == variant.stocks.count()
         == stocks_count - 1
     )
+
+
+@pytest.fixture
+def warehouses_in_many_shipping_zones(variant, address):
+    country_codes = [code for code, _ in countries][:200]
+    shipping_zones = ShippingZone.objects.bulk_create(
+        [
+            ShippingZone(name=f"Zone {i}", countries=[code, "PL"])
+            for i, code in enumerate(country_codes)
+        ]
+    )
+    warehouses = Warehouse.objects.bulk_create(
+        [
+            Warehouse(
+                name=f"Warehouse {i}",
+                slug=f"warehouse-{i}",
+                address=address,
+                email="warehouse@example.com",
+            )
+            for i in range(50)
+        ]
+    )
+    for i, warehouse in enumerate(warehouses):
+        start, end = i * 4, (i + 1) * 4
+        warehouse.shipping_zones.add(*shipping_zones[start:end])
+    Stock.objects.bulk_create(
+        [
+            Stock(product_variant=variant, warehouse=warehouse, quantity=10)
+            for warehouse in warehouses
+        ]
+    )
+    return warehouses
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_product_variant_stocks_for_country(
+    staff_api_client,
+    variant,
+    warehouses_in_many_shipping_zones,
+    permission_manage_products,
+    count_queries,
+):
+    # like other benchmarks, only the number of queries is recorded, timing of
+    # the shipping zones lookup is not measured
+    query = """
+    query ProductVariantStocks($id: ID!){
+        productVariant(id: $id){
+            quantityAvailable(countryCode: PL)
+            stocks(countryCode: PL){
+                quantity
+                warehouse{
+                    slug
+                }
+            }
+        }
+    }
+    """
+    variables = {"id": graphene.Node.to_global_id("ProductVariant", variant.pk)}
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products],
+    )
+    content = get_graphql_content(response)
+    data = content["data"]["productVariant"]
+
+    assert data["quantityAvailable"] == 10
+    assert len(data["stocks"]) == len(warehouses_in_many_shipping_zones)
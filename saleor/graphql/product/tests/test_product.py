@@ -17,6 +17,7 @@ from ....core.taxes import TaxType
 from ....core.weight import WeightUnits
 from ....order import OrderStatus
 from ....order.models import OrderLine
+from ....order.utils import update_daily_variant_sales
 from ....plugins.manager import PluginsManager
 from ....product import AttributeInputType
 from ....product.error_codes import ProductErrorCode
@@ -586,6 +587,34 @@ def test_product_query(staff_api_client, product, permission_manage_products, st
     assert margin[1] == product_data["margin"]["stop"]
 
 
+QUERY_PRODUCTS_AVAILABILITY = """
+    query {
+        products(first: 10) {
+            edges {
+                node {
+                    isAvailable
+                }
+            }
+        }
+    }
+"""
+
+
+def test_products_query_is_available(
+    api_client, product_list, django_assert_max_num_queries
+):
+    Stock.objects.filter(product_variant__product=product_list[0]).update(quantity=0)
+
+    with django_assert_max_num_queries(5):
+        response = api_client.post_graphql(QUERY_PRODUCTS_AVAILABILITY)
+    content = get_graphql_content(response)
+
+    products_data = content["data"]["products"]["edges"]
+    availability = {edge["node"]["isAvailable"] for edge in products_data}
+    assert len(products_data) == len(product_list)
+    assert availability == {True, False}
+
+
 def test_products_query_with_filter_attributes(
     query_products_with_filter, staff_api_client, product, permission_manage_products
 ):
@@ -4294,6 +4323,7 @@ def test_report_product_sales(
     permission_manage_products,
     permission_manage_orders,
 ):
+    update_daily_variant_sales(order_with_lines)
     query = """
     query TopProducts($period: ReportingPeriod!) {
         reportProductSales(period: $period, first: 20) {
@@ -4330,6 +4360,84 @@ def test_report_product_sales(
     assert Decimal(amount) == line_b.quantity * line_b.unit_price_gross_amount
 
 
+def test_report_product_sales_excludes_canceled_orders(
+    staff_api_client,
+    order_with_lines,
+    permission_manage_products,
+    permission_manage_orders,
+):
+    update_daily_variant_sales(order_with_lines)
+    order_with_lines.status = OrderStatus.CANCELED
+    order_with_lines.save(update_fields=["status"])
+    update_daily_variant_sales(order_with_lines, canceled=True)
+    query = """
+    query TopProducts($period: ReportingPeriod!) {
+        reportProductSales(period: $period, first: 20) {
+            edges {
+                node {
+                    sku
+                }
+            }
+        }
+    }
+    """
+    variables = {"period": ReportingPeriod.TODAY.name}
+    permissions = [permission_manage_orders, permission_manage_products]
+    response = staff_api_client.post_graphql(query, variables, permissions)
+    content = get_graphql_content(response)
+    assert content["data"]["reportProductSales"]["edges"] == []
+
+
+@freeze_time("2020-03-18 03:00:00")
+@pytest.mark.parametrize(
+    "created, is_reported",
+    [("2020-03-17 23:00:00+00:00", False), ("2020-03-18 01:00:00+00:00", True)],
+)
+def test_report_product_sales_period_starting_mid_day(
+    created,
+    is_reported,
+    staff_api_client,
+    order_with_lines,
+    permission_manage_products,
+    permission_manage_orders,
+):
+    # the period starts at midnight UTC, which is not a midnight in the test
+    # settings time zone, so it starts at the same local day as both orders
+    order_with_lines.created = parse_datetime(created)
+    order_with_lines.save(update_fields=["created"])
+    update_daily_variant_sales(order_with_lines)
+    query = """
+    query TopProducts($period: ReportingPeriod!) {
+        reportProductSales(period: $period, first: 20) {
+            edges {
+                node {
+                    revenue(period: $period) {
+                        gross {
+                            amount
+                        }
+                    }
+                    quantityOrdered
+                    sku
+                }
+            }
+        }
+    }
+    """
+    variables = {"period": ReportingPeriod.TODAY.name}
+    permissions = [permission_manage_orders, permission_manage_products]
+    response = staff_api_client.post_graphql(query, variables, permissions)
+    content = get_graphql_content(response)
+    edges = content["data"]["reportProductSales"]["edges"]
+
+    assert len(edges) == (order_with_lines.lines.count() if is_reported else 0)
+    for edge in edges:
+        node = edge["node"]
+        line = order_with_lines.lines.get(product_sku=node["sku"])
+        assert node["quantityOrdered"] == line.quantity
+        amount = Decimal(str(node["revenue"]["gross"]["amount"]))
+        assert amount == line.quantity * line.unit_price_gross_amount
+
+
 @pytest.mark.parametrize("field", ("purchaseCost", "margin", "privateMeta"))
 def test_product_restricted_fields_permissions(
     staff_api_client,
@@ -20,11 +20,7 @@ from ....product.utils.availability import (
     get_variant_availability,
 )
 from ....product.utils.costs import get_margin_for_variant, get_product_costs_data
-from ....warehouse.availability import (
-    get_available_quantity,
-    get_quantity_allocated,
-    is_product_in_stock,
-)
+from ....warehouse.availability import get_available_quantity, get_quantity_allocated
 from ...account.enums import CountryCodeEnum
 from ...core.connection import CountableDjangoObjectType
 from ...core.enums import ReportingPeriod, TaxRateType
@@ -45,6 +41,7 @@ from ...utils import get_database_id, get_user_or_app_from_context
 from ...utils.filters import reporting_period_to_date
 from ...warehouse.dataloaders import (
     AvailableQuantityByProductVariantIdAndCountryCodeLoader,
+    StockStatusByProductIdAndCountryCodeLoader,
 )
 from ...warehouse.types import Stock
 from ..dataloaders import (
@@ -588,9 +585,13 @@ class Product(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_is_available(root: models.Product, info):
-        country = info.context.country
-        in_stock = is_product_in_stock(root, country)
-        return root.is_visible and in_stock
+        if not root.is_visible:
+            return False
+        return (
+            StockStatusByProductIdAndCountryCodeLoader(info.context)
+            .load((root.id, info.context.country))
+            .then(lambda stock_status: stock_status.is_in_stock)
+        )
 
     @staticmethod
     def resolve_attributes(root: models.Product, info):
@@ -8,6 +8,7 @@ from django.db.utils import IntegrityError
 
 from ...product import AttributeInputType
 from ...product.error_codes import ProductErrorCode
+from ...warehouse.availability import invalidate_stock_availability
 from ...warehouse.models import Stock
 
 if TYPE_CHECKING:
@@ -159,3 +160,4 @@ def create_stocks(
     except IntegrityError:
         msg = "Stock for one of warehouses already exists for this product variant."
         raise ValidationError(msg)
+    invalidate_stock_availability([variant.pk])
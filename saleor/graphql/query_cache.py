@@ -0,0 +1,162 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument, parse, validate
+from graphql.error import GraphQLError
+from graphql.execution import execute
+from graphql.type import GraphQLSchema
+
+PERSISTED_QUERY_CACHE_KEY = "graphql_persisted_query_{}"
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryHashMismatch(GraphQLError):
+    def __init__(self):
+        super().__init__("Provided sha256 hash does not match query string.")
+
+
+class PersistedQueryVersionNotSupported(GraphQLError):
+    def __init__(self):
+        super().__init__("Unsupported persisted query version.")
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class QueryDocumentCache:
+    """Bounded LRU cache of parsed and validated GraphQL documents.
+
+    Documents are stored together with an execute function that skips
+    validation, so a cached query is parsed and validated only once per process.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[Hashable, GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get(self, key: Hashable) -> Optional[GraphQLDocument]:
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def set(self, key: Hashable, document: GraphQLDocument):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "max_size": self.max_size,
+        }
+
+
+query_cache = QueryDocumentCache(settings.GRAPHQL_QUERY_CACHE_SIZE)
+
+
+def build_document(
+    schema: GraphQLSchema, query: str
+) -> Tuple[Optional[GraphQLDocument], List[GraphQLError]]:
+    """Parse and validate a query, return the document or validation errors.
+
+    Raises `GraphQLSyntaxError` if the query cannot be parsed.
+    """
+    document_ast = parse(query)
+    validation_errors = validate(schema, document_ast)
+    if validation_errors:
+        return None, validation_errors
+
+    def execute_document(*args, **kwargs):
+        return execute(schema, document_ast, *args, **kwargs)
+
+    document = GraphQLDocument(
+        schema=schema,
+        document_string=query,
+        document_ast=document_ast,
+        execute=execute_document,
+    )
+    return document, []
+
+
+def get_cached_document(
+    schema: GraphQLSchema, query: str, query_hash: Optional[str] = None
+) -> Tuple[Optional[GraphQLDocument], List[GraphQLError]]:
+    if query_hash is None:
+        query_hash = get_query_hash(query)
+    key = (id(schema), query_hash)
+    document = query_cache.get(key)
+    if document is not None:
+        return document, []
+    document, errors = build_document(schema, query)
+    if document is not None:
+        query_cache.set(key, document)
+    return document, errors
+
+
+def resolve_persisted_query(
+    query: Optional[str], extensions: Optional[Dict]
+) -> Tuple[Optional[str], Optional[str]]:
+    """Return the query string and its hash for an Automatic Persisted Query.
+
+    Clients may send only the sha256 hash of a query in
+    `extensions.persistedQuery`. Unknown hashes raise `PersistedQueryNotFound`,
+    after which the client resends the full query text alongside the hash
+    and it gets stored in the shared cache for subsequent requests.
+    """
+    if not isinstance(extensions, dict):
+        return query, None
+    persisted_query = extensions.get("persistedQuery")
+    if not persisted_query or not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+        return query, None
+
+    if not isinstance(persisted_query, dict):
+        raise PersistedQueryNotFound()
+    if persisted_query.get("version") != 1:
+        raise PersistedQueryVersionNotSupported()
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryNotFound()
+
+    cache_key = PERSISTED_QUERY_CACHE_KEY.format(query_hash)
+    if not query:
+        query = cache.get(cache_key)
+        if query is None:
+            raise PersistedQueryNotFound()
+        return query, query_hash
+
+    if not isinstance(query, str) or get_query_hash(query) != query_hash:
+        raise PersistedQueryHashMismatch()
+    cache.set(cache_key, query, settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT)
+    return query, query_hash
@@ -16,7 +16,7 @@ from django.utils.functional import SimpleLazyObject
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument
 from graphql.error import (
     GraphQLError,
     GraphQLSyntaxError,
@@ -24,9 +24,11 @@ from graphql.error import (
 )
 from graphql.execution import ExecutionResult
 from jwt.exceptions import PyJWTError
+from promise import Promise
 
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .query_cache import get_cached_document, query_cache, resolve_persisted_query
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
@@ -53,23 +55,20 @@ class GraphQLView(View):
     # - file upload (https://github.com/lmcgartland/graphene-file-upload)
     # - query batching
     # - CORS
+    # - parsed documents cached per process, executed without graphql-core
+    # backends (see `query_cache`)
 
     schema = None
     executor = None
-    backend = None
     middleware = None
     root_value = None
 
     HANDLED_EXCEPTIONS = (GraphQLError, PyJWTError, ReadOnlyException, PermissionDenied)
 
-    def __init__(
-        self, schema=None, executor=None, middleware=None, root_value=None, backend=None
-    ):
+    def __init__(self, schema=None, executor=None, middleware=None, root_value=None):
         super().__init__()
         if schema is None:
             schema = graphene_settings.SCHEMA
-        if backend is None:
-            backend = get_default_backend()
         if middleware is None:
             middleware = graphene_settings.MIDDLEWARE
         self.schema = self.schema or schema
@@ -77,7 +76,6 @@ class GraphQLView(View):
             self.middleware = list(instantiate_middleware(middleware))
         self.executor = executor
         self.root_value = root_value
-        self.backend = backend
 
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
@@ -119,7 +117,21 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            max_batch_size = settings.GRAPHQL_MAX_BATCH_SIZE
+            if max_batch_size and len(data) > max_batch_size:
+                message = f"Batch cannot contain more than {max_batch_size} operations."
+                return JsonResponse(
+                    data={"errors": [self.format_error(message)]}, status=400,
+                )
+            if settings.GRAPHQL_CONCURRENT_BATCH_EXECUTION:
+                responses = [
+                    self.format_execution_result(execution_result)
+                    for execution_result in self.execute_graphql_batch_request(
+                        request, data
+                    )
+                ]
+            else:
+                responses = [self.get_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
@@ -164,6 +176,11 @@ class GraphQLView(View):
         self, request: HttpRequest, data: dict
     ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
         execution_result = self.execute_graphql_request(request, data)
+        return self.format_execution_result(execution_result)
+
+    def format_execution_result(
+        self, execution_result: Optional[ExecutionResult]
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
         status_code = 200
         if execution_result:
             response = {}
@@ -185,13 +202,14 @@ class GraphQLView(View):
         return self.root_value
 
     def parse_query(
-        self, query: str
+        self, query: str, query_hash: Optional[str] = None
     ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
         """Attempt to parse a query (mandatory) to a gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed and validated gql document, reusing
+        a cached document if the same query was already seen by this process.
         """
         if not query or not isinstance(query, str):
             return (
@@ -203,52 +221,180 @@ class GraphQLView(View):
 
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(  # type: ignore
-                    self.schema, query
-                ),
-                None,
+            document, validation_errors = get_cached_document(
+                self.schema, query, query_hash  # type: ignore
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
+        if validation_errors:
+            return None, ExecutionResult(errors=validation_errors, invalid=True)
+        return document, None
+
+    def prepare_graphql_request(
+        self, request: HttpRequest, data: dict, span
+    ) -> Tuple[
+        Optional[GraphQLDocument],
+        Optional[dict],
+        Optional[str],
+        Optional[ExecutionResult],
+    ]:
+        """Resolve the document, variables and operation name of an operation.
+
+        Returns an execution result instead of a document if the operation
+        cannot be executed.
+        """
+        query, variables, operation_name = self.get_graphql_params(request, data)
+
+        try:
+            query, query_hash = resolve_persisted_query(query, data.get("extensions"))
+        except GraphQLError as e:
+            return None, None, None, ExecutionResult(errors=[e], invalid=True)
+
+        document, error = self.parse_query(query, query_hash)
+        for stat, value in query_cache.get_stats().items():
+            span.set_tag(f"graphql.query_cache.{stat}", value)
+        if error:
+            return None, None, None, error
+
+        if document is not None:
+            raw_query_string = document.document_string[
+                : settings.OPENTRACING_MAX_QUERY_LENGTH_LOG
+            ]
+            span.set_tag("graphql.query", raw_query_string)
+        return document, variables, operation_name, None
+
+    def execute_document(
+        self,
+        request: HttpRequest,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+        return_promise: bool = False,
+    ):
+        extra_options: Dict[str, Optional[Any]] = {}
+
+        if self.executor:
+            # We only include it optionally since
+            # executor is not a valid argument in all backends
+            extra_options["executor"] = self.executor
+        if return_promise:
+            extra_options["return_promise"] = True
+        return document.execute(  # type: ignore
+            root=self.get_root_value(),
+            variables=variables,
+            operation_name=operation_name,
+            context=request,
+            middleware=self.middleware,
+            **extra_options,
+        )
 
     def execute_graphql_request(self, request: HttpRequest, data: dict):
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
 
-            query, variables, operation_name = self.get_graphql_params(request, data)
-
-            document, error = self.parse_query(query)
+            document, variables, operation_name, error = self.prepare_graphql_request(
+                request, data, span
+            )
             if error:
                 return error
 
-            if document is not None:
-                raw_query_string = document.document_string[
-                    : settings.OPENTRACING_MAX_QUERY_LENGTH_LOG
-                ]
-                span.set_tag("graphql.query", raw_query_string)
-
-            extra_options: Dict[str, Optional[Any]] = {}
-
-            if self.executor:
-                # We only include it optionally since
-                # executor is not a valid argument in all backends
-                extra_options["executor"] = self.executor
             try:
                 with connection.execute_wrapper(tracing_wrapper):
-                    return document.execute(  # type: ignore
-                        root=self.get_root_value(),
-                        variables=variables,
-                        operation_name=operation_name,
-                        context=request,
-                        middleware=self.middleware,
-                        **extra_options,
+                    return self.execute_document(
+                        request, document, variables, operation_name  # type: ignore
                     )
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
                 return ExecutionResult(errors=[e], invalid=True)
 
+    def execute_graphql_batch_request(
+        self, request: HttpRequest, data: List[dict]
+    ) -> List[Optional[ExecutionResult]]:
+        """Execute a batch of operations, running consecutive queries together.
+
+        Queries are started within a single promise tick and resolved together,
+        so dataloaders stored on the request batch and deduplicate their loads
+        across all operations. Mutations are executed one by one and see
+        the effects of all operations that precede them.
+        """
+        results: List[Optional[ExecutionResult]] = [None] * len(data)
+        pending: Dict[int, Tuple[GraphQLDocument, Optional[dict], Optional[str]]] = {}
+
+        def start_query(document, variables, operation_name):
+            try:
+                return self.execute_document(
+                    request, document, variables, operation_name, return_promise=True
+                )
+            except Exception as e:
+                return ExecutionResult(errors=[e], invalid=True)
+
+        def start_pending_queries(_):
+            return Promise.all(
+                [start_query(*operation) for operation in pending.values()]
+            )
+
+        def execute_pending_queries():
+            if not pending:
+                return
+            tracer = opentracing.global_tracer()
+            with tracer.start_active_span("graphql_batch") as scope:
+                span = scope.span
+                span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
+                span.set_tag("graphql.batch_size", len(pending))
+                try:
+                    with connection.execute_wrapper(tracing_wrapper):
+                        resolved = (
+                            Promise.resolve(None).then(start_pending_queries).get()
+                        )
+                except Exception as e:
+                    span.set_tag(opentracing.tags.ERROR, True)
+                    resolved = [ExecutionResult(errors=[e], invalid=True)] * len(
+                        pending
+                    )
+            for index, execution_result in zip(pending, resolved):
+                results[index] = execution_result
+            pending.clear()
+
+        for index, entry in enumerate(data):
+            with opentracing.global_tracer().start_active_span(
+                "graphql_query"
+            ) as scope:
+                span = scope.span
+                span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
+                (
+                    document,
+                    variables,
+                    operation_name,
+                    error,
+                ) = self.prepare_graphql_request(request, entry, span)
+                if error:
+                    results[index] = error
+                    continue
+
+                operation_type = document.get_operation_type(  # type: ignore
+                    operation_name
+                )
+                if operation_type == "query":
+                    pending[index] = (
+                        document,  # type: ignore
+                        variables,
+                        operation_name,
+                    )
+                    continue
+
+                execute_pending_queries()
+                try:
+                    with connection.execute_wrapper(tracing_wrapper):
+                        results[index] = self.execute_document(
+                            request, document, variables, operation_name  # type: ignore
+                        )
+                except Exception as e:
+                    span.set_tag(opentracing.tags.ERROR, True)
+                    results[index] = ExecutionResult(errors=[e], invalid=True)
+        execute_pending_queries()
+        return results
+
     @staticmethod
     def parse_body(request: HttpRequest):
         content_type = request.content_type
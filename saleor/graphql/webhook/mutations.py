@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 from ...core.permissions import AppPermission
 from ...webhook import models
 from ...webhook.error_codes import WebhookErrorCode
+from ...webhook.utils import invalidate_subscribed_event_types
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import WebhookError
 from .enums import WebhookEventTypeEnum
@@ -98,6 +99,7 @@ class WebhookCreate(ModelMutation):
                 for event in events
             ]
         )
+        invalidate_subscribed_event_types()
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -165,6 +167,7 @@ class WebhookUpdate(ModelMutation):
                     for event in events
                 ]
             )
+            invalidate_subscribed_event_types()
 
 
 class WebhookDelete(ModelDeleteMutation):
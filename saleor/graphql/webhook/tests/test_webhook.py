@@ -6,6 +6,7 @@ import pytest
 from ....app.models import App
 from ....webhook.event_types import WebhookEventType
 from ....webhook.models import Webhook
+from ....webhook.utils import is_event_subscribed
 from ...tests.utils import assert_no_permission, get_graphql_content
 from ..enums import WebhookEventTypeEnum, WebhookSampleEventTypeEnum
 
@@ -284,6 +285,24 @@ def test_webhook_update_by_staff(
     assert events[0].event_type == WebhookEventTypeEnum.CUSTOMER_CREATED.value
 
 
+def test_webhook_update_changes_subscribed_event_types(
+    staff_api_client, app, webhook, permission_manage_apps
+):
+    assert is_event_subscribed(WebhookEventType.ORDER_CREATED)
+    assert not is_event_subscribed(WebhookEventType.CUSTOMER_CREATED)
+    webhook_id = graphene.Node.to_global_id("Webhook", webhook.pk)
+    variables = {
+        "id": webhook_id,
+        "events": [WebhookEventTypeEnum.CUSTOMER_CREATED.name],
+        "is_active": True,
+    }
+    staff_api_client.user.user_permissions.add(permission_manage_apps)
+    response = staff_api_client.post_graphql(WEBHOOK_UPDATE, variables=variables)
+    get_graphql_content(response)
+    assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+    assert is_event_subscribed(WebhookEventType.CUSTOMER_CREATED)
+
+
 def test_webhook_update_by_staff_without_permission(staff_api_client, app, webhook):
     query = WEBHOOK_UPDATE
     webhook_id = graphene.Node.to_global_id("Webhook", webhook.pk)
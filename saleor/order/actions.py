@@ -18,9 +18,11 @@ from .emails import (
 )
 from .models import Fulfillment, FulfillmentLine
 from .utils import (
+    invalidate_daily_order_totals,
     order_line_needs_automatic_fulfillment,
     recalculate_order,
     restock_fulfillment_lines,
+    update_daily_variant_sales,
     update_order_status,
 )
 
@@ -36,6 +38,7 @@ logger = logging.getLogger(__name__)
 
 def order_created(order: "Order", user: "User", from_draft: bool = False):
     events.order_created_event(order=order, user=user, from_draft=from_draft)
+    update_daily_variant_sales(order)
     manager = get_plugins_manager()
     manager.order_created(order)
     payment = order.get_last_payment()
@@ -83,6 +86,8 @@ def cancel_order(order: "Order", user: Optional["User"]):
     deallocate_stock_for_order(order)
     order.status = OrderStatus.CANCELED
     order.save(update_fields=["status"])
+    invalidate_daily_order_totals(order)
+    update_daily_variant_sales(order, canceled=True)
 
     manager = get_plugins_manager()
     manager.order_cancelled(order)
@@ -0,0 +1,41 @@
+# Generated by Django 3.1 on 2020-09-14 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0089_auto_20200902_1249"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyOrderTotals",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("currency", models.CharField(max_length=3)),
+                (
+                    "total_net_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "total_gross_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+            ],
+            options={
+                "ordering": ("date", "currency"),
+                "unique_together": {("date", "currency")},
+            },
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 3.1 on 2020-09-14 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+
+from saleor.order import OrderStatus
+
+
+def populate_daily_variant_sales(apps, *_args, **_kwargs):
+    OrderLine = apps.get_model("order", "OrderLine")
+    DailyVariantSales = apps.get_model("order", "DailyVariantSales")
+
+    amount_field = DecimalField(max_digits=12, decimal_places=3)
+    rows = (
+        OrderLine.objects.filter(variant__isnull=False)
+        .exclude(order__status__in=[OrderStatus.DRAFT, OrderStatus.CANCELED])
+        .annotate(day=TruncDate("order__created"))
+        .order_by()
+        .values("day", "variant_id", "order__currency")
+        .annotate(
+            total_quantity=Sum("quantity"),
+            total_net=Sum(
+                ExpressionWrapper(
+                    F("unit_price_net_amount") * F("quantity"),
+                    output_field=amount_field,
+                )
+            ),
+            total_gross=Sum(
+                ExpressionWrapper(
+                    F("unit_price_gross_amount") * F("quantity"),
+                    output_field=amount_field,
+                )
+            ),
+        )
+    )
+    DailyVariantSales.objects.bulk_create(
+        (
+            DailyVariantSales(
+                date=row["day"],
+                variant_id=row["variant_id"],
+                currency=row["order__currency"],
+                quantity=row["total_quantity"],
+                total_net_amount=row["total_net"],
+                total_gross_amount=row["total_gross"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0129_add_product_types_and_attributes_perm"),
+        ("order", "0090_dailyordertotals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyVariantSales",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("currency", models.CharField(max_length=3)),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "total_net_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "total_gross_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_sales",
+                        to="product.productvariant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("date", "variant"),
+                "unique_together": {("date", "variant", "currency")},
+            },
+        ),
+        migrations.RunPython(populate_daily_variant_sales, migrations.RunPython.noop),
+    ]
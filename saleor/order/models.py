@@ -529,3 +529,58 @@ class OrderEvent(models.Model):
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
+
+
+class DailyOrderTotals(models.Model):
+    """Totals of confirmed, not canceled orders created on a single day.
+
+    Rows of past days are calculated on demand when the totals of orders of
+    a long period are requested and removed when one of the summed orders changes
+    its status, so they are calculated again.
+    """
+
+    date = models.DateField()
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    total_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+
+    class Meta:
+        ordering = ("date", "currency")
+        unique_together = ("date", "currency")
+
+
+class DailyVariantSales(models.Model):
+    """Quantity and revenue of a product variant sold on a single day.
+
+    Rows are updated when orders are placed and canceled, so only lines of
+    confirmed, not canceled orders are counted.
+    """
+
+    date = models.DateField()
+    variant = models.ForeignKey(
+        "product.ProductVariant", related_name="daily_sales", on_delete=models.CASCADE
+    )
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    quantity = models.IntegerField(default=0)
+    total_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+
+    class Meta:
+        ordering = ("date", "variant")
+        unique_together = ("date", "variant", "currency")
@@ -1,9 +1,22 @@
+from datetime import timedelta
+from decimal import Decimal
+
 import pytest
+from django.utils import timezone
+from prices import Money, TaxedMoney
 
+from ...product.utils import calculate_revenue_for_variant
 from .. import OrderStatus
+from ..actions import cancel_order, order_created
 from ..events import OrderEvents
-from ..models import Order, OrderEvent
-from ..utils import change_order_line_quantity, match_orders_with_new_user
+from ..models import DailyOrderTotals, DailyVariantSales, Order, OrderEvent
+from ..utils import (
+    change_order_line_quantity,
+    match_orders_with_new_user,
+    sum_order_totals,
+    sum_order_totals_since,
+    update_daily_variant_sales,
+)
 
 
 @pytest.mark.parametrize(
@@ -70,3 +83,137 @@ def test_match_draft_order_with_new_user(customer_user):
 
     order.refresh_from_db()
     assert order.user is None
+
+
+def _set_order_totals(orders, net, gross, created=None):
+    for order in orders:
+        order.total_net_amount = Decimal(net)
+        order.total_gross_amount = Decimal(gross)
+        if created:
+            order.created = created
+        order.save()
+
+
+def test_sum_order_totals(order_list, django_assert_num_queries):
+    _set_order_totals(order_list, "10.00", "12.30")
+
+    with django_assert_num_queries(1):
+        total = sum_order_totals(Order.objects.all())
+
+    assert total == TaxedMoney(Money("30.00", "USD"), Money("36.90", "USD"))
+
+
+def test_sum_order_totals_no_orders(db):
+    assert sum_order_totals(Order.objects.all()) == TaxedMoney(
+        Money(0, "USD"), Money(0, "USD")
+    )
+
+
+def test_sum_order_totals_since_uses_daily_rollup(
+    order_list, settings, django_assert_num_queries
+):
+    settings.ORDER_TOTALS_DAILY_ROLLUP = True
+    start_date = timezone.localtime().replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ) - timedelta(days=3)
+    past_orders, today_order = order_list[:2], order_list[2]
+    _set_order_totals(past_orders, "10.00", "12.30", created=start_date)
+    _set_order_totals([today_order], "1.00", "1.23")
+    expected_total = TaxedMoney(Money("21.00", "USD"), Money("25.83", "USD"))
+
+    assert sum_order_totals_since(start_date) == expected_total
+    assert DailyOrderTotals.objects.count() == 3
+    daily_totals = DailyOrderTotals.objects.get(date=start_date.date())
+    assert daily_totals.total_gross_amount == Decimal("24.60")
+
+    with django_assert_num_queries(3):
+        assert sum_order_totals_since(start_date) == expected_total
+
+
+def test_sum_order_totals_since_mid_day_with_daily_rollup(order_list, settings):
+    settings.ORDER_TOTALS_DAILY_ROLLUP = True
+    start_date = timezone.localtime().replace(
+        hour=12, minute=0, second=0, microsecond=0
+    ) - timedelta(days=3)
+    _set_order_totals(
+        order_list[:1], "10.00", "12.30", created=start_date - timedelta(hours=6)
+    )
+    _set_order_totals(
+        order_list[1:2], "10.00", "12.30", created=start_date + timedelta(hours=6)
+    )
+    _set_order_totals(order_list[2:], "1.00", "1.23")
+
+    assert sum_order_totals_since(start_date) == TaxedMoney(
+        Money("11.00", "USD"), Money("13.53", "USD")
+    )
+
+
+def test_cancel_order_invalidates_daily_rollup(order_list, settings):
+    settings.ORDER_TOTALS_DAILY_ROLLUP = True
+    start_date = timezone.localtime().replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ) - timedelta(days=1)
+    _set_order_totals(order_list, "10.00", "12.30", created=start_date)
+    sum_order_totals_since(start_date)
+
+    cancel_order(order_list[0], None)
+
+    assert not DailyOrderTotals.objects.exists()
+    assert sum_order_totals_since(start_date) == TaxedMoney(
+        Money("20.00", "USD"), Money("24.60", "USD")
+    )
+
+
+def test_order_created_updates_daily_variant_sales(order_with_lines, staff_user):
+    order_created(order_with_lines, staff_user)
+
+    lines = order_with_lines.lines.all()
+    assert DailyVariantSales.objects.count() == len(lines)
+    for line in lines:
+        daily_sales = DailyVariantSales.objects.get(variant=line.variant)
+        assert daily_sales.date == timezone.localtime(order_with_lines.created).date()
+        assert daily_sales.quantity == line.quantity
+        assert daily_sales.total_gross_amount == (
+            line.quantity * line.unit_price_gross_amount
+        )
+
+    revenue = calculate_revenue_for_variant(lines[0].variant, order_with_lines.created)
+    assert revenue == lines[0].unit_price * lines[0].quantity
+
+
+def test_calculate_revenue_for_variant_since_mid_day(order_with_lines):
+    order_with_lines.created = timezone.localtime().replace(
+        hour=12, minute=0, second=0, microsecond=0
+    ) - timedelta(days=2)
+    order_with_lines.save(update_fields=["created"])
+    update_daily_variant_sales(order_with_lines)
+    line = order_with_lines.lines.first()
+    start_date = order_with_lines.created
+
+    revenue = calculate_revenue_for_variant(line.variant, start_date)
+    assert revenue == line.unit_price * line.quantity
+
+    revenue = calculate_revenue_for_variant(line.variant, start_date + timedelta(1))
+    assert revenue == line.unit_price * 0
+
+
+def test_update_daily_variant_sales_number_of_queries(
+    order_with_lines, django_assert_num_queries
+):
+    with django_assert_num_queries(6):
+        update_daily_variant_sales(order_with_lines)
+
+    with django_assert_num_queries(6):
+        update_daily_variant_sales(order_with_lines)
+
+
+def test_cancel_order_updates_daily_variant_sales(order_with_lines, staff_user):
+    update_daily_variant_sales(order_with_lines)
+    update_daily_variant_sales(order_with_lines)
+
+    cancel_order(order_with_lines, staff_user)
+
+    line = order_with_lines.lines.first()
+    daily_sales = DailyVariantSales.objects.get(variant=line.variant)
+    assert daily_sales.quantity == line.quantity
+    assert daily_sales.total_net_amount == line.quantity * line.unit_price_net_amount
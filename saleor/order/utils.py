@@ -1,8 +1,12 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
 from functools import wraps
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from prices import Money, TaxedMoney
 
@@ -16,10 +20,11 @@ from ..discount.utils import (
     validate_voucher_in_order,
 )
 from ..order import OrderStatus
-from ..order.models import Order, OrderLine
+from ..order.models import DailyOrderTotals, DailyVariantSales, Order, OrderLine
 from ..plugins.manager import get_plugins_manager
 from ..product.utils.digital_products import get_default_digital_content_settings
 from ..shipping.models import ShippingMethod
+from ..shipping.utils import get_shipping_zone_ids_for_country
 from ..warehouse.management import deallocate_stock, increase_stock
 from ..warehouse.models import Warehouse
 from . import events
@@ -267,7 +272,7 @@ def restock_order_lines(order):
     """Return ordered products to corresponding stocks."""
     country = get_order_country(order)
     default_warehouse = Warehouse.objects.filter(
-        shipping_zones__countries__contains=country
+        shipping_zones__in=get_shipping_zone_ids_for_country(country)
     ).first()
 
     for line in order:
@@ -301,10 +306,186 @@ def restock_fulfillment_lines(fulfillment, warehouse):
     OrderLine.objects.bulk_update(order_lines, ["quantity_fulfilled"])
 
 
+def _get_totals_by_currency(rows) -> Dict[str, TaxedMoney]:
+    totals: Dict[str, TaxedMoney] = {}
+    for row in rows:
+        currency = row["currency"]
+        total = TaxedMoney(
+            Money(row["total_net"] or 0, currency),
+            Money(row["total_gross"] or 0, currency),
+        )
+        totals[currency] = totals[currency] + total if currency in totals else total
+    return totals
+
+
+def sum_order_totals_by_currency(qs) -> Dict[str, TaxedMoney]:
+    """Sum totals of orders per currency with a single aggregate query."""
+    rows = (
+        qs.order_by()
+        .values("currency")
+        .annotate(
+            total_net=Sum("total_net_amount"), total_gross=Sum("total_gross_amount")
+        )
+    )
+    return _get_totals_by_currency(rows)
+
+
 def sum_order_totals(qs):
     zero = Money(0, currency=settings.DEFAULT_CURRENCY)
     taxed_zero = TaxedMoney(zero, zero)
-    return sum([order.total for order in qs], taxed_zero)
+    totals = sum_order_totals_by_currency(qs)
+    return totals.get(settings.DEFAULT_CURRENCY, taxed_zero)
+
+
+def get_orders_to_sum_totals():
+    return Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
+
+
+def update_daily_order_totals(dates: Iterable[date]):
+    """Calculate rows of the daily order totals rollup for the given days.
+
+    Days without orders get a zero row, so they are not calculated again.
+    """
+    dates = set(dates)
+    rows = (
+        get_orders_to_sum_totals()
+        .filter(created__date__in=dates)
+        .annotate(day=TruncDate("created"))
+        .order_by()
+        .values("day", "currency")
+        .annotate(
+            total_net=Sum("total_net_amount"), total_gross=Sum("total_gross_amount")
+        )
+    )
+    daily_totals = [
+        DailyOrderTotals(
+            date=row["day"],
+            currency=row["currency"],
+            total_net_amount=row["total_net"],
+            total_gross_amount=row["total_gross"],
+        )
+        for row in rows
+    ]
+    dates_with_orders = {daily_total.date for daily_total in daily_totals}
+    daily_totals.extend(
+        DailyOrderTotals(date=day, currency=settings.DEFAULT_CURRENCY)
+        for day in dates - dates_with_orders
+    )
+    with transaction.atomic():
+        DailyOrderTotals.objects.filter(date__in=dates).delete()
+        DailyOrderTotals.objects.bulk_create(daily_totals, ignore_conflicts=True)
+
+
+def invalidate_daily_order_totals(order: Order):
+    """Remove the rollup row of the day the order was created on.
+
+    Has to be called when the order starts or stops being counted in totals.
+    """
+    if settings.ORDER_TOTALS_DAILY_ROLLUP:
+        DailyOrderTotals.objects.filter(
+            date=timezone.localtime(order.created).date()
+        ).delete()
+
+
+def get_first_whole_day(start_date: datetime) -> Tuple[date, datetime]:
+    """Return the first day in the current time zone starting at or after a date.
+
+    The start of the day is returned too. Daily rollups can be used only from
+    that day on, orders created between `start_date` and the start of the day
+    have to be read directly.
+    """
+    local_start_date = timezone.localtime(start_date)
+    first_day = local_start_date.date()
+    if local_start_date.time() != time.min:
+        first_day += timedelta(days=1)
+    return first_day, timezone.make_aware(datetime.combine(first_day, time.min))
+
+
+def sum_order_totals_since(start_date: datetime) -> TaxedMoney:
+    """Sum totals of confirmed, not canceled orders created since the given date.
+
+    With ORDER_TOTALS_DAILY_ROLLUP enabled, totals of whole past days are read
+    from the daily rollup, missing rows are calculated first. Orders of the
+    current day and of the part of the first day after `start_date` are summed
+    directly.
+    """
+    orders = get_orders_to_sum_totals().filter(created__gte=start_date)
+    first_day, first_day_start = get_first_whole_day(start_date)
+    today = timezone.localdate()
+    if not settings.ORDER_TOTALS_DAILY_ROLLUP or first_day >= today:
+        return sum_order_totals(orders)
+
+    days = [first_day + timedelta(days=i) for i in range((today - first_day).days)]
+    stored_days = set(
+        DailyOrderTotals.objects.filter(date__in=days).values_list("date", flat=True)
+    )
+    missing_days = [day for day in days if day not in stored_days]
+    if missing_days:
+        update_daily_order_totals(missing_days)
+    rows = (
+        DailyOrderTotals.objects.filter(date__in=days)
+        .order_by()
+        .values("currency")
+        .annotate(
+            total_net=Sum("total_net_amount"), total_gross=Sum("total_gross_amount")
+        )
+    )
+    totals = _get_totals_by_currency(rows)
+    today_start = timezone.make_aware(datetime.combine(today, time.min))
+    other_totals = sum_order_totals_by_currency(
+        orders.filter(Q(created__lt=first_day_start) | Q(created__gte=today_start))
+    )
+    for currency, total in other_totals.items():
+        totals[currency] = totals[currency] + total if currency in totals else total
+
+    zero = Money(0, currency=settings.DEFAULT_CURRENCY)
+    return totals.get(settings.DEFAULT_CURRENCY, TaxedMoney(zero, zero))
+
+
+def update_daily_variant_sales(order: Order, canceled: bool = False):
+    """Add quantities and revenue of order lines to the daily variant sales.
+
+    Has to be called when the order is placed and, with `canceled` set,
+    when it is canceled to subtract them again.
+    """
+    sign = -1 if canceled else 1
+    sales: Dict[int, List] = defaultdict(lambda: [0, 0, 0])
+    for line in order.lines.all():
+        if line.variant_id is None:
+            continue
+        variant_sales = sales[line.variant_id]
+        variant_sales[0] += sign * line.quantity
+        variant_sales[1] += sign * line.quantity * line.unit_price_net_amount
+        variant_sales[2] += sign * line.quantity * line.unit_price_gross_amount
+    if not sales:
+        return
+
+    day = timezone.localtime(order.created).date()
+    with transaction.atomic():
+        DailyVariantSales.objects.bulk_create(
+            [
+                DailyVariantSales(
+                    date=day, variant_id=variant_id, currency=order.currency
+                )
+                for variant_id in sales
+            ],
+            ignore_conflicts=True,
+        )
+        # rows are locked before being changed, so sales of orders placed at
+        # the same time are not lost
+        daily_sales = list(
+            DailyVariantSales.objects.select_for_update()
+            .filter(date=day, currency=order.currency, variant_id__in=sales)
+            .order_by("pk")
+        )
+        for variant_sales in daily_sales:
+            quantity, net, gross = sales[variant_sales.variant_id]
+            variant_sales.quantity += quantity
+            variant_sales.total_net_amount += net
+            variant_sales.total_gross_amount += gross
+        DailyVariantSales.objects.bulk_update(
+            daily_sales, ["quantity", "total_net_amount", "total_gross_amount"]
+        )
 
 
 def get_valid_shipping_methods_for_order(order: Order):
@@ -1,8 +1,10 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+from uuid import uuid4
 
 import opentracing
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
@@ -14,11 +16,11 @@ from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
 from ..core.taxes import TaxType, zero_taxed_money
 from ..discount import DiscountInfo
+from .base_plugin import BasePlugin
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from .base_plugin import BasePlugin
     from ..checkout.models import Checkout, CheckoutLine
     from ..product.models import Product, ProductType
     from ..account.models import Address, User
@@ -33,6 +35,18 @@ if TYPE_CHECKING:
     )
 
 
+PLUGINS_CONFIGURATION_VERSION_CACHE_KEY = "plugins_configuration_version"
+
+# Original hook implementations, plugins that don't override a hook are skipped
+BASE_PLUGIN_METHODS = {
+    name: attr for name, attr in vars(BasePlugin).items() if callable(attr)
+}
+
+
+def _get_function(method):
+    return getattr(method, "__func__", method)
+
+
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
@@ -40,6 +54,7 @@ class PluginsManager(PaymentInterface):
 
     def __init__(self, plugins: List[str]):
         self.plugins = []
+        self._plugins_by_method: Dict[str, List["BasePlugin"]] = {}
         all_configs = self._get_all_plugin_configs()
         for plugin_path in plugins:
             PluginClass = import_string(plugin_path)
@@ -60,12 +75,24 @@ class PluginsManager(PaymentInterface):
             f"ExtensionsManager.{method_name}"
         ):
             value = default_value
-            for plugin in self.plugins:
+            for plugin in self.__get_plugins_implementing(method_name):
                 value = self.__run_method_on_single_plugin(
                     plugin, method_name, value, *args, **kwargs
                 )
             return value
 
+    def __get_plugins_implementing(self, method_name: str) -> List["BasePlugin"]:
+        """Return plugins which provide their own implementation of the method."""
+        if method_name not in self._plugins_by_method:
+            base_method = BASE_PLUGIN_METHODS.get(method_name)
+            self._plugins_by_method[method_name] = [
+                plugin
+                for plugin in self.plugins
+                if _get_function(getattr(plugin, method_name, NotImplemented))
+                is not base_method
+            ]
+        return self._plugins_by_method[method_name]
+
     def __run_method_on_single_plugin(
         self,
         plugin: Optional["BasePlugin"],
@@ -102,11 +129,23 @@ class PluginsManager(PaymentInterface):
         checkout: "Checkout",
         lines: Iterable["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
+        subtotal: Optional[TaxedMoney] = None,
+        shipping_price: Optional[TaxedMoney] = None,
     ) -> TaxedMoney:
+        """Calculate the checkout total.
 
+        Subtotal and shipping price already calculated by the manager can be passed
+        to avoid calculating them again.
+        """
+        if subtotal is None:
+            subtotal = self.calculate_checkout_subtotal(checkout, lines, discounts)
+        if shipping_price is None:
+            shipping_price = self.calculate_checkout_shipping(
+                checkout, lines, discounts
+            )
         default_value = base_calculations.base_checkout_total(
-            subtotal=self.calculate_checkout_subtotal(checkout, lines, discounts),
-            shipping_price=self.calculate_checkout_shipping(checkout, lines, discounts),
+            subtotal=subtotal,
+            shipping_price=shipping_price,
             discount=checkout.discount,
             currency=checkout.currency,
         )
@@ -122,10 +161,17 @@ class PluginsManager(PaymentInterface):
         checkout: "Checkout",
         lines: Iterable["CheckoutLine"],
         discounts: Iterable[DiscountInfo],
+        line_totals: Optional[List[TaxedMoney]] = None,
     ) -> TaxedMoney:
-        line_totals = [
-            self.calculate_checkout_line_total(line, discounts) for line in lines
-        ]
+        """Calculate the checkout subtotal.
+
+        Totals of lines already calculated by the manager can be passed to avoid
+        calculating them again.
+        """
+        if line_totals is None:
+            line_totals = [
+                self.calculate_checkout_line_total(line, discounts) for line in lines
+            ]
         default_value = base_calculations.base_checkout_subtotal(
             line_totals, checkout.currency
         )
@@ -485,9 +531,11 @@ class PluginsManager(PaymentInterface):
                     identifier=plugin_id,
                     defaults={"configuration": plugin.configuration},
                 )
-                return plugin.save_plugin_configuration(
+                plugin_configuration = plugin.save_plugin_configuration(
                     plugin_configuration, cleaned_data
                 )
+                invalidate_plugins_manager_cache()
+                return plugin_configuration
 
     def get_plugin(self, plugin_id: str) -> Optional["BasePlugin"]:
         for plugin in self.plugins:
@@ -523,3 +571,44 @@ def get_plugins_manager(
         plugins = settings.PLUGINS
     manager = import_string(manager_path)
     return manager(plugins)
+
+
+_cached_managers: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, PluginsManager]] = {}
+
+
+def get_plugins_configuration_version() -> str:
+    version = cache.get(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+        version = cache.get(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_plugins_manager_cache():
+    """Force all processes to reload plugin configurations on the next request."""
+    cache.set(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+
+def get_cached_plugins_manager(
+    manager_path: str = None, plugins: List[str] = None
+) -> PluginsManager:
+    """Return a per-process plugins manager.
+
+    The manager is rebuilt only when the configuration version stored in the cache
+    changes, which happens every time a plugin configuration is saved.
+    """
+    if not manager_path:
+        manager_path = settings.PLUGINS_MANAGER
+    if plugins is None:
+        plugins = settings.PLUGINS
+    key = (manager_path, tuple(plugins))
+    version = get_plugins_configuration_version()
+    cached_version, manager = _cached_managers.get(key, (None, None))
+    if manager is None or cached_version != version:
+        manager = get_plugins_manager(manager_path, plugins)
+        _cached_managers[key] = (version, manager)
+    return manager
+
+
+def clear_cached_plugins_managers():
+    _cached_managers.clear()
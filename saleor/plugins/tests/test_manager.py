@@ -8,7 +8,7 @@ from prices import Money, TaxedMoney
 
 from ...core.taxes import TaxType
 from ...payment.interface import PaymentGateway
-from ..manager import PluginsManager, get_plugins_manager
+from ..manager import PluginsManager, get_cached_plugins_manager, get_plugins_manager
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ActiveDummyPaymentGateway,
@@ -215,6 +215,42 @@ def test_manager_save_plugin_configuration(plugin_configuration):
     assert not plugin_configuration.active
 
 
+def test_get_cached_plugins_manager_reuses_manager():
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+
+    manager = get_cached_plugins_manager(plugins=plugins)
+
+    assert get_cached_plugins_manager(plugins=plugins) is manager
+    assert get_cached_plugins_manager(plugins=[]) is not manager
+
+
+def test_get_cached_plugins_manager_reloads_changed_configuration(
+    plugin_configuration,
+):
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_cached_plugins_manager(plugins=plugins)
+    assert manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+    manager.save_plugin_configuration(PluginSample.PLUGIN_ID, {"active": False})
+
+    new_manager = get_cached_plugins_manager(plugins=plugins)
+    assert new_manager is not manager
+    assert not new_manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+def test_manager_skips_plugins_not_implementing_method():
+    plugins = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.PluginInactive",
+    ]
+    manager = PluginsManager(plugins=plugins)
+
+    assert manager.show_taxes_on_storefront() is True
+    assert manager._plugins_by_method["show_taxes_on_storefront"] == [
+        manager.get_plugin(PluginSample.PLUGIN_ID)
+    ]
+
+
 def test_plugin_updates_configuration_shape(
     new_config, new_config_structure, plugin_configuration, monkeypatch,
 ):
@@ -16,6 +16,7 @@ from ...core.taxes import TaxType
 from ...graphql.core.utils.error_codes import PluginErrorCode
 from ...product.models import Product, ProductType
 from ..base_plugin import BasePlugin, ConfigurationTypeField
+from ..manager import invalidate_plugins_manager_cache
 from . import (
     DEFAULT_TAX_RATE_NAME,
     TaxRateType,
@@ -299,6 +300,8 @@ class VatlayerPlugin(BasePlugin):
         if not self.active:
             return previous_value
         fetch_rates(self.config.access_key)
+        # Rates cached by long-lived plugin instances are outdated now
+        invalidate_plugins_manager_cache()
         return True
 
     @classmethod
@@ -0,0 +1,154 @@
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, DefaultDict, Dict, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model
+
+from ...webhook.event_types import WebhookEventType
+from .tasks import trigger_webhooks_for_event, trigger_webhooks_for_object
+
+# Events which are sent once per object when fired many times in a buffered block
+COALESCED_EVENT_TYPES = {
+    WebhookEventType.CHECKOUT_QUANTITY_CHANGED,
+    WebhookEventType.CHECKOUT_UPADTED,
+    WebhookEventType.PRODUCT_UPDATED,
+}
+
+PayloadGenerator = Callable[[Any], str]
+EventKey = Tuple[str, str, str]
+
+_buffer = threading.local()
+
+logger = logging.getLogger(__name__)
+
+
+def send_webhook_event(
+    event_type: str,
+    instance: Model,
+    generate_payload: PayloadGenerator,
+    payloads: Optional[Dict[Tuple[PayloadGenerator, str, str], str]] = None,
+):
+    """Queue the task triggering webhooks for the event.
+
+    With WEBHOOK_DEFERRED_PAYLOADS enabled only the object's pk is passed to
+    the task once the transaction is committed and the payload is generated
+    by the worker. Otherwise payloads are generated right away and reused from
+    `payloads` for events of the same object.
+    """
+    model_label = instance._meta.label
+    object_pk = str(instance.pk)
+    if settings.WEBHOOK_DEFERRED_PAYLOADS:
+        transaction.on_commit(
+            lambda: trigger_webhooks_for_object.delay(
+                event_type, model_label, object_pk
+            )
+        )
+        return
+    if payloads is None:
+        payloads = {}
+    payload_key = (generate_payload, model_label, object_pk)
+    if payload_key not in payloads:
+        payloads[payload_key] = generate_payload(instance)
+    trigger_webhooks_for_event.delay(event_type, payloads[payload_key])
+
+
+def _get_buffered_events() -> Optional[Dict[EventKey, Tuple[Model, Any]]]:
+    return getattr(_buffer, "events", None)
+
+
+def _add_event(event_type: str, instance: Model, generate_payload: PayloadGenerator):
+    events = _get_buffered_events()
+    if events is None:
+        send_webhook_event(event_type, instance, generate_payload)
+        return
+    key = (event_type, instance._meta.label, str(instance.pk))
+    # the latest instance wins, the event keeps its first position
+    events[key] = (instance, generate_payload)
+
+
+def buffer_webhook_event(
+    event_type: str, instance: Model, generate_payload: PayloadGenerator
+):
+    """Send the event once per object when the buffer is flushed.
+
+    Events are added to the buffer after the current transaction is committed,
+    so events of rolled back changes are dropped. Outside of a buffered block
+    the event is sent right after the commit.
+    """
+    transaction.on_commit(lambda: _add_event(event_type, instance, generate_payload))
+
+
+def _get_keys_of_existing_objects(
+    events: Dict[EventKey, Tuple[Model, Any]]
+) -> Set[EventKey]:
+    """Return keys of events whose objects still exist in the database."""
+    instances_by_label: DefaultDict[str, Dict[str, Model]] = defaultdict(dict)
+    for (_, model_label, object_pk), (instance, _) in events.items():
+        if instance.pk is not None:
+            instances_by_label[model_label][object_pk] = instance
+    existing = set()
+    for model_label, instances in instances_by_label.items():
+        model = next(iter(instances.values())).__class__
+        pks = model._default_manager.filter(pk__in=list(instances)).values_list(
+            "pk", flat=True
+        )
+        existing.update((model_label, str(pk)) for pk in pks)
+    return {key for key in events if key[1:] in existing}
+
+
+def flush_webhook_events(events: Dict[EventKey, Tuple[Model, Any]]):
+    """Send buffered events of objects which still exist.
+
+    Failures are logged and don't stop sending the remaining events, the changes
+    the events describe are already committed.
+    """
+    if not events:
+        return
+    payloads: Dict[Tuple[PayloadGenerator, str, str], str] = {}
+    try:
+        existing_keys = _get_keys_of_existing_objects(events)
+    except Exception:
+        logger.exception("Failed to send buffered webhook events")
+        return
+    for key, (instance, generate_payload) in events.items():
+        event_type, model_label, object_pk = key
+        if key not in existing_keys:
+            logger.info(
+                "Skipping webhook event %r, %s with pk %r doesn't exist",
+                event_type,
+                model_label,
+                object_pk,
+            )
+            continue
+        try:
+            send_webhook_event(event_type, instance, generate_payload, payloads)
+        except Exception:
+            logger.exception(
+                "Failed to send webhook event %r of %s with pk %r",
+                event_type,
+                model_label,
+                object_pk,
+            )
+
+
+@contextmanager
+def webhook_events_buffer():
+    """Coalesce events fired in the block and send them at the end of the block.
+
+    Events are sent only when the block succeeds. Nested blocks share the buffer
+    of the outermost one.
+    """
+    if _get_buffered_events() is not None:
+        yield
+        return
+    _buffer.events = {}
+    try:
+        yield
+    finally:
+        events = _buffer.events
+        _buffer.events = None
+    flush_webhook_events(events)
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from django.db.models import Model
 
 from ...webhook.event_types import WebhookEventType
 from ...webhook.payloads import (
@@ -9,8 +11,9 @@ from ...webhook.payloads import (
     generate_order_payload,
     generate_product_payload,
 )
+from ...webhook.utils import is_event_subscribed
 from ..base_plugin import BasePlugin
-from .tasks import trigger_webhooks_for_event
+from .buffer import COALESCED_EVENT_TYPES, buffer_webhook_event, send_webhook_event
 
 if TYPE_CHECKING:
     from ...order.models import Fulfillment, Order
@@ -29,23 +32,42 @@ class WebhookPlugin(BasePlugin):
         super().__init__(*args, **kwargs)
         self.active = True
 
+    @staticmethod
+    def _trigger_webhooks(
+        event_type: str, instance: Model, generate_payload: Callable[[Any], str]
+    ):
+        """Trigger webhooks for the event if any webhook is subscribed to it.
+
+        Events which may be fired many times for one object are coalesced
+        by the buffer.
+        """
+        if not is_event_subscribed(event_type):
+            return
+        if event_type in COALESCED_EVENT_TYPES:
+            buffer_webhook_event(event_type, instance, generate_payload)
+        else:
+            send_webhook_event(event_type, instance, generate_payload)
+
     def order_created(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CREATED, order_data)
+        self._trigger_webhooks(
+            WebhookEventType.ORDER_CREATED, order, generate_order_payload
+        )
 
     def order_fully_paid(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULLY_PAID, order_data)
+        self._trigger_webhooks(
+            WebhookEventType.ORDER_FULLY_PAID, order, generate_order_payload
+        )
 
     def order_updated(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_UPDATED, order_data)
+        self._trigger_webhooks(
+            WebhookEventType.ORDER_UPDATED, order, generate_order_payload
+        )
 
     def invoice_request(
         self,
@@ -56,62 +78,67 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.INVOICE_REQUESTED, invoice_data
+        self._trigger_webhooks(
+            WebhookEventType.INVOICE_REQUESTED, invoice, generate_invoice_payload
         )
 
     def invoice_delete(self, invoice: "Invoice", previous_value: Any):
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_DELETED, invoice_data)
+        self._trigger_webhooks(
+            WebhookEventType.INVOICE_DELETED, invoice, generate_invoice_payload
+        )
 
     def invoice_sent(self, invoice: "Invoice", email: str, previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_SENT, invoice_data)
+        self._trigger_webhooks(
+            WebhookEventType.INVOICE_SENT, invoice, generate_invoice_payload
+        )
 
     def order_cancelled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CANCELLED, order_data)
+        self._trigger_webhooks(
+            WebhookEventType.ORDER_CANCELLED, order, generate_order_payload
+        )
 
     def order_fulfilled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULFILLED, order_data)
+        self._trigger_webhooks(
+            WebhookEventType.ORDER_FULFILLED, order, generate_order_payload
+        )
 
     def fulfillment_created(self, fulfillment: "Fulfillment", previous_value):
         if not self.active:
             return previous_value
-        fulfillment_data = generate_fulfillment_payload(fulfillment)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.FULFILLMENT_CREATED, fulfillment_data
+        self._trigger_webhooks(
+            WebhookEventType.FULFILLMENT_CREATED,
+            fulfillment,
+            generate_fulfillment_payload,
         )
 
     def customer_created(self, customer: "User", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        customer_data = generate_customer_payload(customer)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CUSTOMER_CREATED, customer_data
+        self._trigger_webhooks(
+            WebhookEventType.CUSTOMER_CREATED, customer, generate_customer_payload
         )
 
     def product_created(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_CREATED, product_data)
+        self._trigger_webhooks(
+            WebhookEventType.PRODUCT_CREATED, product, generate_product_payload
+        )
 
     def product_updated(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_UPDATED, product_data)
+        self._trigger_webhooks(
+            WebhookEventType.PRODUCT_UPDATED, product, generate_product_payload
+        )
 
     # Deprecated. This method will be removed in Saleor 3.0
     def checkout_quantity_changed(
@@ -119,23 +146,22 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_QUANTITY_CHANGED, checkout_data
+        self._trigger_webhooks(
+            WebhookEventType.CHECKOUT_QUANTITY_CHANGED,
+            checkout,
+            generate_checkout_payload,
         )
 
     def checkout_created(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_CREATED, checkout_data
+        self._trigger_webhooks(
+            WebhookEventType.CHECKOUT_CREATED, checkout, generate_checkout_payload
         )
 
     def checkout_updated(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_UPADTED, checkout_data
+        self._trigger_webhooks(
+            WebhookEventType.CHECKOUT_UPADTED, checkout, generate_checkout_payload
         )
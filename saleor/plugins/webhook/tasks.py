@@ -1,21 +1,52 @@
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import boto3
+import opentracing
 import requests
+from botocore.exceptions import BotoCoreError, ClientError
+from django.apps import apps
+from django.conf import settings
 from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 from ...celeryconf import app
 from ...site.models import Site
 from ...webhook.event_types import WebhookEventType
 from ...webhook.models import Webhook
+from ...webhook.payloads import (
+    generate_checkout_payload,
+    generate_customer_payload,
+    generate_fulfillment_payload,
+    generate_invoice_payload,
+    generate_order_payload,
+    generate_product_payload,
+)
 from . import signature_for_payload
 
 logger = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 10
+SQS_MAX_BATCH_SIZE = 10
+# seconds before the first retry of a failed delivery, doubled with every retry
+WEBHOOK_RETRY_BACKOFF = 60
+
+PAYLOAD_GENERATORS = {
+    "account.User": generate_customer_payload,
+    "checkout.Checkout": generate_checkout_payload,
+    "invoice.Invoice": generate_invoice_payload,
+    "order.Fulfillment": generate_fulfillment_payload,
+    "order.Order": generate_order_payload,
+    "product.Product": generate_product_payload,
+}
 
 
 class WebhookSchemes(str, Enum):
@@ -25,6 +56,66 @@ class WebhookSchemes(str, Enum):
     GOOGLE_CLOUD_PUBSUB = "gcpubsub"
 
 
+# A delivery is a list of the webhook pk, target url, secret key, event type and
+# payload, the same values which are passed to `send_webhook_request`
+Delivery = List
+
+_http_sessions: Dict[Tuple[str, str], requests.Session] = {}
+_http_sessions_lock = threading.Lock()
+
+
+def get_http_session(target_url: str) -> requests.Session:
+    """Return a keep-alive session of the worker for the host of the target url.
+
+    Every session has a single connection pool which blocks when all of its
+    connections are in use, so no more than WEBHOOK_MAX_CONNECTIONS_PER_HOST
+    requests are sent to one host by the worker at the same time.
+    """
+    parts = urlparse(target_url)
+    key = (parts.scheme.lower(), parts.netloc)
+    session = _http_sessions.get(key)
+    if session is None:
+        with _http_sessions_lock:
+            session = _http_sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST,
+                    pool_block=True,
+                )
+                session.mount(f"{key[0]}://", adapter)
+                _http_sessions[key] = session
+    return session
+
+
+@lru_cache(maxsize=128)
+def get_sqs_client(region: str, access_key_id: str, secret_access_key: str):
+    return boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_pubsub_client() -> pubsub_v1.PublisherClient:
+    """Return the Pub/Sub publisher of the worker.
+
+    The publisher batches messages published shortly one after another.
+    """
+    return pubsub_v1.PublisherClient()
+
+
+def clear_cached_clients():
+    for session in _http_sessions.values():
+        session.close()
+    _http_sessions.clear()
+    get_sqs_client.cache_clear()
+    get_pubsub_client.cache_clear()
+
+
 @app.task
 def trigger_webhooks_for_event(event_type, data):
     permissions = {}
@@ -40,14 +131,57 @@ def trigger_webhooks_for_event(event_type, data):
         events__event_type__in=[event_type, WebhookEventType.ANY],
         **permissions,
     )
-    webhooks = webhooks.select_related("app").prefetch_related(
-        "app__permissions__content_type"
-    )
 
-    for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+    deliveries = [
+        [webhook.pk, webhook.target_url, webhook.secret_key, event_type, data]
+        for webhook in webhooks
+    ]
+    if deliveries:
+        send_webhook_requests.delay(deliveries)
+
+
+@app.task
+def trigger_webhooks_for_object(event_type, model_label, object_pk):
+    """Generate the payload of an object and trigger webhooks for the event.
+
+    Used when payloads are deferred to workers, objects deleted in the meantime
+    are skipped.
+    """
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=object_pk).first()
+    if instance is None:
+        logger.warning(
+            "Skipping webhooks for event %r, %s with pk %r doesn't exist",
+            event_type,
+            model_label,
+            object_pk,
         )
+        return
+    data = PAYLOAD_GENERATORS[model_label](instance)
+    trigger_webhooks_for_event(event_type, data)
+
+
+def get_sqs_client_and_queue_url(target_url):
+    parts = urlparse(target_url)
+    region = "us-east-1"
+    hostname_parts = parts.hostname.split(".")
+    if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
+        region = hostname_parts[1]
+    client = get_sqs_client(region, parts.username, parts.password)
+    queue_url = urlunparse(
+        ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
+    )
+    return client, queue_url
+
+
+def get_sqs_message_attributes(domain, signature, event_type):
+    msg_attributes = {
+        "SaleorDomain": {"DataType": "String", "StringValue": domain},
+        "EventType": {"DataType": "String", "StringValue": event_type},
+    }
+    if signature:
+        msg_attributes["Signature"] = {"DataType": "String", "StringValue": signature}
+    return msg_attributes
 
 
 def send_webhook_using_http(target_url, message, domain, signature, event_type):
@@ -62,37 +196,17 @@ def send_webhook_using_http(target_url, message, domain, signature, event_type):
         # This header is depreceated and will be removed in Saleor3.0
         headers["X-Saleor-HMAC-SHA256"] = f"sha1={signature}"
 
-    response = requests.post(
+    response = get_http_session(target_url).post(
         target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
     )
     response.raise_for_status()
 
 
 def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
-    parts = urlparse(target_url)
-    region = "us-east-1"
-    hostname_parts = parts.hostname.split(".")
-    if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
-        region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=parts.password,
-    )
-    queue_url = urlunparse(
-        ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
-    )
-
-    msg_attributes = {
-        "SaleorDomain": {"DataType": "String", "StringValue": domain},
-        "EventType": {"DataType": "String", "StringValue": event_type},
-    }
-    if signature:
-        msg_attributes["Signature"] = {"DataType": "String", "StringValue": signature}
+    client, queue_url = get_sqs_client_and_queue_url(target_url)
     client.send_message(
         QueueUrl=queue_url,
-        MessageAttributes=msg_attributes,
+        MessageAttributes=get_sqs_message_attributes(domain, signature, event_type),
         MessageBody=message.decode("utf-8"),
     )
 
@@ -101,9 +215,9 @@ def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = get_pubsub_client()
     topic_name = parts.path[1:]  # drop the leading slash
-    client.publish(
+    return client.publish(
         topic_name,
         message,
         saleorDomain=domain,
@@ -112,9 +226,170 @@ def send_webhook_using_google_cloud_pubsub(
     )
 
 
+def _get_message_and_signature(delivery: Delivery) -> Tuple[bytes, str]:
+    _webhook_id, _target_url, secret, _event_type, data = delivery
+    message = data.encode("utf-8")
+    return message, signature_for_payload(message, secret)
+
+
+def _send_http_delivery(delivery: Delivery, domain: str) -> bool:
+    webhook_id, target_url, _secret, event_type, _data = delivery
+    message, signature = _get_message_and_signature(delivery)
+    start = time.monotonic()
+    try:
+        send_webhook_using_http(target_url, message, domain, signature, event_type)
+    except RequestException as e:
+        logger.warning(
+            "[Webhook ID:%r] Failed to send payload to %r for event %r: %s",
+            webhook_id,
+            target_url,
+            event_type,
+            e,
+        )
+        return False
+    logger.debug(
+        "[Webhook ID:%r] Payload sent to %r for event %r in %.3fs",
+        webhook_id,
+        target_url,
+        event_type,
+        time.monotonic() - start,
+    )
+    return True
+
+
+def send_webhooks_using_http(deliveries: List[Delivery], domain: str) -> List[Delivery]:
+    """Send HTTP deliveries in parallel threads and return the failed ones."""
+    if len(deliveries) == 1:
+        results = [_send_http_delivery(deliveries[0], domain)]
+    else:
+        max_workers = min(len(deliveries), settings.WEBHOOK_DELIVERY_THREADS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda delivery: _send_http_delivery(delivery, domain), deliveries,
+                )
+            )
+    return [delivery for delivery, sent in zip(deliveries, results) if not sent]
+
+
+def send_webhooks_using_aws_sqs_batch(
+    target_url: str, deliveries: List[Delivery], domain: str
+) -> List[Delivery]:
+    """Send deliveries to one SQS queue in batches and return the failed ones."""
+    client, queue_url = get_sqs_client_and_queue_url(target_url)
+    failed = []
+    for i in range(0, len(deliveries), SQS_MAX_BATCH_SIZE):
+        batch = deliveries[i : i + SQS_MAX_BATCH_SIZE]  # noqa: E203
+        entries = []
+        for index, delivery in enumerate(batch):
+            message, signature = _get_message_and_signature(delivery)
+            entries.append(
+                {
+                    "Id": str(index),
+                    "MessageBody": message.decode("utf-8"),
+                    "MessageAttributes": get_sqs_message_attributes(
+                        domain, signature, delivery[3]
+                    ),
+                }
+            )
+        try:
+            response = client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+        except (BotoCoreError, ClientError) as e:
+            logger.warning("Failed to send payloads to %r: %s", queue_url, e)
+            failed.extend(batch)
+            continue
+        failed.extend(batch[int(entry["Id"])] for entry in response.get("Failed", []))
+    return failed
+
+
+def send_webhooks_using_google_cloud_pubsub_batch(
+    deliveries: List[Delivery], domain: str
+) -> List[Delivery]:
+    """Publish all deliveries at once and return the failed ones.
+
+    Messages are published before waiting for any of them, so the publisher
+    can send them in batches.
+    """
+    futures = []
+    for delivery in deliveries:
+        _webhook_id, target_url, _secret, event_type, _data = delivery
+        message, signature = _get_message_and_signature(delivery)
+        futures.append(
+            send_webhook_using_google_cloud_pubsub(
+                target_url, message, domain, signature, event_type
+            )
+        )
+    failed = []
+    for delivery, future in zip(deliveries, futures):
+        try:
+            future.result(timeout=WEBHOOK_TIMEOUT)
+        # publish futures raise any exception of the underlying call
+        except Exception as e:  # noqa
+            logger.warning("Failed to publish payload to %r: %s", delivery[1], e)
+            failed.append(delivery)
+    return failed
+
+
+@app.task
+def send_webhook_requests(deliveries):
+    """Send payloads to many webhooks at once.
+
+    Deliveries are batched per event, the task is queued with the payloads of
+    all webhooks subscribed to a single event. HTTP payloads are sent in
+    parallel through keep-alive sessions, payloads for one SQS queue are sent
+    in batches and Pub/Sub payloads are published together. Failed deliveries
+    are retried one by one by `send_webhook_request`, after the same delay as
+    its first retry.
+    """
+    domain = Site.objects.get_current().domain
+    http_deliveries = []
+    sqs_deliveries = defaultdict(list)
+    pubsub_deliveries = []
+    for delivery in deliveries:
+        target_url = delivery[1]
+        scheme = urlparse(target_url).scheme.lower()
+        if scheme in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
+            http_deliveries.append(delivery)
+        elif scheme == WebhookSchemes.AWS_SQS:
+            sqs_deliveries[target_url].append(delivery)
+        elif scheme == WebhookSchemes.GOOGLE_CLOUD_PUBSUB:
+            pubsub_deliveries.append(delivery)
+        else:
+            logger.error("Unknown webhook scheme: %r", scheme)
+
+    start = time.monotonic()
+    with opentracing.global_tracer().start_active_span("webhooks.send") as scope:
+        failed = []
+        if http_deliveries:
+            failed += send_webhooks_using_http(http_deliveries, domain)
+        for target_url, queue_deliveries in sqs_deliveries.items():
+            failed += send_webhooks_using_aws_sqs_batch(
+                target_url, queue_deliveries, domain
+            )
+        if pubsub_deliveries:
+            failed += send_webhooks_using_google_cloud_pubsub_batch(
+                pubsub_deliveries, domain
+            )
+        scope.span.set_tag("webhooks.count", len(deliveries))
+        scope.span.set_tag("webhooks.failed", len(failed))
+    elapsed = time.monotonic() - start
+
+    for delivery in failed:
+        send_webhook_request.apply_async(delivery, countdown=WEBHOOK_RETRY_BACKOFF)
+
+    logger.info(
+        "Sent %d of %d webhook payloads in %.3fs (%.1f payloads/s), %d retried",
+        len(deliveries) - len(failed),
+        len(deliveries),
+        elapsed,
+        len(deliveries) / elapsed if elapsed else 0,
+        len(failed),
+    )
+
+
 @app.task(
     autoretry_for=(RequestException,),
-    retry_backoff=60,
+    retry_backoff=WEBHOOK_RETRY_BACKOFF,
     retry_kwargs={"max_retries": 15},
 )
 def send_webhook_request(webhook_id, target_url, secret, event_type, data):
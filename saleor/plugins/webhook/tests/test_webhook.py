@@ -1,8 +1,10 @@
 from unittest import mock
 
 import pytest
+from django.db import transaction
 
 from ....app.models import App
+from ....tests.utils import flush_post_commit_hooks
 from ....webhook.event_types import WebhookEventType
 from ....webhook.payloads import (
     generate_checkout_payload,
@@ -11,8 +13,10 @@ from ....webhook.payloads import (
     generate_order_payload,
     generate_product_payload,
 )
+from ....webhook.utils import get_subscribed_event_types, is_event_subscribed
 from ...manager import get_plugins_manager
-from ...webhook.tasks import trigger_webhooks_for_event
+from ...webhook.buffer import webhook_events_buffer
+from ...webhook.tasks import trigger_webhooks_for_event, trigger_webhooks_for_object
 
 first_url = "http://www.example.com/first/"
 third_url = "http://www.example.com/third/"
@@ -30,7 +34,7 @@ third_url = "http://www.example.com/third/"
         (WebhookEventType.CUSTOMER_CREATED, 0, set()),
     ],
 )
-@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_requests.delay")
 def test_trigger_webhooks_for_event_calls_expected_events(
     mock_request,
     event_name,
@@ -68,14 +72,15 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     third_webhook.events.create(event_type=WebhookEventType.ANY)
 
     trigger_webhooks_for_event(event_name, data="")
-    assert mock_request.call_count == total_webhook_calls
+    deliveries = mock_request.call_args[0][0] if mock_request.called else []
+    assert len(deliveries) == total_webhook_calls
 
-    target_url_calls = {call[0][1] for call in mock_request.call_args_list}
+    target_url_calls = {delivery[1] for delivery in deliveries}
     assert target_url_calls == expected_target_urls
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_order_created(mocked_webhook_trigger, settings, any_webhook, order_with_lines):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_created(order_with_lines)
@@ -86,8 +91,8 @@ def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_customer_created(mocked_webhook_trigger, settings, any_webhook, customer_user):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.customer_created(customer_user)
@@ -98,8 +103,10 @@ def test_customer_created(mocked_webhook_trigger, settings, customer_user):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_order_fully_paid(
+    mocked_webhook_trigger, settings, any_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_fully_paid(order_with_lines)
@@ -110,8 +117,8 @@ def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_product_created(mocked_webhook_trigger, settings, any_webhook, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_created(product)
@@ -122,11 +129,12 @@ def test_product_created(mocked_webhook_trigger, settings, product):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_updated(mocked_webhook_trigger, settings, product):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_product_updated(mocked_webhook_trigger, settings, any_webhook, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_updated(product)
+    flush_post_commit_hooks()
 
     expected_data = generate_product_payload(product)
     mocked_webhook_trigger.assert_called_once_with(
@@ -134,8 +142,8 @@ def test_product_updated(mocked_webhook_trigger, settings, product):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_order_updated(mocked_webhook_trigger, settings, any_webhook, order_with_lines):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_updated(order_with_lines)
@@ -146,8 +154,10 @@ def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_order_cancelled(
+    mocked_webhook_trigger, settings, any_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_cancelled(order_with_lines)
@@ -158,13 +168,14 @@ def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
 def test_checkout_quantity_changed(
-    mocked_webhook_trigger, settings, checkout_with_items
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items
 ):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_quantity_changed(checkout_with_items)
+    flush_post_commit_hooks()
 
     expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
@@ -172,8 +183,10 @@ def test_checkout_quantity_changed(
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_checkout_created(
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_created(checkout_with_items)
@@ -184,11 +197,14 @@ def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items)
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_checkout_updated(
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_updated(checkout_with_items)
+    flush_post_commit_hooks()
 
     expected_data = generate_checkout_payload(checkout_with_items)
     mocked_webhook_trigger.assert_called_once_with(
@@ -196,8 +212,10 @@ def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items)
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_invoice_request(
+    mocked_webhook_trigger, settings, any_webhook, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -208,8 +226,8 @@ def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_invoice_delete(mocked_webhook_trigger, settings, any_webhook, fulfilled_order):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -220,8 +238,8 @@ def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
     )
 
 
-@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_invoice_sent(mocked_webhook_trigger, settings, any_webhook, fulfilled_order):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -230,3 +248,217 @@ def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
     mocked_webhook_trigger.assert_called_once_with(
         WebhookEventType.INVOICE_SENT, expected_data
     )
+
+
+@mock.patch("saleor.plugins.webhook.plugin.generate_order_payload")
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_order_updated_not_subscribed(
+    mocked_webhook_trigger,
+    mocked_generate_payload,
+    settings,
+    webhook,
+    order_with_lines,
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    manager.order_updated(order_with_lines)
+
+    mocked_generate_payload.assert_not_called()
+    mocked_webhook_trigger.assert_not_called()
+
+
+def test_subscribed_event_types_are_cached(webhook, django_assert_num_queries):
+    assert get_subscribed_event_types() == {WebhookEventType.ORDER_CREATED}
+
+    with django_assert_num_queries(0):
+        assert is_event_subscribed(WebhookEventType.ORDER_CREATED)
+        assert not is_event_subscribed(WebhookEventType.ORDER_UPDATED)
+
+
+def test_subscribed_event_types_invalidated_on_webhook_change(webhook):
+    assert not is_event_subscribed(WebhookEventType.ORDER_UPDATED)
+
+    webhook.events.create(event_type=WebhookEventType.ORDER_UPDATED)
+    assert is_event_subscribed(WebhookEventType.ORDER_UPDATED)
+
+    webhook.is_active = False
+    webhook.save(update_fields=["is_active"])
+    assert get_subscribed_event_types() == set()
+
+
+def test_subscribed_event_types_invalidated_on_app_change(webhook):
+    assert is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+    webhook.app.is_active = False
+    webhook.app.save(update_fields=["is_active"])
+    assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+    webhook.app.is_active = True
+    webhook.app.save(update_fields=["is_active"])
+    assert is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+    webhook.app.delete()
+    assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+
+@mock.patch("saleor.plugins.webhook.buffer.transaction.on_commit")
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_object.delay")
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_order_created_deferred_payload(
+    mocked_webhook_trigger,
+    mocked_object_webhook_trigger,
+    mocked_on_commit,
+    settings,
+    webhook,
+    order_with_lines,
+):
+    mocked_on_commit.side_effect = lambda func: func()
+    settings.WEBHOOK_DEFERRED_PAYLOADS = True
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    manager.order_created(order_with_lines)
+
+    mocked_webhook_trigger.assert_not_called()
+    mocked_object_webhook_trigger.assert_called_once_with(
+        WebhookEventType.ORDER_CREATED, "order.Order", str(order_with_lines.pk)
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_object(mocked_webhook_trigger, checkout_with_items):
+    trigger_webhooks_for_object(
+        WebhookEventType.CHECKOUT_UPADTED,
+        "checkout.Checkout",
+        str(checkout_with_items.pk),
+    )
+
+    expected_data = generate_checkout_payload(checkout_with_items)
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.CHECKOUT_UPADTED, expected_data
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_deleted_object(mocked_webhook_trigger, order):
+    order_pk = order.pk
+    order.delete()
+
+    trigger_webhooks_for_object(
+        WebhookEventType.ORDER_UPDATED, "order.Order", str(order_pk)
+    )
+
+    mocked_webhook_trigger.assert_not_called()
+
+
+@mock.patch(
+    "saleor.plugins.webhook.plugin.generate_checkout_payload",
+    wraps=generate_checkout_payload,
+)
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_checkout_events_coalesced_in_buffer(
+    mocked_webhook_trigger,
+    mocked_generate_payload,
+    settings,
+    any_webhook,
+    checkout_with_items,
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    with webhook_events_buffer():
+        manager.checkout_quantity_changed(checkout_with_items)
+        manager.checkout_updated(checkout_with_items)
+        manager.checkout_updated(checkout_with_items)
+        flush_post_commit_hooks()
+        mocked_webhook_trigger.assert_not_called()
+
+    expected_data = generate_checkout_payload(checkout_with_items)
+    assert mocked_webhook_trigger.call_args_list == [
+        mock.call(WebhookEventType.CHECKOUT_QUANTITY_CHANGED, expected_data),
+        mock.call(WebhookEventType.CHECKOUT_UPADTED, expected_data),
+    ]
+    assert mocked_generate_payload.call_count == 1
+
+
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_product_updated_coalesced_per_product(
+    mocked_webhook_trigger, settings, any_webhook, product_list
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    with webhook_events_buffer():
+        for product in product_list + product_list:
+            manager.product_updated(product)
+        flush_post_commit_hooks()
+
+    assert mocked_webhook_trigger.call_count == len(product_list)
+
+
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_coalesced_event_of_rolled_back_transaction_not_sent(
+    mocked_webhook_trigger, settings, any_webhook, product
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    with webhook_events_buffer():
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                manager.product_updated(product)
+                raise ValueError()
+        flush_post_commit_hooks()
+
+    mocked_webhook_trigger.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_coalesced_events_not_sent_when_block_fails(
+    mocked_webhook_trigger, settings, any_webhook, product
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    with pytest.raises(ValueError):
+        with webhook_events_buffer():
+            manager.product_updated(product)
+            flush_post_commit_hooks()
+            raise ValueError()
+
+    mocked_webhook_trigger.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_coalesced_event_failure_does_not_stop_other_events(
+    mocked_webhook_trigger, settings, any_webhook, product_list
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    mocked_webhook_trigger.side_effect = [ConnectionError(), None, None]
+
+    with webhook_events_buffer():
+        for product in product_list:
+            manager.product_updated(product)
+        flush_post_commit_hooks()
+
+    assert mocked_webhook_trigger.call_count == len(product_list)
+
+
+@mock.patch("saleor.plugins.webhook.buffer.trigger_webhooks_for_event.delay")
+def test_coalesced_event_of_deleted_object_not_sent(
+    mocked_webhook_trigger, settings, any_webhook, checkout_with_items, product
+):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+
+    with webhook_events_buffer():
+        manager.checkout_updated(checkout_with_items)
+        manager.product_updated(product)
+        flush_post_commit_hooks()
+        # the checkout is deleted by another mutation of a batch
+        checkout_with_items.__class__.objects.filter(pk=checkout_with_items.pk).delete()
+
+    expected_data = generate_product_payload(product)
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.PRODUCT_UPDATED, expected_data
+    )
@@ -5,7 +5,11 @@ from tqdm import tqdm
 
 from ....discount.utils import fetch_active_discounts
 from ...models import Product
-from ...utils.variant_prices import update_product_minimal_variant_price
+from ...utils.variant_prices import (
+    BATCH_SIZE,
+    update_product_minimal_variant_price,
+    update_products_minimal_variant_prices_in_batches,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +17,56 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = "Recalculates the minimal variant prices for all products."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help=(
+                "Compute undiscounted prices in the database and update "
+                "products in batches ordered by id."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of products updated in a single batch.",
+        )
+        parser.add_argument(
+            "--start-after-pk",
+            type=int,
+            default=0,
+            help="Resume a batch update after the product with the given id.",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Updating "minimal_variant_price" field of all the products.')
         # Fetching the discounts just once and reusing them
         discounts = fetch_active_discounts()
-        # Run the update on all the products with "progress bar" (tqdm)
         qs = Product.objects.all()
+        if options["batch"]:
+            self.update_in_batches(qs, discounts, options)
+            return
+        # Run the update on all the products with "progress bar" (tqdm)
         for product in tqdm(qs.iterator(), total=qs.count()):
             update_product_minimal_variant_price(product, discounts=discounts)
+
+    def update_in_batches(self, qs, discounts, options):
+        start_after_pk = options["start_after_pk"]
+        progress_bar = tqdm(total=qs.filter(pk__gt=start_after_pk).count())
+        processed_so_far = 0
+
+        def report_progress(last_product_pk, processed):
+            nonlocal processed_so_far
+            progress_bar.update(processed - processed_so_far)
+            processed_so_far = processed
+            logger.info("Processed products up to id %s.", last_product_pk)
+
+        update_products_minimal_variant_prices_in_batches(
+            qs,
+            discounts=discounts,
+            start_after_pk=start_after_pk,
+            batch_size=options["batch_size"],
+            progress_callback=report_progress,
+        )
+        progress_bar.close()
@@ -8,6 +8,7 @@ from django.db import models
 from django.db.models import JSONField  # type: ignore
 from django.db.models import Case, Count, F, FilteredRelation, Q, Sum, Value, When
 from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
 from django.urls import reverse
 from django.utils.encoding import smart_text
 from django_measurement.models import MeasurementField
@@ -31,7 +32,7 @@ from ..core.utils.draftjs import json_content_to_raw_text
 from ..core.utils.translations import TranslationProxy
 from ..core.weight import WeightUnits, zero_weight
 from ..discount import DiscountInfo
-from ..discount.utils import calculate_discounted_price
+from ..discount.utils import calculate_discounted_price, invalidate_discounts_cache
 from ..seo.models import SeoModel, SeoModelTranslation
 from . import AttributeInputType
 
@@ -907,3 +908,15 @@ class CollectionTranslation(SeoModelTranslation):
 
     def __str__(self) -> str:
         return self.name
+
+
+def invalidate_discounts_cache_of_changed_categories(sender, **kwargs):
+    """Rebuild cached discounts when the tree of categories was changed.
+
+    Sales of a category apply to all of its subcategories.
+    """
+    invalidate_discounts_cache()
+
+
+post_save.connect(invalidate_discounts_cache_of_changed_categories, sender=Category)
+post_delete.connect(invalidate_discounts_cache_of_changed_categories, sender=Category)
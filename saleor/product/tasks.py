@@ -1,3 +1,4 @@
+import logging
 from typing import Iterable, List, Optional
 
 from ..celeryconf import app
@@ -11,6 +12,8 @@ from .utils.variant_prices import (
     update_products_minimal_variant_prices_of_discount,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _update_variants_names(instance: ProductType, saved_attributes: Iterable):
     """Product variant names are created from names of assigned attributes.
@@ -59,9 +62,28 @@ def update_products_minimal_variant_prices_of_catalogues_task(
 
 
 @app.task
-def update_products_minimal_variant_prices_of_discount_task(discount_pk: int):
+def update_products_minimal_variant_prices_of_discount_task(
+    discount_pk: int, start_after_pk: int = 0
+):
+    """Recalculate minimal variant prices of products affected by a sale.
+
+    Products are processed in batches ordered by pk; to resume an interrupted
+    run pass the last logged product pk as `start_after_pk`.
+    """
     discount = Sale.objects.get(pk=discount_pk)
-    update_products_minimal_variant_prices_of_discount(discount)
+
+    def log_progress(last_product_pk: int, processed: int):
+        logger.info(
+            "Updated minimal variant prices of %s products of sale %s "
+            "(last product pk: %s).",
+            processed,
+            discount_pk,
+            last_product_pk,
+        )
+
+    update_products_minimal_variant_prices_of_discount(
+        discount, start_after_pk=start_after_pk, progress_callback=log_progress
+    )
 
 
 @app.task
@@ -1,16 +1,20 @@
-from unittest.mock import patch
+from decimal import Decimal
+from unittest.mock import Mock, patch
 
 from django.core.management import call_command
 from graphql_relay import to_global_id
 from prices import Money
 
 from ...graphql.tests.utils import get_graphql_content
-from ..models import ProductVariant
+from ..models import Product, ProductVariant
 from ..tasks import (
     update_products_minimal_variant_prices_of_catalogues,
     update_products_minimal_variant_prices_task,
 )
-from ..utils.variant_prices import update_product_minimal_variant_price
+from ..utils.variant_prices import (
+    update_product_minimal_variant_price,
+    update_products_minimal_variant_prices_in_batches,
+)
 
 
 def test_update_product_minimal_variant_price(product):
@@ -168,3 +172,69 @@ def test_management_commmand_update_all_products_minimal_variant_price(
     call_args_list = mock_update_product_minimal_variant_price.call_args_list
     for (args, kwargs), product in zip(call_args_list, product_list):
         assert args[0] == product
+
+
+def test_update_products_minimal_variant_prices_in_batches(product_list):
+    Product.objects.update(minimal_variant_price_amount=Decimal(0))
+    progress_callback = Mock()
+
+    processed = update_products_minimal_variant_prices_in_batches(
+        Product.objects.all(),
+        discounts=[],
+        batch_size=2,
+        progress_callback=progress_callback,
+    )
+
+    assert processed == 3
+    prices = Product.objects.order_by("pk").values_list(
+        "minimal_variant_price_amount", flat=True
+    )
+    assert list(prices) == [Decimal(10), Decimal(20), Decimal(30)]
+    assert [call.args for call in progress_callback.call_args_list] == [
+        (product_list[1].pk, 2),
+        (product_list[2].pk, 3),
+    ]
+
+
+def test_update_products_minimal_variant_prices_in_batches_applies_discounts(
+    product_list, discount_info
+):
+    Product.objects.update(minimal_variant_price_amount=Decimal(0))
+
+    products = Product.objects.filter(pk__in=[product.pk for product in product_list])
+
+    update_products_minimal_variant_prices_in_batches(
+        products, discounts=[discount_info], batch_size=2
+    )
+
+    prices = products.order_by("pk").values_list(
+        "minimal_variant_price_amount", flat=True
+    )
+    assert list(prices) == [Decimal(5), Decimal(15), Decimal(25)]
+
+
+def test_update_products_minimal_variant_prices_in_batches_resume(product_list):
+    Product.objects.update(minimal_variant_price_amount=Decimal(0))
+
+    processed = update_products_minimal_variant_prices_in_batches(
+        Product.objects.all(), discounts=[], start_after_pk=product_list[0].pk
+    )
+
+    assert processed == 2
+    prices = Product.objects.order_by("pk").values_list(
+        "minimal_variant_price_amount", flat=True
+    )
+    assert list(prices) == [Decimal(0), Decimal(20), Decimal(30)]
+
+
+def test_management_command_update_all_products_minimal_variant_price_in_batches(
+    product_list,
+):
+    Product.objects.update(minimal_variant_price_amount=Decimal(0))
+
+    call_command("update_all_products_minimal_variant_prices", batch=True, batch_size=1)
+
+    prices = Product.objects.order_by("pk").values_list(
+        "minimal_variant_price_amount", flat=True
+    )
+    assert list(prices) == [Decimal(10), Decimal(20), Decimal(30)]
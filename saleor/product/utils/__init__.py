@@ -1,15 +1,19 @@
-from typing import TYPE_CHECKING, List, Union
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from prices import Money
 
-from ...core.taxes import TaxedMoney, zero_taxed_money
+from ...core.taxes import TaxedMoney
 from ..tasks import update_products_minimal_variant_prices_task
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from datetime import date, datetime
+    from datetime import date
 
     from django.db.models.query import QuerySet
 
@@ -19,14 +23,50 @@ if TYPE_CHECKING:
 def calculate_revenue_for_variant(
     variant: "ProductVariant", start_date: Union["date", "datetime"]
 ) -> TaxedMoney:
-    """Calculate total revenue generated by a product variant."""
-    revenue = zero_taxed_money()
-    for order_line in variant.order_lines.all():
-        if order_line.order.created >= start_date:
-            net = order_line.unit_price_net * order_line.quantity
-            gross = order_line.unit_price_gross * order_line.quantity
-            revenue += TaxedMoney(net, gross)
-    return revenue
+    """Calculate total revenue generated by a product variant.
+
+    Revenue of whole days is summed from the daily variant sales. When
+    `start_date` is not the start of a day, lines of orders created later on
+    that day are summed directly.
+    """
+    from ...order.models import DailyVariantSales, OrderLine
+    from ...order.utils import get_first_whole_day, get_orders_to_sum_totals
+
+    currency = settings.DEFAULT_CURRENCY
+    revenue = {"total_net": Decimal(0), "total_gross": Decimal(0)}
+    if isinstance(start_date, datetime):
+        first_day, first_day_start = get_first_whole_day(start_date)
+        orders = get_orders_to_sum_totals().filter(
+            created__gte=start_date, created__lt=first_day_start, currency=currency
+        )
+        lines_revenue = OrderLine.objects.filter(
+            variant=variant, order__in=orders
+        ).aggregate(
+            total_net=Sum(_line_total("unit_price_net_amount")),
+            total_gross=Sum(_line_total("unit_price_gross_amount")),
+        )
+        _add_revenue(revenue, lines_revenue)
+        start_date = first_day
+    daily_revenue = DailyVariantSales.objects.filter(
+        variant=variant, date__gte=start_date, currency=currency
+    ).aggregate(
+        total_net=Sum("total_net_amount"), total_gross=Sum("total_gross_amount")
+    )
+    _add_revenue(revenue, daily_revenue)
+    return TaxedMoney(
+        Money(revenue["total_net"], currency), Money(revenue["total_gross"], currency)
+    )
+
+
+def _line_total(unit_price_field: str):
+    return ExpressionWrapper(
+        F("quantity") * F(unit_price_field), output_field=DecimalField()
+    )
+
+
+def _add_revenue(revenue: Dict[str, Decimal], other: Dict[str, Optional[Decimal]]):
+    for key, value in other.items():
+        revenue[key] += value or 0
 
 
 @transaction.atomic
@@ -11,10 +11,7 @@ from ...core.utils import to_local_currency
 from ...discount import DiscountInfo
 from ...discount.utils import calculate_discounted_price
 from ...plugins.manager import get_plugins_manager
-from ...warehouse.availability import (
-    are_all_product_variants_in_stock,
-    is_product_in_stock,
-)
+from ...warehouse.availability import get_stock_status_for_products
 from .. import ProductAvailabilityStatus
 
 if TYPE_CHECKING:
@@ -46,20 +43,20 @@ def get_product_availability_status(
     product: "Product", country: str
 ) -> ProductAvailabilityStatus:
     is_visible = product.is_visible
-    are_all_variants_in_stock = are_all_product_variants_in_stock(product, country)
-    is_in_stock = is_product_in_stock(product, country)
+    key = (product.pk, country)
+    stock_status = get_stock_status_for_products([key])[key]
     requires_variants = product.product_type.has_variants
 
     if not product.is_published:
         return ProductAvailabilityStatus.NOT_PUBLISHED
-    if requires_variants and not product.variants.exists():
+    if requires_variants and not stock_status.has_variants:
         # We check the requires_variants flag here in order to not show this
         # status with product types that don't require variants, as in that
         # case variants are hidden from the UI and user doesn't manage them.
         return ProductAvailabilityStatus.VARIANTS_MISSSING
-    if not is_in_stock:
+    if not stock_status.is_in_stock:
         return ProductAvailabilityStatus.OUT_OF_STOCK
-    if not are_all_variants_in_stock:
+    if not stock_status.are_all_variants_in_stock:
         return ProductAvailabilityStatus.LOW_STOCK
     if not is_visible and product.publication_date is not None:
         return ProductAvailabilityStatus.NOT_YET_AVAILABLE
@@ -1,12 +1,17 @@
 import operator
 from functools import reduce
-from typing import Optional
+from typing import Callable, Iterable, Optional
 
+from django.db import transaction
+from django.db.models import Min, OuterRef, QuerySet, Subquery
 from django.db.models.query_utils import Q
 from prices import Money
 
+from ...discount import DiscountInfo
 from ...discount.utils import fetch_active_discounts
-from ..models import Product
+from ..models import Product, ProductVariant
+
+BATCH_SIZE = 2000
 
 
 def _get_product_minimal_variant_price(product, discounts) -> Optional[Money]:
@@ -50,8 +55,85 @@ def update_products_minimal_variant_prices(products, discounts=None):
     )
 
 
+def _update_undiscounted_minimal_variant_prices(products: QuerySet):
+    """Set the cheapest variant price as minimal variant price in one statement."""
+    cheapest_variant_price = (
+        ProductVariant.objects.filter(product_id=OuterRef("pk"))
+        .order_by()
+        .values("product_id")
+        .annotate(min_price=Min("price_amount"))
+        .values("min_price")
+    )
+    products.filter(variants__isnull=False).update(
+        minimal_variant_price_amount=Subquery(cheapest_variant_price)
+    )
+
+
+def _filter_discounted_products(
+    products: QuerySet, discounts: Iterable[DiscountInfo]
+) -> QuerySet:
+    product_ids, category_ids, collection_ids = set(), set(), set()
+    for discount in discounts:
+        product_ids.update(discount.product_ids)
+        category_ids.update(discount.category_ids)
+        collection_ids.update(discount.collection_ids)
+    lookup = (
+        Q(pk__in=product_ids)
+        | Q(category_id__in=category_ids)
+        | Q(collectionproduct__collection_id__in=collection_ids)
+    )
+    return products.filter(lookup).filter(variants__isnull=False).distinct()
+
+
+def update_products_minimal_variant_prices_in_batches(
+    products: QuerySet,
+    discounts: Optional[Iterable[DiscountInfo]] = None,
+    start_after_pk: int = 0,
+    batch_size: int = BATCH_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Recalculate minimal variant prices of products in batches of product ids.
+
+    For every batch the undiscounted minimal price is computed by the database
+    in a single update and only products affected by active sales are priced
+    in Python. After each batch `progress_callback` receives the last processed
+    product pk and the number of processed products; passing that pk as
+    `start_after_pk` resumes an interrupted run. Returns the number of processed
+    products.
+    """
+    if discounts is None:
+        discounts = fetch_active_discounts()
+    products = products.order_by("pk")
+    processed = 0
+    while True:
+        pks = list(
+            products.filter(pk__gt=start_after_pk).values_list("pk", flat=True)[
+                :batch_size
+            ]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            batch = Product.objects.filter(pk__in=pks)
+            _update_undiscounted_minimal_variant_prices(batch)
+            if discounts:
+                discounted_products = _filter_discounted_products(
+                    batch, discounts
+                ).prefetch_related("variants", "collections")
+                update_products_minimal_variant_prices(discounted_products, discounts)
+        processed += len(pks)
+        start_after_pk = pks[-1]
+        if progress_callback:
+            progress_callback(start_after_pk, processed)
+    return processed
+
+
 def update_products_minimal_variant_prices_of_catalogues(
-    product_ids=None, category_ids=None, collection_ids=None
+    product_ids=None,
+    category_ids=None,
+    collection_ids=None,
+    start_after_pk=0,
+    progress_callback=None,
 ):
     # Building the matching products query
     q_list = []
@@ -67,12 +149,20 @@ def update_products_minimal_variant_prices_of_catalogues(
         q_or = reduce(operator.or_, q_list)
         products = Product.objects.filter(q_or).distinct()
 
-        update_products_minimal_variant_prices(products)
+        update_products_minimal_variant_prices_in_batches(
+            products,
+            start_after_pk=start_after_pk,
+            progress_callback=progress_callback,
+        )
 
 
-def update_products_minimal_variant_prices_of_discount(discount):
+def update_products_minimal_variant_prices_of_discount(
+    discount, start_after_pk=0, progress_callback=None
+):
     update_products_minimal_variant_prices_of_catalogues(
         product_ids=discount.products.all().values_list("id", flat=True),
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
+        start_after_pk=start_after_pk,
+        progress_callback=progress_callback,
     )
@@ -215,6 +215,8 @@ MIDDLEWARE = [
     "saleor.core.middleware.currency",
     "saleor.core.middleware.site",
     "saleor.core.middleware.plugins",
+    "saleor.core.middleware.checkout_prices",
+    "saleor.core.middleware.webhook_events",
     "saleor.core.middleware.jwt_refresh_token_middleware",
 ]
 
@@ -372,6 +374,12 @@ OPENEXCHANGERATES_API_KEY = os.environ.get("OPENEXCHANGERATES_API_KEY")
 
 GOOGLE_ANALYTICS_TRACKING_ID = os.environ.get("GOOGLE_ANALYTICS_TRACKING_ID")
 
+# Sum totals of orders of past days from the daily order totals rollup table
+ORDER_TOTALS_DAILY_ROLLUP = get_bool_from_env("ORDER_TOTALS_DAILY_ROLLUP", False)
+
+# Number of product variants processed at once when writing the Google Merchant feed
+GOOGLE_FEED_CHUNK_SIZE = int(os.environ.get("GOOGLE_FEED_CHUNK_SIZE", 1000))
+
 
 def get_host():
     from django.contrib.sites.models import Site
@@ -478,6 +486,22 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", None)
 
+# Number of parallel Celery tasks product exports are split into; more than one
+# shard requires CELERY_RESULT_BACKEND as the exported parts are merged by a chord
+EXPORT_PRODUCTS_SHARDS = int(os.environ.get("EXPORT_PRODUCTS_SHARDS", 1))
+
+# Pass only ids of objects to Celery and generate webhook payloads in the worker;
+# payloads then reflect the state of objects at the time the task is run
+WEBHOOK_DEFERRED_PAYLOADS = get_bool_from_env("WEBHOOK_DEFERRED_PAYLOADS", False)
+
+# The maximum number of concurrent connections a worker opens to one webhook host
+WEBHOOK_MAX_CONNECTIONS_PER_HOST = int(
+    os.environ.get("WEBHOOK_MAX_CONNECTIONS_PER_HOST", 10)
+)
+
+# Number of threads a worker sends HTTP webhook payloads of one batch with
+WEBHOOK_DELIVERY_THREADS = int(os.environ.get("WEBHOOK_DELIVERY_THREADS", 10))
+
 # Change this value if your application is running behind a proxy,
 # e.g. HTTP_CF_Connecting_IP for Cloudflare or X_FORWARDED_FOR
 REAL_IP_ENVIRON = os.environ.get("REAL_IP_ENVIRON", "REMOTE_ADDR")
@@ -485,6 +509,59 @@ REAL_IP_ENVIRON = os.environ.get("REAL_IP_ENVIRON", "REMOTE_ADDR")
 # The maximum length of a graphql query to log in tracings
 OPENTRACING_MAX_QUERY_LENGTH_LOG = 2000
 
+# The maximum number of parsed and validated GraphQL documents cached per process
+GRAPHQL_QUERY_CACHE_SIZE = int(os.environ.get("GRAPHQL_QUERY_CACHE_SIZE", 500))
+
+# Automatic persisted queries, clients can send a sha256 hash instead of a query
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", True
+)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", 60 * 60 * 24)
+)
+
+# Execute queries sent in a single batch request together, sharing dataloaders
+GRAPHQL_CONCURRENT_BATCH_EXECUTION = get_bool_from_env(
+    "GRAPHQL_CONCURRENT_BATCH_EXECUTION", False
+)
+# The maximum number of operations in a batch request, 0 means no limit
+GRAPHQL_MAX_BATCH_SIZE = int(os.environ.get("GRAPHQL_MAX_BATCH_SIZE", 0))
+
+# The time in seconds exact `totalCount` values of connections using the cached
+# count mode are kept for
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", 30)
+)
+# Connections using the estimated count mode count records exactly when the query
+# planner expects fewer rows than this
+GRAPHQL_ESTIMATED_COUNT_THRESHOLD = int(
+    os.environ.get("GRAPHQL_ESTIMATED_COUNT_THRESHOLD", 10000)
+)
+# How `totalCount` of the staff `orders` connection is resolved: "exact", "cached"
+# or "estimated"
+GRAPHQL_ORDERS_TOTAL_COUNT_MODE = os.environ.get(
+    "GRAPHQL_ORDERS_TOTAL_COUNT_MODE", "exact"
+)
+# values of `saleor.graphql.core.connection.TotalCountMode`
+if GRAPHQL_ORDERS_TOTAL_COUNT_MODE not in {"exact", "cached", "estimated"}:
+    raise ImproperlyConfigured(
+        "GRAPHQL_ORDERS_TOTAL_COUNT_MODE must be one of "
+        "'exact', 'cached' or 'estimated'."
+    )
+
+# The maximum time in seconds the snapshot of active discounts is cached for
+DISCOUNTS_CACHE_TIMEOUT = int(os.environ.get("DISCOUNTS_CACHE_TIMEOUT", 60 * 60))
+
+# The maximum time in seconds available quantities of variants are cached for
+STOCK_AVAILABILITY_CACHE_TIMEOUT = int(
+    os.environ.get("STOCK_AVAILABILITY_CACHE_TIMEOUT", 60 * 5)
+)
+
+# The maximum time in seconds the country to shipping zones mapping is cached for
+SHIPPING_ZONES_CACHE_TIMEOUT = int(
+    os.environ.get("SHIPPING_ZONES_CACHE_TIMEOUT", 60 * 60)
+)
+
 # Slugs for menus precreated in Django migrations
 DEFAULT_MENUS = {"top_menu_name": "navbar", "bottom_menu_name": "footer"}
 
@@ -581,3 +658,6 @@ JWT_TTL_REFRESH = timedelta(seconds=parse(os.environ.get("JWT_TTL_REFRESH", "30
 JWT_TTL_REQUEST_EMAIL_CHANGE = timedelta(
     seconds=parse(os.environ.get("JWT_TTL_REQUEST_EMAIL_CHANGE", "1 hour")),
 )
+
+# The maximum time in seconds users authenticated by JWT tokens are cached for
+JWT_USER_CACHE_TIMEOUT = int(os.environ.get("JWT_USER_CACHE_TIMEOUT", 60))
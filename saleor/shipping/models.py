@@ -67,6 +67,19 @@ class ShippingZone(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_shipping_zones_by_country
+
+        super().save(*args, **kwargs)
+        invalidate_shipping_zones_by_country()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_shipping_zones_by_country
+
+        result = super().delete(*args, **kwargs)
+        invalidate_shipping_zones_by_country()
+        return result
+
     @property
     def price_range(self):
         prices = [
@@ -96,8 +109,11 @@ class ShippingMethodQueryset(models.QuerySet):
         It is based on the given country code, and by shipping methods that are
         applicable to the given price & weight total.
         """
+        from .utils import get_shipping_zone_ids_for_country
+
         qs = self.filter(
-            shipping_zone__countries__contains=country_code, currency=price.currency,
+            shipping_zone_id__in=get_shipping_zone_ids_for_country(country_code),
+            currency=price.currency,
         )
         qs = qs.prefetch_related("shipping_zone").order_by("price_amount")
         price_based_methods = _applicable_price_based_methods(price, qs)
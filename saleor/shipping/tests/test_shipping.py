@@ -4,7 +4,12 @@ from measurement.measures import Weight
 from prices import Money
 
 from ..models import ShippingMethod, ShippingMethodType, ShippingZone
-from ..utils import default_shipping_zone_exists, get_countries_without_shipping_zone
+from ..utils import (
+    default_shipping_zone_exists,
+    get_countries_without_shipping_zone,
+    get_shipping_zone_ids_by_country,
+    get_shipping_zone_ids_for_country,
+)
 
 
 def test_shipping_get_total(monkeypatch, shipping_zone):
@@ -151,3 +156,39 @@ def test_default_shipping_zone_exists(shipping_zone):
 def test_get_countries_without_shipping_zone(shipping_zone_without_countries):
     countries_no_shipping_zone = set(get_countries_without_shipping_zone())
     assert {c.code for c in countries} == countries_no_shipping_zone
+
+
+def test_get_shipping_zone_ids_by_country(
+    shipping_zone, shipping_zone_without_countries
+):
+    shipping_zone.countries = ["PL", "DE"]
+    shipping_zone.save()
+    other_zone = ShippingZone.objects.create(name="Poland", countries=["PL"])
+
+    zone_ids_by_country = get_shipping_zone_ids_by_country()
+
+    assert zone_ids_by_country == {
+        "PL": [shipping_zone.pk, other_zone.pk],
+        "DE": [shipping_zone.pk],
+    }
+    assert get_shipping_zone_ids_for_country("US") == []
+
+
+def test_get_shipping_zone_ids_by_country_is_cached(
+    shipping_zone, django_assert_num_queries
+):
+    get_shipping_zone_ids_by_country()
+
+    with django_assert_num_queries(0):
+        assert get_shipping_zone_ids_for_country("PL") == [shipping_zone.pk]
+
+
+def test_get_shipping_zone_ids_for_country_invalidated_on_zone_change(shipping_zone):
+    assert get_shipping_zone_ids_for_country("PL") == [shipping_zone.pk]
+
+    shipping_zone.countries = ["DE"]
+    shipping_zone.save()
+    assert get_shipping_zone_ids_for_country("PL") == []
+
+    shipping_zone.delete()
+    assert get_shipping_zone_ids_for_country("DE") == []
@@ -1,7 +1,15 @@
+from collections import defaultdict
+from typing import DefaultDict, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django_countries import countries
 
 from .models import ShippingZone
 
+SHIPPING_ZONES_BY_COUNTRY_CACHE_KEY = "shipping_zones_by_country"
+
 
 def default_shipping_zone_exists(zone_pk=None):
     return ShippingZone.objects.exclude(pk=zone_pk).filter(default=True)
@@ -13,3 +21,40 @@ def get_countries_without_shipping_zone():
     for zone in ShippingZone.objects.all():
         covered_countries.update({c.code for c in zone.countries})
     return (country[0] for country in countries if country[0] not in covered_countries)
+
+
+def get_shipping_zone_ids_by_country() -> Dict[str, List[int]]:
+    """Return IDs of shipping zones covering each country.
+
+    The mapping is built from all shipping zones with a single query and kept
+    in the cache until any of the shipping zones changes.
+    """
+    zone_ids_by_country = cache.get(SHIPPING_ZONES_BY_COUNTRY_CACHE_KEY)
+    if zone_ids_by_country is None:
+        zone_ids: DefaultDict[str, List[int]] = defaultdict(list)
+        for zone in ShippingZone.objects.only("pk", "countries").order_by("pk"):
+            for country in zone.countries:
+                zone_ids[country.code].append(zone.pk)
+        zone_ids_by_country = dict(zone_ids)
+        cache.set(
+            SHIPPING_ZONES_BY_COUNTRY_CACHE_KEY,
+            zone_ids_by_country,
+            settings.SHIPPING_ZONES_CACHE_TIMEOUT,
+        )
+    return zone_ids_by_country
+
+
+def get_shipping_zone_ids_for_country(country_code: str) -> List[int]:
+    """Return IDs of shipping zones that contain the given country."""
+    return get_shipping_zone_ids_by_country().get(country_code, [])
+
+
+def invalidate_shipping_zones_by_country():
+    """Remove the cached country to shipping zones mapping.
+
+    The mapping is removed right away and once again after the current
+    transaction is committed, so it is not rebuilt from data read before
+    the change was visible to other connections.
+    """
+    cache.delete(SHIPPING_ZONES_BY_COUNTRY_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(SHIPPING_ZONES_BY_COUNTRY_CACHE_KEY))
@@ -13,6 +13,7 @@ import pytz
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -54,6 +55,7 @@ from ..payment import ChargeStatus, TransactionKind
 from ..payment.interface import GatewayConfig, PaymentData
 from ..payment.models import Payment
 from ..plugins.invoicing.plugin import InvoicingPlugin
+from ..plugins.manager import clear_cached_plugins_managers
 from ..plugins.models import PluginConfiguration
 from ..plugins.vatlayer.plugin import VatlayerPlugin
 from ..product import AttributeInputType
@@ -203,6 +205,17 @@ def sample_gateway(settings):
     ]
 
 
+@pytest.fixture(autouse=True)
+def clear_plugins_managers_cache():
+    clear_cached_plugins_managers()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Drop values cached by previous tests, their database rows are rolled back."""
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def site_settings(db, settings) -> SiteSettings:
     """Create a site and matching site settings.
@@ -2228,6 +2241,15 @@ def webhook(app):
     return webhook
 
 
+@pytest.fixture
+def any_webhook(app):
+    webhook = Webhook.objects.create(
+        name="Any webhook", app=app, target_url="http://www.example.com/any"
+    )
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
 @pytest.fixture
 def fake_payment_interface(mocker):
     return mocker.Mock(spec=PaymentInterface)
@@ -1,15 +1,42 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
 
 from ..core.exceptions import InsufficientStock
+from ..product.models import ProductVariant
+from ..shipping.utils import get_shipping_zone_ids_for_country
 from .models import Stock, StockQuerySet
 
 if TYPE_CHECKING:
-    from ..product.models import Product, ProductVariant
+    from ..product.models import Product
+
+CountryCode = Optional[str]
+VariantIdAndCountryCode = Tuple[int, CountryCode]
+ProductIdAndCountryCode = Tuple[int, CountryCode]
+
+STOCK_AVAILABILITY_CACHE_KEY = "stock_availability_{}"
+
+
+@dataclass
+class ProductStockStatus:
+    has_variants: bool
+    is_in_stock: bool
+    are_all_variants_in_stock: bool
 
 
 def _get_quantity_allocated(stocks: StockQuerySet) -> int:
@@ -44,6 +71,50 @@ def check_stock_quantity(variant: "ProductVariant", country_code: str, quantity:
             raise InsufficientStock(variant)
 
 
+def check_stock_quantity_bulk(
+    variants: Iterable["ProductVariant"], country_code: str, quantities: Iterable[int]
+):
+    """Validate if there is stock available for given variants in given country.
+
+    Stocks of all variants are read with a single query. Raises InsufficientStock
+    for the first variant with less stock than required.
+    """
+    variants_and_quantities = [
+        (variant, quantity)
+        for variant, quantity in zip(variants, quantities)
+        if variant.track_inventory
+    ]
+    if not variants_and_quantities:
+        return
+    available_quantities = get_available_quantities(
+        {variant.pk for variant, _ in variants_and_quantities}, country_code
+    )
+    for variant, quantity in variants_and_quantities:
+        if variant.pk not in available_quantities:
+            raise InsufficientStock(variant)
+        if quantity > available_quantities[variant.pk]:
+            raise InsufficientStock(variant)
+
+
+def get_available_quantities(
+    variant_ids: Iterable[int], country_code: str
+) -> Dict[int, int]:
+    """Return available quantities of given variants in given country.
+
+    Variants without any stock in the country are missing in the returned dict.
+    """
+    stocks = (
+        Stock.objects.for_country(country_code)
+        .filter(product_variant_id__in=variant_ids)
+        .annotate_available_quantity()
+        .values_list("product_variant_id", "available_quantity")
+    )
+    quantities: Dict[int, int] = defaultdict(int)
+    for variant_id, quantity in stocks:
+        quantities[variant_id] += quantity
+    return {variant_id: max(quantity, 0) for variant_id, quantity in quantities.items()}
+
+
 def get_available_quantity(variant: "ProductVariant", country_code: str) -> int:
     """Return available quantity for given product in given country."""
     stocks = Stock.objects.get_variant_stocks_for_country(country_code, variant)
@@ -52,6 +123,107 @@ def get_available_quantity(variant: "ProductVariant", country_code: str) -> int:
     return _get_available_quantity(stocks)
 
 
+def _get_available_quantities_by_variant(
+    variant_ids: Iterable[int], country_code: CountryCode
+) -> Dict[int, int]:
+    """Return the highest quantity of variants available in a single shipping zone.
+
+    Only shipping zones containing the given country are taken into account,
+    all shipping zones are considered when the country code is missing.
+    """
+    stocks = Stock.objects.filter(product_variant_id__in=variant_ids)
+    if country_code:
+        stocks = stocks.filter(
+            warehouse__shipping_zones__in=get_shipping_zone_ids_for_country(
+                country_code
+            )
+        )
+    stocks = stocks.annotate_available_quantity()
+    stocks = stocks.values_list(
+        "product_variant_id", "warehouse__shipping_zones", "available_quantity"
+    )
+
+    # A single country code (or a missing country code) can return results from
+    # multiple shipping zones. We want to combine all quantities within a single
+    # zone and then find out which zone contains the highest total.
+    quantity_by_shipping_zone_by_variant: DefaultDict[
+        int, DefaultDict[int, int]
+    ] = defaultdict(lambda: defaultdict(int))
+    for variant_id, shipping_zone_id, quantity in stocks:
+        quantity_by_shipping_zone_by_variant[variant_id][shipping_zone_id] += quantity
+    return {
+        variant_id: max(quantity_by_shipping_zone.values())
+        for variant_id, quantity_by_shipping_zone in (
+            quantity_by_shipping_zone_by_variant.items()
+        )
+    }
+
+
+def get_available_quantities_for_customer(
+    keys: Iterable[VariantIdAndCountryCode],
+) -> Dict[VariantIdAndCountryCode, int]:
+    """Return available quantities for pairs of variant ID and country code.
+
+    Quantities are cached per variant and country, all the requested variants
+    are read from the cache at once. Missing values are calculated with a single
+    query per country and stored in the cache. The returned quantities are not
+    limited by `MAX_CHECKOUT_LINE_QUANTITY`.
+    """
+    keys = list(keys)
+    cache_keys = {
+        variant_id: STOCK_AVAILABILITY_CACHE_KEY.format(variant_id)
+        for variant_id, _ in keys
+    }
+    cached_quantities = cache.get_many(cache_keys.values())
+    quantities_by_variant: Dict[int, Dict[CountryCode, int]] = {
+        variant_id: dict(cached_quantities.get(cache_key, {}))
+        for variant_id, cache_key in cache_keys.items()
+    }
+
+    missing_variants_by_country: DefaultDict[CountryCode, Set[int]] = defaultdict(set)
+    for variant_id, country_code in keys:
+        if country_code not in quantities_by_variant[variant_id]:
+            missing_variants_by_country[country_code].add(variant_id)
+
+    updated_variant_ids: Set[int] = set()
+    for country_code, variant_ids in missing_variants_by_country.items():
+        quantities = _get_available_quantities_by_variant(variant_ids, country_code)
+        for variant_id in variant_ids:
+            quantities_by_variant[variant_id][country_code] = quantities.get(
+                variant_id, 0
+            )
+        updated_variant_ids.update(variant_ids)
+    if updated_variant_ids:
+        cache.set_many(
+            {
+                cache_keys[variant_id]: quantities_by_variant[variant_id]
+                for variant_id in updated_variant_ids
+            },
+            settings.STOCK_AVAILABILITY_CACHE_TIMEOUT,
+        )
+
+    return {
+        (variant_id, country_code): quantities_by_variant[variant_id][country_code]
+        for variant_id, country_code in keys
+    }
+
+
+def invalidate_stock_availability(variant_ids: Iterable[int]):
+    """Remove cached available quantities of given variants.
+
+    The values are removed right away and once again after the current
+    transaction is committed, so they are not cached from data read before
+    the change was visible to other connections.
+    """
+    cache_keys = [
+        STOCK_AVAILABILITY_CACHE_KEY.format(variant_id) for variant_id in variant_ids
+    ]
+    if not cache_keys:
+        return
+    cache.delete_many(cache_keys)
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
 def get_available_quantity_for_customer(
     variant: "ProductVariant", country_code: str = None
 ) -> int:
@@ -68,23 +240,9 @@ def get_available_quantity_for_customer(
     if not variant.track_inventory:
         return settings.MAX_CHECKOUT_LINE_QUANTITY
 
-    stocks = Stock.objects.filter(product_variant=variant)
-    if country_code:
-        stocks = stocks.for_country(country_code)
-    stocks = stocks.annotate_available_quantity()
-    stocks = stocks.values_list("warehouse__shipping_zones", "available_quantity")
-
-    if not stocks:
-        return 0
-
-    available_quantity_in_shipping_zones: Dict = defaultdict(int)
-    for shipping_zone_pk, available_quantity in stocks:
-        available_quantity_in_shipping_zones[shipping_zone_pk] += available_quantity
-
-    max_available_quantity = max(
-        available_quantity_in_shipping_zones.items(), key=lambda x: x[1]
-    )[1]
-    return min(max_available_quantity, settings.MAX_CHECKOUT_LINE_QUANTITY)
+    key = (variant.pk, country_code)
+    available_quantity = get_available_quantities_for_customer([key])[key]
+    return min(available_quantity, settings.MAX_CHECKOUT_LINE_QUANTITY)
 
 
 def get_quantity_allocated(variant: "ProductVariant", country_code: str) -> int:
@@ -100,22 +258,58 @@ def is_variant_in_stock(variant: "ProductVariant", country_code: str) -> bool:
     return quantity_available > 0
 
 
+def _get_available_quantities_of_product_variants(
+    product: "Product", country_code: str
+) -> Iterable[int]:
+    keys = [(variant.pk, country_code) for variant in product.variants.all()]
+    return get_available_quantities_for_customer(keys).values()
+
+
 def is_product_in_stock(product: "Product", country_code: str) -> bool:
     """Check if there is any variant of given product available in given country."""
-    stocks = Stock.objects.get_product_stocks_for_country(
-        country_code, product
-    ).annotate_available_quantity()
-    return any(stocks.values_list("available_quantity", flat=True))
+    quantities = _get_available_quantities_of_product_variants(product, country_code)
+    return any(quantity > 0 for quantity in quantities)
 
 
 def are_all_product_variants_in_stock(product: "Product", country_code: str) -> bool:
     """Check if all variants of given product are available in given country."""
-    stocks = Stock.objects.get_product_stocks_for_country(
-        country_code, product
-    ).annotate_available_quantity()
-    stocks = stocks.values_list("available_quantity", "product_variant_id").all()
-    are_all_available = all([elem[0] for elem in stocks])
-    variants_with_stocks = [elem[1] for elem in stocks]
-
-    product_variants = product.variants.exclude(id__in=variants_with_stocks).exists()
-    return are_all_available and not product_variants
+    quantities = _get_available_quantities_of_product_variants(product, country_code)
+    return all(quantity > 0 for quantity in quantities)
+
+
+def get_stock_status_for_products(
+    keys: Iterable[ProductIdAndCountryCode],
+) -> Dict[ProductIdAndCountryCode, ProductStockStatus]:
+    """Return stock status of products for pairs of product ID and country code.
+
+    Variants of all the given products are fetched with a single query and their
+    available quantities are taken from `get_available_quantities_for_customer`.
+    """
+    keys = list(keys)
+    variant_ids_by_product: DefaultDict[int, List[int]] = defaultdict(list)
+    variants = ProductVariant.objects.filter(
+        product_id__in={product_id for product_id, _ in keys}
+    ).values_list("product_id", "pk")
+    for product_id, variant_id in variants:
+        variant_ids_by_product[product_id].append(variant_id)
+
+    quantities = get_available_quantities_for_customer(
+        (variant_id, country_code)
+        for product_id, country_code in keys
+        for variant_id in variant_ids_by_product[product_id]
+    )
+
+    stock_statuses = {}
+    for product_id, country_code in keys:
+        variant_quantities = [
+            quantities[(variant_id, country_code)]
+            for variant_id in variant_ids_by_product[product_id]
+        ]
+        stock_statuses[(product_id, country_code)] = ProductStockStatus(
+            has_variants=bool(variant_quantities),
+            is_in_stock=any(quantity > 0 for quantity in variant_quantities),
+            are_all_variants_in_stock=all(
+                quantity > 0 for quantity in variant_quantities
+            ),
+        )
+    return stock_statuses
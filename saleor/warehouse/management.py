@@ -1,11 +1,12 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, DefaultDict, Dict, Iterable, List
 
 from django.db import transaction
 from django.db.models import F, Sum
 from django.db.models.functions import Coalesce
 
 from ..core.exceptions import AllocationError, InsufficientStock
+from .availability import invalidate_stock_availability
 from .models import Allocation, Stock, Warehouse
 
 if TYPE_CHECKING:
@@ -65,11 +66,78 @@ def allocate_stock(
             quantity_allocated += quantity_to_allocate
             if quantity_allocated == quantity:
                 Allocation.objects.bulk_create(allocations)
+                invalidate_stock_availability([order_line.variant_id])
                 break
     if not quantity_allocated == quantity:
         raise InsufficientStock(order_line.variant)
 
 
+@transaction.atomic
+def allocate_stocks(order_lines: Iterable["OrderLine"], country_code: str):
+    """Allocate stocks for given `order_lines` in given country.
+
+    Function lock for update all stocks for variants of the order lines in given
+    country with a single query ordered by pk and fetch the quantity allocated
+    in them. Next, allocations are calculated in memory the same way as in
+    `allocate_stock`, line by line, taking into account quantities allocated for
+    the preceding lines, and saved with a single query. If there is less quantity
+    in stocks then required for any of the lines, raise InsufficientStock exception
+    and allocate nothing.
+    """
+    order_lines = list(order_lines)
+    variant_ids = {line.variant_id for line in order_lines}
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .for_country(country_code)
+        .filter(product_variant_id__in=variant_ids)
+        .order_by("pk")
+    )
+
+    quantity_allocation_list = (
+        Allocation.objects.filter(stock__in=stocks, quantity_allocated__gt=0)
+        .values("stock")
+        .annotate(Sum("quantity_allocated"))
+    )
+    quantity_allocation_for_stocks: Dict = defaultdict(int)
+    for allocation in quantity_allocation_list:
+        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
+            "quantity_allocated__sum"
+        ]
+
+    stocks_by_variant: DefaultDict[int, List[Stock]] = defaultdict(list)
+    for stock in stocks:
+        stocks_by_variant[stock.product_variant_id].append(stock)
+
+    allocations = []
+    for order_line in order_lines:
+        quantity = order_line.quantity
+        quantity_allocated = 0
+        for stock in stocks_by_variant[order_line.variant_id]:
+            quantity_available_in_stock = (
+                stock.quantity - quantity_allocation_for_stocks[stock.pk]
+            )
+            quantity_to_allocate = min(
+                (quantity - quantity_allocated), quantity_available_in_stock
+            )
+            if quantity_to_allocate > 0:
+                allocations.append(
+                    Allocation(
+                        order_line=order_line,
+                        stock=stock,
+                        quantity_allocated=quantity_to_allocate,
+                    )
+                )
+                quantity_allocation_for_stocks[stock.pk] += quantity_to_allocate
+                quantity_allocated += quantity_to_allocate
+                if quantity_allocated == quantity:
+                    break
+        if not quantity_allocated == quantity:
+            raise InsufficientStock(order_line.variant)
+
+    Allocation.objects.bulk_create(allocations)
+    invalidate_stock_availability(variant_ids)
+
+
 @transaction.atomic
 def deallocate_stock(order_line: "OrderLine", quantity: int):
     """Deallocate stocks for given `order_line`.
@@ -97,6 +165,7 @@ def deallocate_stock(order_line: "OrderLine", quantity: int):
             quantity_dealocated += quantity_to_deallocate
             if quantity_dealocated == quantity:
                 Allocation.objects.bulk_update(allocations, ["quantity_allocated"])
+                invalidate_stock_availability([order_line.variant_id])
                 break
     if not quantity_dealocated == quantity:
         raise AllocationError(order_line, quantity)
@@ -184,4 +253,6 @@ def deallocate_stock_for_order(order: "Order"):
     allocations = Allocation.objects.filter(
         order_line__order=order, quantity_allocated__gt=0
     ).select_for_update(of=("self",))
+    variant_ids = set(allocations.values_list("stock__product_variant_id", flat=True))
     allocations.update(quantity_allocated=0)
+    invalidate_stock_availability(variant_ids)
@@ -5,11 +5,13 @@ from typing import Set
 from django.db import models
 from django.db.models import F, Sum
 from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete
 
 from ..account.models import Address
 from ..order.models import OrderLine
 from ..product.models import Product, ProductVariant
 from ..shipping.models import ShippingZone
+from ..shipping.utils import get_shipping_zone_ids_for_country
 
 
 class WarehouseQueryset(models.QuerySet):
@@ -19,7 +21,7 @@ class WarehouseQueryset(models.QuerySet):
     def for_country(self, country: str):
         return (
             self.prefetch_data()
-            .filter(shipping_zones__countries__contains=country)
+            .filter(shipping_zones__in=get_shipping_zone_ids_for_country(country))
             .order_by("pk")
         )
 
@@ -64,7 +66,7 @@ class StockQuerySet(models.QuerySet):
     def for_country(self, country_code: str):
         query_warehouse = models.Subquery(
             Warehouse.objects.filter(
-                shipping_zones__countries__contains=country_code
+                shipping_zones__in=get_shipping_zone_ids_for_country(country_code)
             ).values("pk")
         )
         return self.select_related("product_variant", "warehouse").filter(
@@ -99,6 +101,12 @@ class Stock(models.Model):
         unique_together = [["warehouse", "product_variant"]]
         ordering = ("pk",)
 
+    def save(self, *args, **kwargs):
+        from .availability import invalidate_stock_availability
+
+        super().save(*args, **kwargs)
+        invalidate_stock_availability([self.product_variant_id])
+
     def increase_stock(self, quantity: int, commit: bool = True):
         """Return given quantity of product to a stock."""
         self.quantity = F("quantity") + quantity
@@ -131,3 +139,17 @@ class Allocation(models.Model):
     class Meta:
         unique_together = [["order_line", "stock"]]
         ordering = ("pk",)
+
+
+def invalidate_stock_availability_of_deleted_stock(sender, instance, **kwargs):
+    """Drop cached availability of a deleted stock's variant.
+
+    Unlike overriding delete, the signal is also sent for stocks removed by
+    deleting their warehouse or variant.
+    """
+    from .availability import invalidate_stock_availability
+
+    invalidate_stock_availability([instance.product_variant_id])
+
+
+post_delete.connect(invalidate_stock_availability_of_deleted_stock, sender=Stock)
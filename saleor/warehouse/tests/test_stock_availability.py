@@ -2,13 +2,21 @@ import pytest
 from django.test import override_settings
 
 from ...core.exceptions import InsufficientStock
+from ...product.models import Product
+from ...shipping.utils import get_shipping_zone_ids_by_country
 from ..availability import (
     are_all_product_variants_in_stock,
     check_stock_quantity,
+    check_stock_quantity_bulk,
+    get_available_quantities,
+    get_available_quantities_for_customer,
     get_available_quantity,
     get_available_quantity_for_customer,
     get_quantity_allocated,
+    get_stock_status_for_products,
+    invalidate_stock_availability,
 )
+from ..management import allocate_stock
 from ..models import Allocation, Stock
 
 COUNTRY_CODE = "US"
@@ -49,6 +57,59 @@ def test_check_stock_quantity_without_one_stock(variant_with_many_stocks):
     assert check_stock_quantity(variant_with_many_stocks, COUNTRY_CODE, 4) is None
 
 
+def test_check_stock_quantity_bulk(variant_with_many_stocks, product_list):
+    variants = [variant_with_many_stocks, product_list[0].variants.get()]
+    assert check_stock_quantity_bulk(variants, COUNTRY_CODE, [7, 1]) is None
+
+
+def test_check_stock_quantity_bulk_out_of_stock(variant_with_many_stocks, product_list):
+    variant = product_list[0].variants.get()
+    with pytest.raises(InsufficientStock) as exc:
+        check_stock_quantity_bulk(
+            [variant, variant_with_many_stocks], COUNTRY_CODE, [1, 8]
+        )
+    assert exc.value.item == variant_with_many_stocks
+
+
+def test_check_stock_quantity_bulk_without_stocks(
+    variant_with_many_stocks, product_list
+):
+    variant_with_many_stocks.stocks.all().delete()
+    variants = [product_list[0].variants.get(), variant_with_many_stocks]
+    with pytest.raises(InsufficientStock) as exc:
+        check_stock_quantity_bulk(variants, COUNTRY_CODE, [1, 1])
+    assert exc.value.item == variant_with_many_stocks
+
+
+def test_check_stock_quantity_bulk_without_inventory_tracking(
+    variant_with_many_stocks,
+):
+    variant_with_many_stocks.track_inventory = False
+    variant_with_many_stocks.stocks.all().delete()
+    assert (
+        check_stock_quantity_bulk([variant_with_many_stocks], COUNTRY_CODE, [100])
+        is None
+    )
+
+
+def test_get_available_quantities(
+    variant_with_many_stocks,
+    order_line_with_allocation_in_many_stocks,
+    order_line_with_one_allocation,
+    product_list,
+    django_assert_num_queries,
+):
+    variant = product_list[0].variants.get()
+    variant_ids = [variant_with_many_stocks.pk, variant.pk]
+    get_shipping_zone_ids_by_country()
+    with django_assert_num_queries(1):
+        quantities = get_available_quantities(variant_ids, COUNTRY_CODE)
+    assert quantities == {
+        variant_with_many_stocks.pk: 3,
+        variant.pk: variant.stocks.get().quantity,
+    }
+
+
 def test_get_available_quantity_without_allocation(order_line, stock):
     assert not Allocation.objects.filter(order_line=order_line, stock=stock).exists()
     available_quantity = get_available_quantity(order_line.variant, COUNTRY_CODE)
@@ -185,3 +246,127 @@ def test_are_all_product_variants_in_stock_warehouse_without_stock(
     assert are_all_product_variants_in_stock(
         variant_with_many_stocks.product, COUNTRY_CODE
     )
+
+
+def test_get_available_quantities_for_customer_cached(
+    variant_with_many_stocks, django_assert_num_queries
+):
+    key = (variant_with_many_stocks.pk, COUNTRY_CODE)
+    assert get_available_quantities_for_customer([key]) == {key: 7}
+
+    with django_assert_num_queries(0):
+        assert get_available_quantities_for_customer([key]) == {key: 7}
+
+
+def test_get_available_quantities_for_customer_many_variants(
+    variant_with_many_stocks, product_list, django_assert_num_queries
+):
+    keys = [(variant_with_many_stocks.pk, COUNTRY_CODE)] + [
+        (product.variants.get().pk, COUNTRY_CODE) for product in product_list
+    ]
+    get_shipping_zone_ids_by_country()
+
+    with django_assert_num_queries(1):
+        quantities = get_available_quantities_for_customer(keys)
+
+    assert list(quantities.values()) == [7, 100, 100, 100]
+
+
+def test_get_available_quantities_for_customer_country_without_warehouses(
+    variant_with_many_stocks, shipping_zone
+):
+    shipping_zone.countries = ["PL"]
+    shipping_zone.save(update_fields=["countries"])
+    key = (variant_with_many_stocks.pk, "JP")
+    assert get_available_quantities_for_customer([key]) == {key: 0}
+
+
+def test_stock_availability_cache_invalidated_by_allocation(order_line, stock):
+    variant = order_line.variant
+    key = (variant.pk, COUNTRY_CODE)
+    quantity = get_available_quantities_for_customer([key])[key]
+
+    allocate_stock(order_line, COUNTRY_CODE, 3)
+
+    assert get_available_quantities_for_customer([key])[key] == quantity - 3
+
+
+def test_stock_availability_cache_invalidated_by_stock_update(
+    variant_with_many_stocks,
+):
+    key = (variant_with_many_stocks.pk, COUNTRY_CODE)
+    assert get_available_quantities_for_customer([key])[key] == 7
+
+    stock = variant_with_many_stocks.stocks.get(quantity=3)
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+
+    assert get_available_quantities_for_customer([key])[key] == 14
+
+
+def test_stock_availability_cache_invalidated_by_warehouse_delete(
+    variant_with_many_stocks,
+):
+    key = (variant_with_many_stocks.pk, COUNTRY_CODE)
+    assert get_available_quantities_for_customer([key])[key] == 7
+
+    variant_with_many_stocks.stocks.get(quantity=3).warehouse.delete()
+
+    assert get_available_quantities_for_customer([key])[key] == 4
+
+
+def test_invalidate_stock_availability(variant_with_many_stocks):
+    key = (variant_with_many_stocks.pk, COUNTRY_CODE)
+    get_available_quantities_for_customer([key])
+    Stock.objects.filter(product_variant=variant_with_many_stocks).update(quantity=0)
+
+    invalidate_stock_availability([variant_with_many_stocks.pk])
+
+    assert get_available_quantities_for_customer([key])[key] == 0
+
+
+def test_get_stock_status_for_products(
+    product_list, product_type, category, django_assert_num_queries
+):
+    product_without_variants = Product.objects.create(
+        name="Test product 4",
+        slug="test-product-d",
+        category=category,
+        product_type=product_type,
+    )
+    out_of_stock_product = product_list[0]
+    Stock.objects.filter(product_variant__product=out_of_stock_product).update(
+        quantity=0
+    )
+    products = product_list + [product_without_variants]
+    keys = [(product.pk, COUNTRY_CODE) for product in products]
+    get_shipping_zone_ids_by_country()
+
+    with django_assert_num_queries(2):
+        stock_statuses = get_stock_status_for_products(keys)
+
+    out_of_stock_status = stock_statuses[(out_of_stock_product.pk, COUNTRY_CODE)]
+    assert out_of_stock_status.has_variants
+    assert not out_of_stock_status.is_in_stock
+    assert not out_of_stock_status.are_all_variants_in_stock
+    in_stock_status = stock_statuses[(product_list[1].pk, COUNTRY_CODE)]
+    assert in_stock_status.has_variants
+    assert in_stock_status.is_in_stock
+    assert in_stock_status.are_all_variants_in_stock
+    no_variants_status = stock_statuses[(product_without_variants.pk, COUNTRY_CODE)]
+    assert not no_variants_status.has_variants
+    assert not no_variants_status.is_in_stock
+
+
+def test_get_stock_status_for_products_some_variants_out_of_stock(
+    product_with_two_variants,
+):
+    product = product_with_two_variants
+    Stock.objects.filter(product_variant=product.variants.first()).update(quantity=0)
+    key = (product.pk, COUNTRY_CODE)
+
+    stock_status = get_stock_status_for_products([key])[key]
+
+    assert stock_status.has_variants
+    assert stock_status.is_in_stock
+    assert not stock_status.are_all_variants_in_stock
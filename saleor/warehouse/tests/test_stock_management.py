@@ -3,8 +3,10 @@ from django.db.models import Sum
 from django.db.models.functions import Coalesce
 
 from ...core.exceptions import InsufficientStock
+from ...shipping.utils import get_shipping_zone_ids_by_country
 from ..management import (
     allocate_stock,
+    allocate_stocks,
     deallocate_stock,
     deallocate_stock_for_order,
     decrease_stock,
@@ -81,6 +83,69 @@ def test_allocate_stock_insufficient_stocks(order_line, variant_with_many_stocks
     ).exists()
 
 
+def test_allocate_stocks(order_with_lines):
+    Allocation.objects.all().delete()
+    lines = list(order_with_lines.lines.all())
+
+    allocate_stocks(lines, COUNTRY_CODE)
+
+    for line in lines:
+        allocations = Allocation.objects.filter(order_line=line)
+        assert sum(a.quantity_allocated for a in allocations) == line.quantity
+
+
+def test_allocate_stocks_lines_of_same_variant(order_line, variant_with_many_stocks):
+    order_line.pk = None
+    order_line.quantity = 4
+    order_line.save()
+    second_line = order_line.order.lines.create(
+        product_name=order_line.product_name,
+        variant_name=order_line.variant_name,
+        product_sku=order_line.product_sku,
+        is_shipping_required=order_line.is_shipping_required,
+        quantity=3,
+        variant=order_line.variant,
+        unit_price=order_line.unit_price,
+        tax_rate=order_line.tax_rate,
+    )
+    stocks = variant_with_many_stocks.stocks.order_by("pk")
+
+    allocate_stocks([order_line, second_line], COUNTRY_CODE)
+
+    first_allocation = Allocation.objects.get(order_line=order_line)
+    assert first_allocation.stock == stocks[0]
+    assert first_allocation.quantity_allocated == 4
+    second_allocation = Allocation.objects.get(order_line=second_line)
+    assert second_allocation.stock == stocks[1]
+    assert second_allocation.quantity_allocated == 3
+
+
+def test_allocate_stocks_insufficient_stocks_allocates_nothing(order_with_lines):
+    Allocation.objects.all().delete()
+    lines = list(order_with_lines.lines.order_by("pk"))
+    lines[-1].quantity = 3
+
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(lines, COUNTRY_CODE)
+
+    assert not Allocation.objects.exists()
+
+
+def test_allocate_stocks_query_count_does_not_depend_on_lines_number(
+    order_with_lines, django_assert_num_queries
+):
+    Allocation.objects.all().delete()
+    lines = list(order_with_lines.lines.select_related("variant"))
+    get_shipping_zone_ids_by_country()
+
+    with django_assert_num_queries(5):
+        allocate_stocks(lines[:1], COUNTRY_CODE)
+
+    Allocation.objects.all().delete()
+    with django_assert_num_queries(5):
+        allocate_stocks(lines, COUNTRY_CODE)
+
+
 def test_deallocate_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
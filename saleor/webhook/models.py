@@ -17,6 +17,18 @@ class Webhook(models.Model):
     is_active = models.BooleanField(default=True)
     secret_key = models.CharField(max_length=255, null=True, blank=True)
 
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_subscribed_event_types
+
+        super().save(*args, **kwargs)
+        invalidate_subscribed_event_types()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_subscribed_event_types
+
+        invalidate_subscribed_event_types()
+        return super().delete(*args, **kwargs)
+
 
 class WebhookEvent(models.Model):
     webhook = models.ForeignKey(
@@ -26,3 +38,15 @@ class WebhookEvent(models.Model):
 
     def __repr__(self):
         return self.event_type
+
+    def save(self, *args, **kwargs):
+        from .utils import invalidate_subscribed_event_types
+
+        super().save(*args, **kwargs)
+        invalidate_subscribed_event_types()
+
+    def delete(self, *args, **kwargs):
+        from .utils import invalidate_subscribed_event_types
+
+        invalidate_subscribed_event_types()
+        return super().delete(*args, **kwargs)
@@ -0,0 +1,52 @@
+from typing import Set
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .event_types import WebhookEventType
+from .models import WebhookEvent
+
+WEBHOOK_EVENT_TYPES_CACHE_KEY = "webhook_subscribed_event_types"
+# Upper bound for changes which don't invalidate the cache, like bulk updates
+WEBHOOK_EVENT_TYPES_CACHE_TIMEOUT = 60 * 5
+
+
+def get_subscribed_event_types() -> Set[str]:
+    """Return event types of active webhooks which belong to active apps.
+
+    The set is cached until webhooks, their events or apps are changed.
+    """
+    event_types = cache.get(WEBHOOK_EVENT_TYPES_CACHE_KEY)
+    if event_types is None:
+        event_types = set(
+            WebhookEvent.objects.filter(
+                webhook__is_active=True, webhook__app__is_active=True
+            )
+            .values_list("event_type", flat=True)
+            .distinct()
+        )
+        cache.set(
+            WEBHOOK_EVENT_TYPES_CACHE_KEY,
+            event_types,
+            WEBHOOK_EVENT_TYPES_CACHE_TIMEOUT,
+        )
+    return event_types
+
+
+def is_event_subscribed(event_type: str) -> bool:
+    """Return True if any webhook may receive events of the given type.
+
+    Permissions of apps aren't checked here, they are verified when webhooks
+    are triggered.
+    """
+    event_types = get_subscribed_event_types()
+    return event_type in event_types or WebhookEventType.ANY in event_types
+
+
+def invalidate_subscribed_event_types():
+    """Drop cached event types subscribed by webhooks.
+
+    Has to be called when webhooks, their events or apps are changed.
+    """
+    cache.delete(WEBHOOK_EVENT_TYPES_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(WEBHOOK_EVENT_TYPES_CACHE_KEY))